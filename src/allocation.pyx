@@ -0,0 +1,251 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+# Python imports
+import logging
+
+# C imports
+from libc cimport stdint
+
+cimport c_message
+cimport c_amqp_definitions
+cimport c_amqpvalue
+
+
+_logger = logging.getLogger(__name__)
+
+cdef enum:
+    # Only short strings and symbols, such as map keys, are pooled.
+    MAX_POOLED_VALUE_LENGTH = 128
+
+
+cdef class HandlePool(object):
+
+    cdef readonly size_t limit
+    cdef readonly size_t hits
+    cdef readonly size_t misses
+    cdef readonly size_t discarded
+
+    def __cinit__(self, size_t limit):
+        self.limit = limit
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+
+    cdef size_t size(self):
+        return 0
+
+    cpdef set_limit(self, size_t limit):
+        self.limit = limit
+
+    def stats(self):
+        return {
+            'size': self.size(),
+            'limit': self.limit,
+            'hits': self.hits,
+            'misses': self.misses,
+            'discarded': self.discarded
+        }
+
+
+cdef class MessagePool(HandlePool):
+    """A pool of C message handles without a body. A released message has
+    its sections cleared so that it can be reused rather than reallocated.
+
+    The body of a C message cannot be removed, so only scratch handles that are
+    never given a body can be pooled, such as the one used to size the sections
+    of a message. The handles of sent messages are not pooled.
+    """
+
+    cdef list _messages
+
+    def __cinit__(self, size_t limit):
+        self._messages = []
+
+    cdef size_t size(self):
+        return len(self._messages)
+
+    cpdef set_limit(self, size_t limit):
+        self.limit = limit
+        while len(self._messages) > limit:
+            (<cMessage>self._messages.pop()).destroy()
+
+    cpdef cMessage acquire(self):
+        if self._messages:
+            self.hits += 1
+            return self._messages.pop()
+        self.misses += 1
+        return create_message()
+
+    cpdef release(self, cMessage message):
+        cdef c_message.MESSAGE_BODY_TYPE_TAG body_type
+        cdef c_message.MESSAGE_HANDLE value = message._c_value
+        if <void*>value == NULL:
+            return
+        # The body of a C message cannot be removed, so only messages without one can be reset.
+        if len(self._messages) >= self.limit or \
+                c_message.message_get_body_type(value, &body_type) != 0 or \
+                body_type != c_message.MESSAGE_BODY_TYPE_TAG.MESSAGE_BODY_TYPE_NONE or \
+                c_message.message_set_header(value, <c_amqp_definitions.HEADER_HANDLE>NULL) != 0 or \
+                c_message.message_set_delivery_annotations(
+                    value, <c_amqp_definitions.delivery_annotations>NULL) != 0 or \
+                c_message.message_set_message_annotations(
+                    value, <c_amqp_definitions.message_annotations>NULL) != 0 or \
+                c_message.message_set_properties(value, <c_amqp_definitions.PROPERTIES_HANDLE>NULL) != 0 or \
+                c_message.message_set_application_properties(value, <c_amqpvalue.AMQP_VALUE>NULL) != 0 or \
+                c_message.message_set_footer(value, <c_amqp_definitions.annotations>NULL) != 0 or \
+                c_message.message_set_message_format(value, 0) != 0:
+            self.discarded += 1
+            message.destroy()
+            return
+        self._messages.append(message)
+
+
+cdef class ValuePool(HandlePool):
+    """A pool of shared immutable AMQP values. AMQP values are reference counted,
+    so a pooled value is reused by taking a new reference rather than allocating
+    and copying it again.
+
+    Only values that repeat are pooled, so that unique values such as message IDs
+    do not fill the pool: a string or symbol is added on its second use, and the
+    least recently used value is evicted when the pool is full.
+    """
+
+    cdef dict _strings
+    cdef dict _symbols
+    cdef dict _seen
+    cdef c_amqpvalue.AMQP_VALUE _null
+    cdef c_amqpvalue.AMQP_VALUE _true
+    cdef c_amqpvalue.AMQP_VALUE _false
+
+    def __cinit__(self, size_t limit):
+        self._strings = {}
+        self._symbols = {}
+        self._seen = {}
+        self._null = c_amqpvalue.amqpvalue_create_null()
+        self._true = c_amqpvalue.amqpvalue_create_boolean(1)
+        self._false = c_amqpvalue.amqpvalue_create_boolean(0)
+        if <void*>self._null == NULL or <void*>self._true == NULL or <void*>self._false == NULL:
+            raise MemoryError("Failed to create pooled AMQP values.")
+
+    def __dealloc__(self):
+        self._clear()
+        if <void*>self._null != NULL:
+            c_amqpvalue.amqpvalue_destroy(self._null)
+        if <void*>self._true != NULL:
+            c_amqpvalue.amqpvalue_destroy(self._true)
+        if <void*>self._false != NULL:
+            c_amqpvalue.amqpvalue_destroy(self._false)
+
+    cdef size_t size(self):
+        return len(self._strings) + len(self._symbols)
+
+    cdef _clear(self):
+        cdef stdint.uintptr_t pooled
+        for values in (self._strings, self._symbols):
+            for pooled in values.values():
+                c_amqpvalue.amqpvalue_destroy(<c_amqpvalue.AMQP_VALUE>pooled)
+            values.clear()
+        self._seen.clear()
+
+    cdef _evict(self, dict values):
+        # Dicts keep insertion order and a hit moves the value to the end,
+        # so the first value is the least recently used.
+        cdef stdint.uintptr_t pooled = values.pop(next(iter(values)))
+        c_amqpvalue.amqpvalue_destroy(<c_amqpvalue.AMQP_VALUE>pooled)
+        self.discarded += 1
+
+    cpdef set_limit(self, size_t limit):
+        self.limit = limit
+        while self.size() > limit:
+            self._evict(self._strings or self._symbols)
+        while len(self._seen) > limit:
+            del self._seen[next(iter(self._seen))]
+
+    cdef bint _admit(self, dict values, bytes value):
+        # A value is pooled on its second use. Values seen once are tracked
+        # by key only, up to the limit of the pool.
+        if self.limit == 0:
+            return False
+        if self._seen.pop(value, None) is None:
+            if len(self._seen) >= self.limit:
+                del self._seen[next(iter(self._seen))]
+            self._seen[value] = True
+            return False
+        if self.size() >= self.limit:
+            self._evict(values or self._strings or self._symbols)
+        return True
+
+    cdef c_amqpvalue.AMQP_VALUE _get(self, dict values, bytes value, bint symbol):
+        # The caller owns the returned value.
+        cdef c_amqpvalue.AMQP_VALUE result
+        cdef stdint.uintptr_t pooled
+        cdef bint poolable = len(value) <= MAX_POOLED_VALUE_LENGTH
+        if poolable:
+            pooled = values.pop(value, 0)
+            if pooled != 0:
+                self.hits += 1
+                values[value] = pooled
+                return c_amqpvalue.amqpvalue_clone(<c_amqpvalue.AMQP_VALUE>pooled)
+            self.misses += 1
+        if symbol:
+            result = c_amqpvalue.amqpvalue_create_symbol(<char*>value)
+        else:
+            result = c_amqpvalue.amqpvalue_create_string(<char*>value)
+        if poolable and <void*>result != NULL and self._admit(values, value):
+            values[value] = <stdint.uintptr_t>c_amqpvalue.amqpvalue_clone(result)
+        return result
+
+    cdef c_amqpvalue.AMQP_VALUE get_string(self, bytes value):
+        return self._get(self._strings, value, False)
+
+    cdef c_amqpvalue.AMQP_VALUE get_symbol(self, bytes value):
+        return self._get(self._symbols, value, True)
+
+    cdef c_amqpvalue.AMQP_VALUE get_null(self):
+        self.hits += 1
+        return c_amqpvalue.amqpvalue_clone(self._null)
+
+    cdef c_amqpvalue.AMQP_VALUE get_boolean(self, bint value):
+        self.hits += 1
+        return c_amqpvalue.amqpvalue_clone(self._true if value else self._false)
+
+
+cdef MessagePool _message_pool = MessagePool(64)
+cdef ValuePool _value_pool = ValuePool(1024)
+
+
+cpdef acquire_message():
+    """Get an empty C message from the pool, or create one if the pool is empty.
+    The message must not be given a body if it is to be released to the pool.
+    """
+    return _message_pool.acquire()
+
+
+cpdef release_message(cMessage message):
+    """Clear the sections of a C message and return it to the pool. Messages
+    that have a body, or that do not fit in the pool, are destroyed.
+    """
+    _message_pool.release(message)
+
+
+cpdef get_pool_stats():
+    """Get the size, limit, hits, misses and discarded count of the C message
+    and AMQP value pools.
+
+    :rtype: dict[str, dict[str, int]]
+    """
+    return {'messages': _message_pool.stats(), 'values': _value_pool.stats()}
+
+
+cpdef set_pool_limits(messages=None, values=None):
+    """Set the maximum number of pooled C messages and AMQP values.
+    A limit of 0 disables the pool.
+    """
+    if messages is not None:
+        _message_pool.set_limit(messages)
+    if values is not None:
+        _value_pool.set_limit(values)
@@ -6,6 +6,8 @@
 
 # Python imports
 from enum import Enum
+from datetime import datetime
+import calendar
 import logging
 import uuid
 import copy
@@ -15,6 +17,7 @@ import copy
 from libc cimport stdint
 from libc.stdlib cimport malloc, realloc, free
 from libc.string cimport memcpy
+from cpython.ref cimport PyObject
 
 cimport cython
 cimport c_amqpvalue
@@ -23,6 +26,12 @@ cimport c_amqp_definitions
 
 _logger = logging.getLogger(__name__)
 
+# The AMQPValue classes indexed by the AMQP_TYPE_TAG of the value they wrap.
+# The classes are module attributes, so the borrowed references remain valid.
+cdef enum:
+    VALUE_TYPES_SIZE = 32
+cdef PyObject* _value_types[VALUE_TYPES_SIZE]
+
 
 cdef int encode_bytes_callback(void* context, const unsigned char* encoded_bytes, size_t length):
     context_obj = <object>context
@@ -75,62 +84,342 @@ class AMQPType(Enum):
 
 
 cdef value_factory(c_amqpvalue.AMQP_VALUE value):
-    type_val = get_amqp_value_type(value)
-    _logger.debug("Wrapping value type: %r", type_val)
-    if type_val == AMQPType.NullValue:
-        new_obj = AMQPValue()
-    elif type_val == AMQPType.BoolValue:
-        new_obj = BoolValue()
-    elif type_val == AMQPType.UByteValue:
-        new_obj = UByteValue()
-    elif type_val == AMQPType.UShortValue:
-        new_obj = UShortValue()
-    elif type_val == AMQPType.UIntValue:
-        new_obj = UIntValue()
-    elif type_val == AMQPType.ULongValue:
-        new_obj = ULongValue()
-    elif type_val == AMQPType.ByteValue:
-        new_obj = ByteValue()
-    elif type_val == AMQPType.ShortValue:
-        new_obj = ShortValue()
-    elif type_val == AMQPType.IntValue:
-        new_obj = IntValue()
-    elif type_val == AMQPType.LongValue:
-        new_obj = LongValue()
-    elif type_val == AMQPType.FloatValue:
-        new_obj = FloatValue()
-    elif type_val == AMQPType.DoubleValue:
-        new_obj = DoubleValue()
-    elif type_val == AMQPType.CharValue:
-        new_obj = CharValue()
-    elif type_val == AMQPType.TimestampValue:
-        new_obj = TimestampValue()
-    elif type_val == AMQPType.UUIDValue:
-        new_obj = UUIDValue()
-    elif type_val == AMQPType.BinaryValue:
-        new_obj = BinaryValue()
-    elif type_val == AMQPType.StringValue:
-        new_obj = StringValue()
-    elif type_val == AMQPType.SymbolValue:
-        new_obj = SymbolValue()
-    elif type_val == AMQPType.ListValue:
-        new_obj = ListValue()
-    elif type_val == AMQPType.DictValue:
-        new_obj = DictValue()
-    elif type_val == AMQPType.ArrayValue:  # Do checking
-        new_obj = ArrayValue()
-    elif type_val == AMQPType.CompositeType:
-        new_obj = CompositeValue()
-    elif type_val == AMQPType.DescribedType:
-        new_obj = DescribedValue()
-    else:
+    cdef c_amqpvalue.AMQP_TYPE_TAG type_val = c_amqpvalue.amqpvalue_get_type(value)
+    cdef AMQPValue new_obj
+    if type_val < 0 or type_val >= VALUE_TYPES_SIZE or _value_types[<int>type_val] == NULL:
         error = "Unrecognized AMQPType: {}".format(type_val)
         _logger.info(error)
         raise TypeError(error)
+    new_obj = (<object>_value_types[<int>type_val])()
     new_obj.wrap(value)
     return new_obj
 
 
+cdef amqpvalue_to_python(c_amqpvalue.AMQP_VALUE value):
+    """Convert an AMQP value to native Python objects in a single pass.
+    The value is borrowed - it is not destroyed.
+    """
+    cdef c_amqpvalue.AMQP_TYPE_TAG type_val
+    cdef c_amqpvalue.AMQP_VALUE item
+    cdef c_amqpvalue.AMQP_VALUE key
+    cdef stdint.uint32_t count
+    cdef stdint.uint32_t i
+    cdef bint _bool = 0
+    cdef unsigned char _ubyte
+    cdef stdint.uint16_t _ushort
+    cdef stdint.uint32_t _uint
+    cdef stdint.uint64_t _ulong
+    cdef char _byte
+    cdef stdint.int16_t _short
+    cdef stdint.int32_t _int
+    cdef stdint.int64_t _long
+    cdef float _float
+    cdef double _double
+    cdef char* _chars
+    cdef c_amqpvalue.amqp_binary _binary
+    cdef c_amqpvalue.uuid _uuid
+
+    type_val = c_amqpvalue.amqpvalue_get_type(value)
+    if type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_NULL:
+        return None
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_BOOL:
+        if c_amqpvalue.amqpvalue_get_boolean(value, &_bool) == 0:
+            return _bool != 0
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_UBYTE:
+        if c_amqpvalue.amqpvalue_get_ubyte(value, &_ubyte) == 0:
+            return _ubyte
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_USHORT:
+        if c_amqpvalue.amqpvalue_get_ushort(value, &_ushort) == 0:
+            return _ushort
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_UINT:
+        if c_amqpvalue.amqpvalue_get_uint(value, &_uint) == 0:
+            return _uint
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_ULONG:
+        if c_amqpvalue.amqpvalue_get_ulong(value, &_ulong) == 0:
+            return _ulong
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_BYTE:
+        if c_amqpvalue.amqpvalue_get_byte(value, &_byte) == 0:
+            return _byte
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_SHORT:
+        if c_amqpvalue.amqpvalue_get_short(value, &_short) == 0:
+            return _short
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_INT:
+        if c_amqpvalue.amqpvalue_get_int(value, &_int) == 0:
+            return _int
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_LONG:
+        if c_amqpvalue.amqpvalue_get_long(value, &_long) == 0:
+            return _long
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_FLOAT:
+        if c_amqpvalue.amqpvalue_get_float(value, &_float) == 0:
+            return _float
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_DOUBLE:
+        if c_amqpvalue.amqpvalue_get_double(value, &_double) == 0:
+            return _double
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_CHAR:
+        if c_amqpvalue.amqpvalue_get_char(value, &_uint) == 0:
+            return chr(_uint)
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_TIMESTAMP:
+        if c_amqpvalue.amqpvalue_get_timestamp(value, &_long) == 0:
+            return _long
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_UUID:
+        if c_amqpvalue.amqpvalue_get_uuid(value, &_uuid) == 0:
+            return uuid.UUID(bytes=(<char*>_uuid)[:16])
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_BINARY:
+        if c_amqpvalue.amqpvalue_get_binary(value, &_binary) == 0:
+            if _binary.length == 0:
+                return b""
+            return (<char*>_binary.bytes)[:_binary.length]
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_STRING:
+        if c_amqpvalue.amqpvalue_get_string(value, &_chars) == 0:
+            return <bytes>_chars
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_SYMBOL:
+        if c_amqpvalue.amqpvalue_get_symbol(value, &_chars) == 0:
+            return <bytes>_chars
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_LIST:
+        if c_amqpvalue.amqpvalue_get_list_item_count(value, &count) == 0:
+            result = []
+            for i in range(count):
+                item = c_amqpvalue.amqpvalue_get_list_item_in_place(value, i)
+                result.append(amqpvalue_to_python(item) if <void*>item != NULL else None)
+            return result
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_MAP:
+        if c_amqpvalue.amqpvalue_get_map_pair_count(value, &count) == 0:
+            result = {}
+            for i in range(count):
+                if c_amqpvalue.amqpvalue_get_map_key_value_pair(value, i, &key, &item) != 0:
+                    raise ValueError("Failed to get map pair at index {}.".format(i))
+                try:
+                    result[amqpvalue_to_python(key)] = amqpvalue_to_python(item)
+                finally:
+                    c_amqpvalue.amqpvalue_destroy(key)
+                    c_amqpvalue.amqpvalue_destroy(item)
+            return result
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_ARRAY:
+        if c_amqpvalue.amqpvalue_get_array_item_count(value, &count) == 0:
+            result = []
+            for i in range(count):
+                item = c_amqpvalue.amqpvalue_get_array_item(value, i)
+                if <void*>item == NULL:
+                    raise ValueError("Failed to get array item at index {}.".format(i))
+                try:
+                    result.append(amqpvalue_to_python(item))
+                finally:
+                    c_amqpvalue.amqpvalue_destroy(item)
+            return result
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_DESCRIBED:
+        item = c_amqpvalue.amqpvalue_get_inplace_described_value(value)
+        if <void*>item != NULL:
+            return amqpvalue_to_python(item)
+    elif type_val == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_COMPOSITE:
+        return None
+    else:
+        raise TypeError("Unrecognized AMQPType: {}".format(type_val))
+    raise ValueError("Failed to get {} value.".format(AMQPType(type_val).name))
+
+
+# Python types that can be converted to AMQP values by python_to_amqpvalue.
+cdef enum:
+    PY_TYPE_UNSUPPORTED = -1
+    PY_TYPE_NONE = 0
+    PY_TYPE_BOOL
+    PY_TYPE_STR
+    PY_TYPE_BYTES
+    PY_TYPE_UUID
+    PY_TYPE_BYTEARRAY
+    PY_TYPE_INT
+    PY_TYPE_FLOAT
+    PY_TYPE_DICT
+    PY_TYPE_LIST
+    PY_TYPE_DATETIME
+    PY_TYPE_AMQP
+
+_PY_TYPE_CODES = {
+    type(None): PY_TYPE_NONE,
+    bool: PY_TYPE_BOOL,
+    str: PY_TYPE_STR,
+    bytes: PY_TYPE_BYTES,
+    uuid.UUID: PY_TYPE_UUID,
+    bytearray: PY_TYPE_BYTEARRAY,
+    int: PY_TYPE_INT,
+    float: PY_TYPE_FLOAT,
+    dict: PY_TYPE_DICT,
+    list: PY_TYPE_LIST,
+    set: PY_TYPE_LIST,
+    tuple: PY_TYPE_LIST,
+    datetime: PY_TYPE_DATETIME,
+}
+
+
+cdef int get_py_type_code(value):
+    cdef int type_code = _PY_TYPE_CODES.get(type(value), PY_TYPE_UNSUPPORTED)
+    if type_code != PY_TYPE_UNSUPPORTED:
+        return type_code
+    # Subclasses and already wrapped values, in the same order of precedence as data_factory.
+    if hasattr(value, 'c_data') or isinstance(value, AMQPValue):
+        return PY_TYPE_AMQP
+    elif isinstance(value, bool):
+        return PY_TYPE_BOOL
+    elif isinstance(value, str):
+        return PY_TYPE_STR
+    elif isinstance(value, bytes):
+        return PY_TYPE_BYTES
+    elif isinstance(value, uuid.UUID):
+        return PY_TYPE_UUID
+    elif isinstance(value, bytearray):
+        return PY_TYPE_BYTEARRAY
+    elif isinstance(value, int):
+        return PY_TYPE_INT
+    elif isinstance(value, float):
+        return PY_TYPE_FLOAT
+    elif isinstance(value, dict):
+        return PY_TYPE_DICT
+    elif isinstance(value, (list, set, tuple)):
+        return PY_TYPE_LIST
+    elif isinstance(value, datetime):
+        return PY_TYPE_DATETIME
+    return PY_TYPE_UNSUPPORTED
+
+
+cdef c_amqpvalue.AMQP_VALUE python_to_amqpvalue(value, encoding, int type_code=PY_TYPE_UNSUPPORTED) except *:
+    """Build the AMQP value for a Python object in a single pass.
+    The caller owns the returned value.
+    """
+    cdef c_amqpvalue.AMQP_VALUE result = <c_amqpvalue.AMQP_VALUE>NULL
+    cdef c_amqpvalue.AMQP_VALUE c_key
+    cdef c_amqpvalue.AMQP_VALUE c_item
+    cdef c_amqpvalue.amqp_binary _binary
+    cdef stdint.uint32_t index
+    cdef int failed
+
+    if type_code == PY_TYPE_UNSUPPORTED:
+        type_code = get_py_type_code(value)
+    if type_code == PY_TYPE_NONE:
+        result = _value_pool.get_null()
+    elif type_code == PY_TYPE_BOOL:
+        result = _value_pool.get_boolean(value)
+    elif type_code == PY_TYPE_STR:
+        result = _value_pool.get_string(value.encode(encoding))
+    elif type_code == PY_TYPE_BYTES:
+        result = _value_pool.get_string(value)
+    elif type_code == PY_TYPE_UUID:
+        value = value.bytes
+        result = c_amqpvalue.amqpvalue_create_uuid(<unsigned char*>(<bytes>value))
+    elif type_code == PY_TYPE_BYTEARRAY:
+        value = bytes(value)
+        _binary.length = len(value)
+        _binary.bytes = <char*>value
+        result = c_amqpvalue.amqpvalue_create_binary(_binary)
+    elif type_code == PY_TYPE_INT:
+        if -2147483648 <= value <= 2147483647:
+            result = c_amqpvalue.amqpvalue_create_int(<stdint.int32_t>value)
+        elif -9223372036854775808 <= value <= 9223372036854775807:
+            result = c_amqpvalue.amqpvalue_create_long(<stdint.int64_t>value)
+        else:
+            result = c_amqpvalue.amqpvalue_create_double(<double>value)
+    elif type_code == PY_TYPE_FLOAT:
+        result = c_amqpvalue.amqpvalue_create_double(<double>value)
+    elif type_code == PY_TYPE_DATETIME:
+        timestamp = int((calendar.timegm(value.utctimetuple()) * 1000) + (value.microsecond/1000))
+        result = c_amqpvalue.amqpvalue_create_timestamp(<stdint.int64_t>timestamp)
+    elif type_code == PY_TYPE_AMQP:
+        wrapped = getattr(value, 'c_data', value)
+        if not isinstance(wrapped, AMQPValue):
+            raise TypeError("Unsupported AMQP value type: {}".format(type(wrapped)))
+        result = c_amqpvalue.amqpvalue_clone((<AMQPValue>wrapped)._c_value)
+    elif type_code == PY_TYPE_DICT:
+        result = c_amqpvalue.amqpvalue_create_map()
+        if <void*>result == NULL:
+            raise MemoryError("Failed to create AMQP map.")
+        try:
+            for key, item in value.items():
+                c_key = python_to_amqpvalue(key, encoding)
+                try:
+                    c_item = python_to_amqpvalue(item, encoding)
+                except:
+                    c_amqpvalue.amqpvalue_destroy(c_key)
+                    raise
+                failed = c_amqpvalue.amqpvalue_set_map_value(result, c_key, c_item)
+                c_amqpvalue.amqpvalue_destroy(c_key)
+                c_amqpvalue.amqpvalue_destroy(c_item)
+                if failed != 0:
+                    raise ValueError("Failed to set AMQP map value.")
+        except:
+            c_amqpvalue.amqpvalue_destroy(result)
+            raise
+    elif type_code == PY_TYPE_LIST:
+        result = c_amqpvalue.amqpvalue_create_list()
+        if <void*>result == NULL:
+            raise MemoryError("Failed to create AMQP list.")
+        try:
+            if c_amqpvalue.amqpvalue_set_list_item_count(result, len(value)) != 0:
+                raise ValueError("Failed to set AMQP list size.")
+            for index, item in enumerate(value):
+                c_item = python_to_amqpvalue(item, encoding)
+                failed = c_amqpvalue.amqpvalue_set_list_item(result, index, c_item)
+                c_amqpvalue.amqpvalue_destroy(c_item)
+                if failed != 0:
+                    raise ValueError("Failed to set AMQP list item.")
+        except:
+            c_amqpvalue.amqpvalue_destroy(result)
+            raise
+    else:
+        raise TypeError("Unsupported type for AMQP value: {}".format(type(value)))
+    if <void*>result == NULL:
+        raise MemoryError("Failed to create AMQP value for type {}.".format(type(value)))
+    return result
+
+
+cpdef create_value(value, encoding='UTF-8'):
+    """Wrap a Python value in the equivalent AMQPValue. Returns None
+    if the value is not of a supported type.
+    """
+    cdef int type_code = get_py_type_code(value)
+    if type_code == PY_TYPE_UNSUPPORTED:
+        return None
+    if type_code == PY_TYPE_AMQP:
+        wrapped = getattr(value, 'c_data', value)
+        if isinstance(wrapped, AMQPValue):
+            return wrapped
+    return value_factory(python_to_amqpvalue(value, encoding, type_code))
+
+
+cdef as_byte_buffer(value):
+    """Get a C-contiguous unsigned byte view of any buffer, such as a memoryview of
+    an array of ints. A non-contiguous buffer is copied into bytes.
+    """
+    if isinstance(value, bytes):
+        return value
+    view = memoryview(value)
+    if not view.c_contiguous:
+        return view.tobytes()
+    if view.format != 'B' or view.ndim != 1:
+        return view.cast('B')
+    return view
+
+
+ctypedef c_amqpvalue.AMQP_VALUE (*create_from_chars)(char* value)
+
+
+cdef c_amqpvalue.AMQP_VALUE create_from_buffer(value, create_from_chars create):
+    # Bytes are already NUL-terminated and are passed straight through. Other
+    # buffers are terminated in a temporary copy, as required by the C API.
+    cdef const unsigned char[::1] view
+    cdef char* terminated
+    cdef c_amqpvalue.AMQP_VALUE result
+    if isinstance(value, bytes):
+        return create(<char*>(<bytes>value))
+    view = as_byte_buffer(value)
+    terminated = <char*>malloc(view.shape[0] + 1)
+    if terminated == NULL:
+        raise MemoryError("Failed to allocate value buffer.")
+    if view.shape[0] > 0:
+        memcpy(terminated, &view[0], view.shape[0])
+    terminated[view.shape[0]] = 0
+    result = create(terminated)
+    free(terminated)
+    return result
+
+
 cpdef null_value():
     new_obj = AMQPValue()
     new_obj.create()
@@ -225,19 +514,18 @@ cpdef uuid_value(value):
 
 
 cpdef binary_value(value):
-    bytes_value = bytes(value)
     new_obj = BinaryValue()
-    new_obj.create(<bytes>bytes_value)
+    new_obj.create(value)
     return new_obj
 
 
-cpdef string_value(char* value):
+cpdef string_value(value):
     new_obj = StringValue()
     new_obj.create(value)
     return new_obj
 
 
-cpdef symbol_value(char* value):
+cpdef symbol_value(value):
     new_obj = SymbolValue()
     new_obj.create(value)
     return new_obj
@@ -276,8 +564,6 @@ cdef class AMQPValue(StructBase):
         pass
 
     def __dealloc__(self):
-        if _logger:
-            _logger.debug("Deallocating %r", self.__class__.__name__)
         self.destroy()
 
     def __eq__(self, AMQPValue other):
@@ -319,8 +605,6 @@ cdef class AMQPValue(StructBase):
     cpdef destroy(self):
         try:
             if <void*>self._c_value is not NULL:
-                if _logger:
-                    _logger.debug("Destroying %r", self.__class__.__name__)
                 c_amqpvalue.amqpvalue_destroy(self._c_value)
         except KeyboardInterrupt:
             pass
@@ -623,11 +907,14 @@ cdef class BinaryValue(AMQPValue):
 
     _type = AMQPType.BinaryValue
 
-    def create(self, bytes value):
+    def create(self, value):
+        """Create from any buffer, such as bytes, bytearray, memoryview or mmap.
+        The data of a contiguous buffer is copied once, by the C value.
+        """
         cdef c_amqpvalue.amqp_binary _binary
-        length = len(list(value))
-        _binary.length = length
-        _binary.bytes = <char*>value
+        cdef const unsigned char[::1] view = as_byte_buffer(value)
+        _binary.length = <stdint.uint32_t>view.shape[0]
+        _binary.bytes = <void*>&view[0] if view.shape[0] > 0 else NULL
         new_value = c_amqpvalue.amqpvalue_create_binary(_binary)
         self.wrap(new_value)
 
@@ -655,8 +942,11 @@ cdef class StringValue(AMQPValue):
 
     _type = AMQPType.StringValue
 
-    def create(self, char* value):
-        new_value = c_amqpvalue.amqpvalue_create_string(value)
+    def create(self, value):
+        if isinstance(value, bytes):
+            new_value = _value_pool.get_string(value)
+        else:
+            new_value = create_from_buffer(value, c_amqpvalue.amqpvalue_create_string)
         self.wrap(new_value)
 
     @property
@@ -673,8 +963,11 @@ cdef class SymbolValue(AMQPValue):
 
     _type = AMQPType.SymbolValue
 
-    def create(self, char* value):
-        new_value = c_amqpvalue.amqpvalue_create_symbol(value)
+    def create(self, value):
+        if isinstance(value, bytes):
+            new_value = _value_pool.get_symbol(value)
+        else:
+            new_value = create_from_buffer(value, c_amqpvalue.amqpvalue_create_symbol)
         self.wrap(new_value)
 
     @property
@@ -735,10 +1028,7 @@ cdef class ListValue(AMQPValue):
     @property
     def value(self):
         assert self.type
-        value = []
-        for i in range(self.size):
-            value.append(copy.deepcopy(self[i].value))
-        return value
+        return amqpvalue_to_python(self._c_value)
 
 
 cdef class DictValue(AMQPValue):
@@ -787,11 +1077,7 @@ cdef class DictValue(AMQPValue):
     @property
     def value(self):
         assert self.type
-        value = {}
-        for i in range(self.size):
-            key, item = self.get(i)
-            value[copy.deepcopy(key.value)] = copy.deepcopy(item.value)
-        return value
+        return amqpvalue_to_python(self._c_value)
 
 
 cdef class ArrayValue(AMQPValue):
@@ -833,10 +1119,7 @@ cdef class ArrayValue(AMQPValue):
     @property
     def value(self):
         assert self.type
-        value = []
-        for i in range(self.size):
-            value.append(copy.deepcopy(self[i].value))
-        return value
+        return amqpvalue_to_python(self._c_value)
 
 
 cdef class CompositeValue(AMQPValue):
@@ -938,6 +1221,35 @@ cdef class DescribedValue(AMQPValue):
     @property
     def value(self):
         assert self.type
-        #descriptor = self.description
-        described = self.data
-        return copy.deepcopy(described.value)
+        return amqpvalue_to_python(self._c_value)
+
+
+cdef register_value_type(c_amqpvalue.AMQP_TYPE_TAG type_val, value_type):
+    if type_val < 0 or type_val >= VALUE_TYPES_SIZE:
+        raise ValueError("AMQP type tag {} is out of range.".format(type_val))
+    _value_types[<int>type_val] = <PyObject*>value_type
+
+
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_NULL, AMQPValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_BOOL, BoolValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_UBYTE, UByteValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_USHORT, UShortValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_UINT, UIntValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_ULONG, ULongValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_BYTE, ByteValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_SHORT, ShortValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_INT, IntValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_LONG, LongValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_FLOAT, FloatValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_DOUBLE, DoubleValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_CHAR, CharValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_TIMESTAMP, TimestampValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_UUID, UUIDValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_BINARY, BinaryValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_STRING, StringValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_SYMBOL, SymbolValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_LIST, ListValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_MAP, DictValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_ARRAY, ArrayValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_DESCRIBED, DescribedValue)
+register_value_type(c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_COMPOSITE, CompositeValue)
@@ -10,6 +10,7 @@ import copy
 
 # C imports
 from libc cimport stdint
+from libc.string cimport strcmp
 
 cimport c_amqpvalue
 cimport c_amqp_definitions
@@ -35,6 +36,45 @@ cdef annotations_factory(c_amqpvalue.AMQP_VALUE value):
     return new_obj
 
 
+cdef c_amqpvalue.AMQP_VALUE get_inplace_map(c_amqpvalue.AMQP_VALUE value):
+    if <void*>value == NULL:
+        return <c_amqpvalue.AMQP_VALUE>NULL
+    if c_amqpvalue.amqpvalue_get_type(value) == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_DESCRIBED:
+        value = c_amqpvalue.amqpvalue_get_inplace_described_value(value)
+        if <void*>value == NULL:
+            return <c_amqpvalue.AMQP_VALUE>NULL
+    if c_amqpvalue.amqpvalue_get_type(value) != c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_MAP:
+        return <c_amqpvalue.AMQP_VALUE>NULL
+    return value
+
+
+cdef c_amqpvalue.AMQP_VALUE get_map_value_by_name(c_amqpvalue.AMQP_VALUE map_value, const char* name):
+    # Match a string or symbol key by content without converting the map keys to Python.
+    cdef stdint.uint32_t count
+    cdef stdint.uint32_t i
+    cdef c_amqpvalue.AMQP_VALUE key
+    cdef c_amqpvalue.AMQP_VALUE value
+    cdef c_amqpvalue.AMQP_TYPE_TAG key_type
+    cdef const char* key_name
+    cdef bint found
+    if c_amqpvalue.amqpvalue_get_map_pair_count(map_value, &count) != 0:
+        return <c_amqpvalue.AMQP_VALUE>NULL
+    for i in range(count):
+        if c_amqpvalue.amqpvalue_get_map_key_value_pair(map_value, i, &key, &value) != 0:
+            return <c_amqpvalue.AMQP_VALUE>NULL
+        found = False
+        key_type = c_amqpvalue.amqpvalue_get_type(key)
+        if key_type == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_SYMBOL:
+            found = c_amqpvalue.amqpvalue_get_symbol(key, <char**>&key_name) == 0 and strcmp(key_name, name) == 0
+        elif key_type == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_STRING:
+            found = c_amqpvalue.amqpvalue_get_string(key, <char**>&key_name) == 0 and strcmp(key_name, name) == 0
+        c_amqpvalue.amqpvalue_destroy(key)
+        if found:
+            return value
+        c_amqpvalue.amqpvalue_destroy(value)
+    return <c_amqpvalue.AMQP_VALUE>NULL
+
+
 cpdef create_annotations(AMQPValue value):
     annotations = cAnnotations()
     annotations.create(value)
@@ -122,22 +162,45 @@ cdef class cAnnotations(StructBase):
 
     @property
     def value(self):
+        cdef c_amqpvalue.AMQP_VALUE value
+        value = c_amqpvalue.amqpvalue_clone(<c_amqpvalue.AMQP_VALUE>self._c_value)
+        if <void*>value == NULL:
+            self._value_error()
         try:
-            return value_factory(self._c_value)
+            return value_factory(value)
         except TypeError:
+            c_amqpvalue.amqpvalue_destroy(value)
             return None
 
+    cpdef get(self, key, default=None):
+        """Look up a single value by key without converting the whole map.
+        A bytes key will match either a string or a symbol key.
+        """
+        cdef c_amqpvalue.AMQP_VALUE mapped
+        cdef c_amqpvalue.AMQP_VALUE value
+        mapped = get_inplace_map(<c_amqpvalue.AMQP_VALUE>self._c_value)
+        if <void*>mapped == NULL:
+            return default
+        if isinstance(key, bytes):
+            value = get_map_value_by_name(mapped, <const char*>key)
+        elif isinstance(key, AMQPValue):
+            value = c_amqpvalue.amqpvalue_get_map_value(mapped, (<AMQPValue>key)._c_value)
+        else:
+            raise TypeError("Key must be bytes or AMQPValue.")
+        if <void*>value == NULL:
+            return default
+        try:
+            return amqpvalue_to_python(value)
+        finally:
+            c_amqpvalue.amqpvalue_destroy(value)
+
     @property
     def map(self):
-        cdef c_amqpvalue.AMQP_VALUE unmapped
         cdef c_amqpvalue.AMQP_VALUE mapped
-        unmapped = c_amqpvalue.amqpvalue_clone(<c_amqpvalue.AMQP_VALUE>self._c_value)
-        if c_amqpvalue.amqpvalue_get_map(unmapped, &mapped) == 0:
-            if <void*>mapped == NULL:
-                return None
-            return copy.deepcopy(value_factory(mapped).value)
-        else:
+        mapped = get_inplace_map(<c_amqpvalue.AMQP_VALUE>self._c_value)
+        if <void*>mapped == NULL:
             return None
+        return amqpvalue_to_python(mapped)
 
 
 cdef class cApplicationProperties(cAnnotations):
@@ -148,27 +211,6 @@ cdef class cApplicationProperties(cAnnotations):
             <c_amqp_definitions.application_properties>value._c_value)
         self._validate()
 
-    @property
-    def map(self):
-        cdef c_amqpvalue.AMQP_VALUE unmapped
-        cdef c_amqpvalue.AMQP_VALUE mapped
-        cdef c_amqpvalue.AMQP_VALUE unextracted
-        cdef c_amqpvalue.AMQP_VALUE extracted
-        unextracted = c_amqpvalue.amqpvalue_clone(<c_amqpvalue.AMQP_VALUE>self._c_value)
-        extracted = c_amqpvalue.amqpvalue_get_inplace_described_value(unextracted)
-        unmapped = c_amqpvalue.amqpvalue_clone(extracted)
-        if <void*>unmapped == NULL:
-            result = None
-        elif c_amqpvalue.amqpvalue_get_map(unmapped, &mapped) == 0:
-            if <void*>mapped == NULL:
-                result = None
-            else:
-                result = copy.deepcopy(value_factory(mapped).value)
-        else:
-            result = None
-        c_amqpvalue.amqpvalue_destroy(unextracted)
-        return result
-
 
 cdef class cDeliveryAnnotations(cAnnotations):
 
@@ -51,6 +51,7 @@ cdef class CBSTokenAuth(object):
     cdef const char* token_status_description
     cdef const char* connection_id
     cdef cSession _session
+    cdef list _put_token_operations
 
     def __cinit__(self, const char* audience, const char* token_type, const char* token, stdint.uint64_t expires_at, cSession session, stdint.uint64_t timeout, const char* connection_id, stdint.uint64_t refresh_window):
         self.state = AUTH_STATUS_IDLE
@@ -61,6 +62,7 @@ cdef class CBSTokenAuth(object):
         self.auth_timeout = timeout
         self.connection_id = connection_id
         self._token_put_time = 0
+        self._put_token_operations = []
         if refresh_window > 0:
             self._refresh_window = refresh_window
         else:
@@ -84,6 +86,7 @@ cdef class CBSTokenAuth(object):
             c_cbs.cbs_destroy(self._cbs_handle)
             self._cbs_handle = <c_cbs.CBS_HANDLE>NULL
             self._session = None
+            self._put_token_operations = []
 
     cpdef close(self):
         if c_cbs.cbs_close(self._cbs_handle) != 0:
@@ -115,6 +118,33 @@ cdef class CBSTokenAuth(object):
         self._update_status()
         return self.state
 
+    cpdef authorize_many(self, tokens):
+        """Send a put-token request for each audience without waiting for any of
+        them to complete, so that they are all in flight on this CBS link at once.
+
+        :param tokens: A list of (audience, token, expires_at) tuples.
+        :rtype: list[~uamqp.c_uamqp.CBSPutTokenOperation]
+        """
+        operations = []
+        current_time = int(time.time())
+        # Operations are referenced until C has completed them, as they are the callback context.
+        self._put_token_operations = [o for o in self._put_token_operations if not o.completed]
+        for audience, token, expires_at in tokens:
+            if current_time >= expires_at:
+                raise ValueError("Token for audience {!r} has expired".format(audience))
+            operation = CBSPutTokenOperation(audience, token, expires_at, self.auth_timeout)
+            if <void*>c_cbs.cbs_put_token_async(
+                    self._cbs_handle,
+                    self.token_type,
+                    operation.audience,
+                    operation.token,
+                    <c_cbs.ON_CBS_OPERATION_COMPLETE>on_cbs_put_token_complete,
+                    <void*>operation) == NULL:
+                raise ValueError("Put-Token request failed for audience {!r}.".format(audience))
+            self._put_token_operations.append(operation)
+            operations.append(operation)
+        return operations
+
     cpdef get_failure_info(self):
         return self.token_status_code, self.token_status_description
 
@@ -179,6 +209,49 @@ cdef class CBSTokenAuth(object):
         _logger.info("Token put complete with result: %r, status: %r, description: %r, connection: %r", result, status_code, status_description, self.connection_id)
 
 
+cdef class CBSPutTokenOperation(object):
+    """A put-token request for a single audience, sent with `CBSTokenAuth.authorize_many`."""
+
+    cdef readonly bytes audience
+    cdef readonly bytes token
+    cdef readonly stdint.uint64_t expires_at
+    cdef readonly c_cbs.AUTH_STATUS state
+    cdef readonly unsigned int status_code
+    cdef readonly bytes status_description
+    cdef readonly bint completed
+    cdef stdint.uint64_t _timeout
+    cdef stdint.uint64_t _put_time
+
+    def __cinit__(self, bytes audience, bytes token, stdint.uint64_t expires_at, stdint.uint64_t timeout):
+        self.audience = audience
+        self.token = token
+        self.expires_at = expires_at
+        self.state = AUTH_STATUS_IN_PROGRESS
+        self.status_code = 0
+        self.status_description = None
+        self.completed = False
+        self._timeout = timeout
+        self._put_time = int(time.time())
+
+    cpdef get_status(self):
+        if self.state == AUTH_STATUS_IN_PROGRESS and self._timeout > 0:
+            if (int(time.time()) - self._put_time) >= self._timeout:
+                self.state = AUTH_STATUS_TIMEOUT
+        return self.state
+
+    cpdef _cbs_put_token_compelete(self, c_cbs.CBS_OPERATION_RESULT_TAG result, unsigned int status_code, const char* status_description):
+        self.completed = True
+        if self.state != AUTH_STATUS_IN_PROGRESS:
+            return
+        if result == CBS_OPERATION_RESULT_OK:
+            self.state = AUTH_STATUS_OK
+        else:
+            self.state = AUTH_STATUS_ERROR
+        self.status_code = status_code
+        self.status_description = status_description
+        _logger.info("Token put complete for audience %r with result: %r, status: %r", self.audience, result, status_code)
+
+
 #### Callbacks
 
 cdef void on_cbs_open_complete(void *context, c_cbs.CBS_OPEN_COMPLETE_RESULT_TAG open_complete_result):
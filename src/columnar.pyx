@@ -0,0 +1,191 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+# Python imports
+import array
+import logging
+
+# C imports
+from cpython cimport array
+from cpython.bytearray cimport PyByteArray_AS_STRING, PyByteArray_GET_SIZE, PyByteArray_Resize
+from libc cimport stdint
+from libc.string cimport memcpy, strlen
+
+cimport c_message
+cimport c_amqp_definitions
+cimport c_amqpvalue
+
+
+_logger = logging.getLogger(__name__)
+
+
+cdef class BytesColumn(object):
+    """A column of variable length bytes values stored in a single contiguous buffer.
+    Value `i` is `data[offsets[i]:offsets[i + 1]]`.
+    """
+
+    cdef readonly bytearray data
+    cdef readonly array.array offsets
+
+    def __cinit__(self):
+        self.data = bytearray()
+        self.offsets = array.array('q', [0])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, Py_ssize_t index):
+        if index < 0:
+            index += len(self.offsets) - 1
+        if index < 0 or index >= len(self.offsets) - 1:
+            raise IndexError("Column index out of range.")
+        return bytes(self.data[self.offsets.data.as_longlongs[index]:self.offsets.data.as_longlongs[index + 1]])
+
+    cdef _extend(self, const void* value, size_t length):
+        cdef Py_ssize_t size = PyByteArray_GET_SIZE(self.data)
+        if length > 0:
+            PyByteArray_Resize(self.data, size + length)
+            memcpy(PyByteArray_AS_STRING(self.data) + size, value, length)
+
+    cdef _end_value(self):
+        cdef long long size = PyByteArray_GET_SIZE(self.data)
+        array.extend_buffer(self.offsets, <char*>&size, 1)
+
+    cdef _append_amqpvalue(self, c_amqpvalue.AMQP_VALUE value):
+        cdef c_amqpvalue.AMQP_TYPE_TAG value_type
+        cdef c_amqpvalue.amqp_binary binary_value
+        cdef const char* string_value
+        if <void*>value != NULL:
+            value_type = c_amqpvalue.amqpvalue_get_type(value)
+            if value_type == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_BINARY:
+                if c_amqpvalue.amqpvalue_get_binary(value, &binary_value) == 0:
+                    self._extend(binary_value.bytes, binary_value.length)
+            elif value_type == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_STRING:
+                if c_amqpvalue.amqpvalue_get_string(value, <char**>&string_value) == 0:
+                    self._extend(string_value, strlen(string_value))
+            elif value_type == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_SYMBOL:
+                if c_amqpvalue.amqpvalue_get_symbol(value, <char**>&string_value) == 0:
+                    self._extend(string_value, strlen(string_value))
+        self._end_value()
+
+
+cdef long long get_amqpvalue_integer(c_amqpvalue.AMQP_VALUE value, long long default):
+    cdef c_amqpvalue.AMQP_TYPE_TAG value_type
+    cdef stdint.int64_t long_value
+    cdef stdint.uint64_t ulong_value
+    cdef stdint.int32_t int_value
+    cdef stdint.uint32_t uint_value
+    if <void*>value == NULL:
+        return default
+    value_type = c_amqpvalue.amqpvalue_get_type(value)
+    if value_type == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_LONG:
+        if c_amqpvalue.amqpvalue_get_long(value, &long_value) == 0:
+            return long_value
+    elif value_type == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_TIMESTAMP:
+        if c_amqpvalue.amqpvalue_get_timestamp(value, &long_value) == 0:
+            return long_value
+    elif value_type == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_ULONG:
+        if c_amqpvalue.amqpvalue_get_ulong(value, &ulong_value) == 0:
+            return <long long>ulong_value
+    elif value_type == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_INT:
+        if c_amqpvalue.amqpvalue_get_int(value, &int_value) == 0:
+            return int_value
+    elif value_type == c_amqpvalue.AMQP_TYPE_TAG.AMQP_TYPE_UINT:
+        if c_amqpvalue.amqpvalue_get_uint(value, &uint_value) == 0:
+            return uint_value
+    return default
+
+
+cdef class ColumnarBatch(object):
+    """A batch of received messages stored as columns rather than as Message objects.
+
+    The Data sections of each message body are concatenated into a single entry of
+    the `bodies` column. The selected message annotations are stored in `columns`,
+    as an `array.array('q')` for integer values, with -1 where the annotation is
+    missing, or as a `BytesColumn` for binary, string and symbol values. Both expose
+    the buffer protocol, so they can be wrapped with `numpy.frombuffer` without copying.
+
+    :param max_size: The maximum number of messages in the batch.
+    :type max_size: int
+    :param fields: The annotations to extract, as tuples of the column name,
+     the annotation key and the column type, either 'int' or 'bytes'.
+    :type fields: list[tuple[str, bytes, str]]
+    """
+
+    cdef readonly int max_size
+    cdef readonly BytesColumn bodies
+    cdef readonly dict columns
+    cdef list _fields
+    cdef int _count
+
+    def __cinit__(self, int max_size, fields):
+        self.max_size = max_size
+        self.bodies = BytesColumn()
+        self.columns = {}
+        self._fields = []
+        self._count = 0
+        for name, key, column_type in fields:
+            if column_type == 'int':
+                column = array.array('q')
+            elif column_type == 'bytes':
+                column = BytesColumn()
+            else:
+                raise ValueError("Invalid column type for {}: {}".format(name, column_type))
+            self.columns[name] = column
+            self._fields.append((bytes(key), column))
+
+    def __len__(self):
+        return self._count
+
+    cpdef bint append(self, cMessage message) except *:
+        """Add a received message to the batch.
+
+        :param message: The received message.
+        :type message: ~uamqp.c_uamqp.cMessage
+        :returns: Whether the message was added. False if the batch is full.
+        :rtype: bool
+        """
+        cdef c_message.MESSAGE_BODY_TYPE_TAG body_type
+        cdef c_message.BINARY_DATA binary_data
+        cdef c_amqp_definitions.message_annotations annotations
+        cdef c_amqpvalue.AMQP_VALUE mapped = <c_amqpvalue.AMQP_VALUE>NULL
+        cdef c_amqpvalue.AMQP_VALUE value
+        cdef size_t count
+        cdef size_t i
+        cdef long long integer
+        if self._count >= self.max_size:
+            return False
+
+        if c_message.message_get_body_type(message._c_value, &body_type) == 0 and \
+                body_type == c_message.MESSAGE_BODY_TYPE_TAG.MESSAGE_BODY_TYPE_DATA and \
+                c_message.message_get_body_amqp_data_count(message._c_value, &count) == 0:
+            for i in range(count):
+                if c_message.message_get_body_amqp_data_in_place(message._c_value, i, &binary_data) == 0:
+                    self.bodies._extend(binary_data.bytes, binary_data.length)
+        self.bodies._end_value()
+
+        annotations = <c_amqp_definitions.message_annotations>NULL
+        if c_message.message_get_message_annotations(message._c_value, &annotations) == 0:
+            mapped = get_inplace_map(<c_amqpvalue.AMQP_VALUE>annotations)
+        try:
+            for key, column in self._fields:
+                value = <c_amqpvalue.AMQP_VALUE>NULL
+                if <void*>mapped != NULL:
+                    value = get_map_value_by_name(mapped, <const char*>key)
+                try:
+                    if isinstance(column, BytesColumn):
+                        (<BytesColumn>column)._append_amqpvalue(value)
+                    else:
+                        integer = get_amqpvalue_integer(value, -1)
+                        array.extend_buffer(<array.array>column, <char*>&integer, 1)
+                finally:
+                    if <void*>value != NULL:
+                        c_amqpvalue.amqpvalue_destroy(value)
+        finally:
+            if <void*>annotations != NULL:
+                c_amqpvalue.amqpvalue_destroy(<c_amqpvalue.AMQP_VALUE>annotations)
+        self._count += 1
+        return True
@@ -0,0 +1,418 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+# Python imports
+import calendar
+import logging
+
+# C imports
+from libc cimport stdint
+from libc.stdlib cimport malloc, realloc, free
+from libc.string cimport memcpy, memmove
+from cpython.bytes cimport PyBytes_FromStringAndSize
+
+cimport c_amqpvalue
+cimport c_amqp_definitions
+cimport c_message
+
+
+_logger = logging.getLogger(__name__)
+
+
+# AMQP 1.0 message section descriptors
+cdef enum:
+    SECTION_HEADER = 0x70
+    SECTION_DELIVERY_ANNOTATIONS = 0x71
+    SECTION_MESSAGE_ANNOTATIONS = 0x72
+    SECTION_PROPERTIES = 0x73
+    SECTION_APPLICATION_PROPERTIES = 0x74
+    SECTION_DATA = 0x75
+    SECTION_AMQP_SEQUENCE = 0x76
+    SECTION_AMQP_VALUE = 0x77
+    SECTION_FOOTER = 0x78
+
+
+cdef int wire_encoder_output(void* context, const unsigned char* encoded_bytes, size_t length) noexcept:
+    try:
+        (<WireEncoder>context).write(encoded_bytes, length)
+    except MemoryError:
+        return 1
+    return 0
+
+
+cdef class WireEncoder(object):
+    """Encodes Python values and message sections directly into the AMQP 1.0
+    wire format, using the smallest available encoding for each value.
+    The output is written to a single growable buffer that can be reused by
+    calling `reset`.
+    """
+
+    cdef unsigned char* _buffer
+    cdef size_t _length
+    cdef size_t _capacity
+    cdef object _encoding
+
+    def __cinit__(self, size_t capacity=256, encoding='UTF-8'):
+        self._capacity = capacity if capacity > 0 else 256
+        self._buffer = <unsigned char*>malloc(self._capacity)
+        if self._buffer == NULL:
+            raise MemoryError("Failed to allocate encoder buffer.")
+        self._length = 0
+        self._encoding = encoding
+
+    def __dealloc__(self):
+        if self._buffer != NULL:
+            free(self._buffer)
+            self._buffer = NULL
+
+    def __len__(self):
+        return self._length
+
+    cpdef reset(self):
+        self._length = 0
+
+    cpdef getvalue(self):
+        return PyBytes_FromStringAndSize(<char*>self._buffer, self._length)
+
+    cdef int reserve(self, size_t size) except -1:
+        cdef size_t capacity
+        cdef unsigned char* new_buffer
+        if self._length + size <= self._capacity:
+            return 0
+        capacity = self._capacity * 2
+        while capacity < self._length + size:
+            capacity *= 2
+        new_buffer = <unsigned char*>realloc(self._buffer, capacity)
+        if new_buffer == NULL:
+            raise MemoryError("Failed to grow encoder buffer.")
+        self._buffer = new_buffer
+        self._capacity = capacity
+        return 0
+
+    cdef int write(self, const unsigned char* data, size_t length) except -1:
+        self.reserve(length)
+        memcpy(self._buffer + self._length, data, length)
+        self._length += length
+        return 0
+
+    cdef int write_byte(self, unsigned char value) except -1:
+        self.reserve(1)
+        self._buffer[self._length] = value
+        self._length += 1
+        return 0
+
+    cdef int write_uint32(self, stdint.uint32_t value) except -1:
+        cdef int i
+        self.reserve(4)
+        for i in range(4):
+            self._buffer[self._length + i] = <unsigned char>(value >> (24 - 8 * i))
+        self._length += 4
+        return 0
+
+    cdef int write_uint64(self, stdint.uint64_t value) except -1:
+        cdef int i
+        self.reserve(8)
+        for i in range(8):
+            self._buffer[self._length + i] = <unsigned char>(value >> (56 - 8 * i))
+        self._length += 8
+        return 0
+
+    cdef int write_variable(self, unsigned char code8, unsigned char code32,
+                            const unsigned char* data, size_t length) except -1:
+        if length <= 255:
+            self.write_byte(code8)
+            self.write_byte(<unsigned char>length)
+        else:
+            self.write_byte(code32)
+            self.write_uint32(<stdint.uint32_t>length)
+        self.write(data, length)
+        return 0
+
+    cdef int write_string(self, bytes value) except -1:
+        return self.write_variable(0xa1, 0xb1, <const unsigned char*>(<char*>value), len(value))
+
+    cdef int write_symbol(self, bytes value) except -1:
+        return self.write_variable(0xa3, 0xb3, <const unsigned char*>(<char*>value), len(value))
+
+    cdef int write_uint(self, stdint.uint32_t value) except -1:
+        if value == 0:
+            self.write_byte(0x43)
+        elif value <= 255:
+            self.write_byte(0x52)
+            self.write_byte(<unsigned char>value)
+        else:
+            self.write_byte(0x70)
+            self.write_uint32(value)
+        return 0
+
+    cdef int write_ulong(self, stdint.uint64_t value) except -1:
+        if value == 0:
+            self.write_byte(0x44)
+        elif value <= 255:
+            self.write_byte(0x53)
+            self.write_byte(<unsigned char>value)
+        else:
+            self.write_byte(0x80)
+            self.write_uint64(value)
+        return 0
+
+    cdef int write_int(self, stdint.int32_t value) except -1:
+        if -128 <= value <= 127:
+            self.write_byte(0x54)
+            self.write_byte(<unsigned char>(<char>value))
+        else:
+            self.write_byte(0x71)
+            self.write_uint32(<stdint.uint32_t>value)
+        return 0
+
+    cdef int write_long(self, stdint.int64_t value) except -1:
+        if -128 <= value <= 127:
+            self.write_byte(0x55)
+            self.write_byte(<unsigned char>(<char>value))
+        else:
+            self.write_byte(0x81)
+            self.write_uint64(<stdint.uint64_t>value)
+        return 0
+
+    cdef int write_double(self, double value) except -1:
+        cdef stdint.uint64_t bits
+        memcpy(&bits, &value, 8)
+        self.write_byte(0x82)
+        self.write_uint64(bits)
+        return 0
+
+    cdef int write_timestamp(self, stdint.int64_t value) except -1:
+        self.write_byte(0x83)
+        self.write_uint64(<stdint.uint64_t>value)
+        return 0
+
+    cdef int write_bool(self, bint value) except -1:
+        return self.write_byte(0x41 if value else 0x42)
+
+    cdef int write_descriptor(self, stdint.uint64_t descriptor) except -1:
+        self.write_byte(0x00)
+        return self.write_ulong(descriptor)
+
+    cdef size_t begin_compound(self) except? 0:
+        # Reserve the short form constructor, size and count. The contents are
+        # moved along if the long form turns out to be needed.
+        cdef size_t start = self._length
+        self.reserve(3)
+        self._length += 3
+        return start
+
+    cdef int end_compound(self, size_t start, unsigned char code8, unsigned char code32,
+                          stdint.uint32_t count) except -1:
+        cdef size_t content_length = self._length - start - 3
+        cdef size_t end
+        if content_length + 1 <= 255 and count <= 255:
+            self._buffer[start] = code8
+            self._buffer[start + 1] = <unsigned char>(content_length + 1)
+            self._buffer[start + 2] = <unsigned char>count
+            return 0
+        self.reserve(6)
+        memmove(self._buffer + start + 9, self._buffer + start + 3, content_length)
+        end = self._length + 6
+        self._length = start
+        self.write_byte(code32)
+        self.write_uint32(<stdint.uint32_t>(content_length + 4))
+        self.write_uint32(count)
+        self._length = end
+        return 0
+
+    cdef int write_amqpvalue(self, c_amqpvalue.AMQP_VALUE value) except -1:
+        if c_amqpvalue.amqpvalue_encode(
+                value,
+                <c_amqpvalue.AMQPVALUE_ENCODER_OUTPUT>wire_encoder_output,
+                <void*>self) != 0:
+            raise ValueError("Failed to encode AMQP value.")
+        return 0
+
+    cpdef encode_value(self, value):
+        """Encode a Python value using the same type mapping as `uamqp.utils.data_factory`."""
+        cdef int type_code = get_py_type_code(value)
+        cdef size_t start
+        cdef stdint.uint32_t count
+        if type_code == PY_TYPE_NONE:
+            self.write_byte(0x40)
+        elif type_code == PY_TYPE_BOOL:
+            self.write_bool(value)
+        elif type_code == PY_TYPE_STR:
+            self.write_string(value.encode(self._encoding))
+        elif type_code == PY_TYPE_BYTES:
+            self.write_string(bytes(value))
+        elif type_code == PY_TYPE_UUID:
+            self.write_byte(0x98)
+            self.write(<const unsigned char*>(<char*>(<bytes>value.bytes)), 16)
+        elif type_code == PY_TYPE_BYTEARRAY:
+            self.encode_binary(value)
+        elif type_code == PY_TYPE_INT:
+            if -2147483648 <= value <= 2147483647:
+                self.write_int(<stdint.int32_t>value)
+            elif -9223372036854775808 <= value <= 9223372036854775807:
+                self.write_long(<stdint.int64_t>value)
+            else:
+                self.write_double(<double>value)
+        elif type_code == PY_TYPE_FLOAT:
+            self.write_double(<double>value)
+        elif type_code == PY_TYPE_DATETIME:
+            timestamp = int((calendar.timegm(value.utctimetuple()) * 1000) + (value.microsecond/1000))
+            self.write_timestamp(<stdint.int64_t>timestamp)
+        elif type_code == PY_TYPE_DICT:
+            start = self.begin_compound()
+            count = 0
+            for key, item in value.items():
+                self.encode_value(key)
+                self.encode_value(item)
+                count += 2
+            self.end_compound(start, 0xc1, 0xd1, count)
+        elif type_code == PY_TYPE_LIST:
+            if not value:
+                self.write_byte(0x45)
+            else:
+                start = self.begin_compound()
+                count = 0
+                for item in value:
+                    self.encode_value(item)
+                    count += 1
+                self.end_compound(start, 0xc0, 0xd0, count)
+        elif type_code == PY_TYPE_AMQP:
+            wrapped = getattr(value, 'c_data', value)
+            if not isinstance(wrapped, AMQPValue):
+                raise TypeError("Unsupported AMQP value type: {}".format(type(wrapped)))
+            self.write_amqpvalue((<AMQPValue>wrapped)._c_value)
+        else:
+            raise TypeError("Unsupported type for AMQP value: {}".format(type(value)))
+
+    cpdef encode_binary(self, data):
+        """Encode a bytes-like object as AMQP binary without copying it first."""
+        cdef const unsigned char[::1] view = as_byte_buffer(data)
+        if view.shape[0] == 0:
+            self.write_byte(0xa0)
+            self.write_byte(0)
+        else:
+            self.write_variable(0xa0, 0xb0, &view[0], view.shape[0])
+
+    cpdef encode_data(self, data):
+        """Encode a Data body section from a bytes-like object without copying it first."""
+        self.write_descriptor(SECTION_DATA)
+        self.encode_binary(data)
+
+    cpdef encode_described(self, stdint.uint64_t descriptor, value):
+        self.write_descriptor(descriptor)
+        self.encode_value(value)
+
+    cpdef encode_header(self, durable, priority, time_to_live, first_acquirer, delivery_count):
+        """Encode a header section. The delivery count is always included,
+        matching ~uamqp.message.MessageHeader.get_header_obj.
+        """
+        cdef size_t start
+        self.write_descriptor(SECTION_HEADER)
+        start = self.begin_compound()
+        if durable is None:
+            self.write_byte(0x40)
+        else:
+            self.write_bool(durable)
+        if priority is None:
+            self.write_byte(0x40)
+        else:
+            self.write_byte(0x50)
+            self.write_byte(<unsigned char>priority)
+        if time_to_live is None:
+            self.write_byte(0x40)
+        else:
+            self.write_uint(<stdint.uint32_t>time_to_live)
+        if first_acquirer is None:
+            self.write_byte(0x40)
+        else:
+            self.write_bool(first_acquirer)
+        self.write_uint(<stdint.uint32_t>(delivery_count or 0))
+        self.end_compound(start, 0xc0, 0xd0, 5)
+
+    cpdef encode_properties(self, message_id, user_id, to, subject, reply_to,
+                            correlation_id, content_type, content_encoding,
+                            absolute_expiry_time, creation_time, group_id,
+                            group_sequence, reply_to_group_id):
+        """Encode a properties section. The identifier and address fields are
+        expected to be wrapped values, as stored by ~uamqp.message.MessageProperties.
+        """
+        cdef size_t start
+        cdef stdint.uint32_t count = 0
+        cdef stdint.uint32_t index
+        fields = (
+            message_id, user_id, to, subject, reply_to, correlation_id, content_type,
+            content_encoding, absolute_expiry_time, creation_time, group_id,
+            group_sequence, reply_to_group_id)
+        for index in range(13):
+            if fields[index] is not None:
+                count = index + 1
+        self.write_descriptor(SECTION_PROPERTIES)
+        if count == 0:
+            self.write_byte(0x45)
+            return
+        start = self.begin_compound()
+        for index in range(count):
+            value = fields[index]
+            if value is None:
+                self.write_byte(0x40)
+            elif index == 1:
+                # The user-id is always binary, even when it is read back from C as bytes.
+                self.encode_binary(getattr(value, 'value', value))
+            elif index == 3 or index == 10 or index == 12:
+                self.write_string(value)
+            elif index == 6 or index == 7:
+                self.write_symbol(value)
+            elif index == 8 or index == 9:
+                self.write_timestamp(<stdint.int64_t>value)
+            elif index == 11:
+                self.write_uint(<stdint.uint32_t>value)
+            else:
+                self.encode_value(value)
+        self.end_compound(start, 0xc0, 0xd0, count)
+
+    cpdef encode_body(self, cMessage message):
+        """Encode the body sections of a message, reading the body data in place."""
+        cdef c_message.MESSAGE_HANDLE c_msg = <c_message.MESSAGE_HANDLE>message._c_value
+        cdef c_message.MESSAGE_BODY_TYPE_TAG body_type
+        cdef c_message.BINARY_DATA binary_data
+        cdef c_amqpvalue.AMQP_VALUE body_value
+        cdef size_t count
+        cdef size_t i
+        if c_message.message_get_body_type(c_msg, &body_type) != 0:
+            raise ValueError("Failure getting message body type")
+        if body_type == c_message.MESSAGE_BODY_TYPE_TAG.MESSAGE_BODY_TYPE_DATA:
+            if c_message.message_get_body_amqp_data_count(c_msg, &count) != 0:
+                raise ValueError("Cannot get body AMQP data count")
+            for i in range(count):
+                if c_message.message_get_body_amqp_data_in_place(c_msg, i, &binary_data) != 0:
+                    raise ValueError("Cannot get body AMQP data {}".format(i))
+                self.write_descriptor(SECTION_DATA)
+                self.write_variable(0xa0, 0xb0, binary_data.bytes, binary_data.length)
+        elif body_type == c_message.MESSAGE_BODY_TYPE_TAG.MESSAGE_BODY_TYPE_SEQUENCE:
+            if c_message.message_get_body_amqp_sequence_count(c_msg, &count) != 0:
+                raise ValueError("Cannot get body AMQP sequence count")
+            for i in range(count):
+                if c_message.message_get_body_amqp_sequence_in_place(c_msg, i, &body_value) != 0:
+                    raise ValueError("Cannot get body AMQP sequence {}".format(i))
+                self.write_descriptor(SECTION_AMQP_SEQUENCE)
+                self.write_amqpvalue(body_value)
+        elif body_type == c_message.MESSAGE_BODY_TYPE_TAG.MESSAGE_BODY_TYPE_VALUE:
+            if c_message.message_get_body_amqp_value_in_place(c_msg, &body_value) != 0:
+                raise ValueError("Cannot get body AMQP value")
+            self.write_descriptor(SECTION_AMQP_VALUE)
+            self.write_amqpvalue(body_value)
+
+    cpdef encode_delivery_annotations(self, value):
+        self.encode_described(SECTION_DELIVERY_ANNOTATIONS, value)
+
+    cpdef encode_message_annotations(self, value):
+        self.encode_described(SECTION_MESSAGE_ANNOTATIONS, value)
+
+    cpdef encode_application_properties(self, value):
+        self.encode_described(SECTION_APPLICATION_PROPERTIES, value)
+
+    cpdef encode_footer(self, value):
+        self.encode_described(SECTION_FOOTER, value)
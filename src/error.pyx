@@ -87,9 +87,10 @@ cdef class cError(StructBase):
         cdef c_amqp_definitions.fields info_value
         if  c_amqp_definitions.error_get_info(self._c_value, &info_value) != 0:
             return None
+        if <void*>info_value == NULL:
+            return None
         try:
-            info = value_factory(info_value)
-            return copy.deepcopy(info.value)
+            return amqpvalue_to_python(<c_amqpvalue.AMQP_VALUE>info_value)
         except TypeError:
             return None
 
@@ -26,6 +26,10 @@ class MessageBodyType(Enum):
     ValueType = c_message.MESSAGE_BODY_TYPE_TAG.MESSAGE_BODY_TYPE_VALUE
 
 
+# Looking up the member is much cheaper than calling the Enum for every received message.
+_message_body_types = {t.value: t for t in MessageBodyType}
+
+
 cdef message_factory(c_message.MESSAGE_HANDLE value):
     new_message = cMessage()
     new_message.wrap(value)
@@ -216,7 +220,7 @@ cdef class cMessage(StructBase):
     def body_type(self):
         cdef c_message.MESSAGE_BODY_TYPE_TAG value
         if c_message.message_get_body_type(self._c_value, &value) == 0:
-            return MessageBodyType(value)
+            return _message_body_types[value]
         else:
             self._value_error()
 
@@ -243,12 +247,14 @@ cdef class cMessage(StructBase):
         else:
             self._value_error()
 
-    cpdef add_body_data(self, bytes value):
+    cpdef add_body_data(self, value):
+        """Add a Data section from any buffer, such as bytes, bytearray, memoryview
+        or mmap. The data of a contiguous buffer is copied once, by the C message.
+        """
         cdef c_message.BINARY_DATA _binary
-        length = len(value)
-        bytes = value[:length]
-        _binary.length = length
-        _binary.bytes = bytes
+        cdef const unsigned char[::1] view = as_byte_buffer(value)
+        _binary.length = view.shape[0]
+        _binary.bytes = &view[0] if view.shape[0] > 0 else NULL
         if c_message.message_add_body_amqp_data(self._c_value, _binary) != 0:
             self._value_error()
 
@@ -259,6 +265,26 @@ cdef class cMessage(StructBase):
         else:
             self._value_error()
 
+    cpdef read_body_data(self, size_t index, size_t offset, size_t size):
+        """Copy at most `size` bytes of a Data section, starting at `offset`,
+        without copying the rest of the section.
+        """
+        cdef c_message.BINARY_DATA _value
+        cdef size_t end
+        if c_message.message_get_body_amqp_data_in_place(self._c_value, index, &_value) != 0:
+            self._value_error()
+        if offset >= _value.length:
+            return b""
+        end = min(offset + size, _value.length)
+        return _value.bytes[offset:end]
+
+    cpdef get_body_data_length(self, size_t index):
+        cdef c_message.BINARY_DATA _value
+        if c_message.message_get_body_amqp_data_in_place(self._c_value, index, &_value) == 0:
+            return _value.length
+        else:
+            self._value_error()
+
     cpdef count_body_data(self):
         cdef size_t body_count
         if c_message.message_get_body_amqp_data_count(self._c_value, &body_count) == 0:
@@ -751,6 +777,56 @@ cpdef size_t get_encoded_message_size(cMessage message, encoded_data):
         return total_encoded_size
 
 
+cpdef size_t get_encoded_body_size(cMessage message) except? 0:
+    """Get the encoded size of the body sections of a message, without encoding
+    or copying them.
+    """
+    cdef c_message.MESSAGE_HANDLE c_msg = message._c_value
+    cdef c_message.MESSAGE_BODY_TYPE_TAG message_body_type
+    cdef c_message.BINARY_DATA binary_data
+    cdef c_amqpvalue.AMQP_VALUE body_value
+    cdef c_amqpvalue.AMQP_VALUE body_section
+    cdef size_t count
+    cdef size_t i
+    cdef size_t encoded_size
+    cdef size_t total_encoded_size = 0
+    cdef int failed
+
+    if c_message.message_get_body_type(c_msg, &message_body_type) != 0:
+        raise ValueError("Failure getting message body type")
+    if message_body_type == c_message.MESSAGE_BODY_TYPE_TAG.MESSAGE_BODY_TYPE_DATA:
+        if c_message.message_get_body_amqp_data_count(c_msg, &count) != 0:
+            raise ValueError("Cannot get body AMQP data count")
+        for i in range(count):
+            if c_message.message_get_body_amqp_data_in_place(c_msg, i, &binary_data) != 0:
+                raise ValueError("Cannot get body AMQP data {}".format(i))
+            # The data section descriptor, followed by a vbin8 or vbin32 binary.
+            total_encoded_size += 3 + (2 if binary_data.length <= 255 else 5) + binary_data.length
+    elif message_body_type == c_message.MESSAGE_BODY_TYPE_TAG.MESSAGE_BODY_TYPE_VALUE or \
+            message_body_type == c_message.MESSAGE_BODY_TYPE_TAG.MESSAGE_BODY_TYPE_SEQUENCE:
+        count = 1
+        if message_body_type == c_message.MESSAGE_BODY_TYPE_TAG.MESSAGE_BODY_TYPE_SEQUENCE and \
+                c_message.message_get_body_amqp_sequence_count(c_msg, &count) != 0:
+            raise ValueError("Cannot get body AMQP sequence count")
+        for i in range(count):
+            if message_body_type == c_message.MESSAGE_BODY_TYPE_TAG.MESSAGE_BODY_TYPE_VALUE:
+                if c_message.message_get_body_amqp_value_in_place(c_msg, &body_value) != 0:
+                    raise ValueError("Cannot obtain AMQP value from body")
+                body_section = c_amqp_definitions.amqpvalue_create_amqp_value(body_value)
+            else:
+                if c_message.message_get_body_amqp_sequence_in_place(c_msg, i, &body_value) != 0:
+                    raise ValueError("Cannot get body AMQP sequence {}".format(i))
+                body_section = c_amqp_definitions.amqpvalue_create_amqp_sequence(body_value)
+            if <void*>body_section == NULL:
+                raise MemoryError("Cannot create body AMQP section")
+            failed = c_amqpvalue.amqpvalue_get_encoded_size(body_section, &encoded_size)
+            c_amqpvalue.amqpvalue_destroy(body_section)
+            if failed != 0:
+                raise ValueError("Cannot get body AMQP section encoded size")
+            total_encoded_size += encoded_size
+    return total_encoded_size
+
+
 cdef class cMessageDecoder(object):
 
     cdef c_message.MESSAGE_HANDLE decoded_message
@@ -6,7 +6,6 @@
 
 # Python imports
 import logging
-import copy
 
 # C imports
 from libc cimport stdint
@@ -16,10 +15,14 @@ cimport c_message_sender
 cimport c_link
 cimport c_async_operation
 cimport c_amqpvalue
+cimport c_amqp_definitions
 
 
 _logger = logging.getLogger(__name__)
 
+# The Accepted outcome carries no information, so it is reported as the same empty value for every message.
+_accepted_delivery_state = ()
+
 
 cpdef create_message_sender(cLink link, callback_context):
     sender = cMessageSender()
@@ -90,6 +93,20 @@ cdef class cMessageSender(StructBase):
             return False
         return True
 
+    cpdef send_encoded(self, bytes data, stdint.uint32_t message_format, c_amqp_definitions.tickcounter_ms_t timeout, callback_context):
+        # Transfer an already encoded message on the link, without building and encoding
+        # the sections of a C message. This fails rather than queueing the message when the
+        # link has no credit or is not attached, so that the caller can fall back to `send`.
+        cdef c_link.PAYLOAD payload
+        cdef c_link.LINK_TRANSFER_RESULT_TAG transfer_result
+        payload.bytes = <const unsigned char*>data
+        payload.length = len(data)
+        operation = c_link.link_transfer_async(<c_link.LINK_HANDLE>self._link._c_value, message_format, &payload, 1, on_encoded_message_settled, <void*>callback_context, &transfer_result, timeout)
+        if <void*>operation is NULL:
+            _logger.debug("Encoded transfer not sent: %r", transfer_result)
+            return False
+        return True
+
     cpdef set_trace(self, bint value):
         c_message_sender.messagesender_set_trace(self._c_value, value)
 
@@ -97,13 +114,25 @@ cdef class cMessageSender(StructBase):
 #### Callbacks (context is a MessageSender instance)
 
 
-cdef void on_message_send_complete(void* context, c_message_sender.MESSAGE_SEND_RESULT_TAG send_result, c_amqpvalue.AMQP_VALUE delivery_state) noexcept:
-    cdef c_amqpvalue.AMQP_VALUE send_data
+cdef object wrap_delivery_state(c_message_sender.MESSAGE_SEND_RESULT_TAG send_result, c_amqpvalue.AMQP_VALUE delivery_state):
+    # The delivery state is the described value of the outcome, so the outcome is known
+    # from the send result: a send is only OK with a delivery state when it was accepted.
     if <void*>delivery_state == NULL:
-        wrapped = None
-    else:
-        send_data = c_amqpvalue.amqpvalue_clone(delivery_state)
-        wrapped = copy.deepcopy(value_factory(send_data).value)
+        return None
+    if send_result == c_message_sender.MESSAGE_SEND_RESULT_TAG.MESSAGE_SEND_OK:
+        return _accepted_delivery_state
+    # Rejected, released and modified outcomes are converted to new Python objects, which
+    # do not reference the delivery state owned by the C sender.
+    return amqpvalue_to_python(delivery_state)
+
+
+cpdef _on_disposition_received(callback_context, AMQPValue delivery_state):
+    # Report an outcome to a send callback as the link does when a disposition is received.
+    on_encoded_message_settled(<void*>callback_context, 0, c_link.LINK_DELIVERY_SETTLE_REASON_TAG.LINK_DELIVERY_SETTLE_REASON_DISPOSITION_RECEIVED, delivery_state._c_value)
+
+
+cdef void on_message_send_complete(void* context, c_message_sender.MESSAGE_SEND_RESULT_TAG send_result, c_amqpvalue.AMQP_VALUE delivery_state) noexcept:
+    wrapped = wrap_delivery_state(send_result, delivery_state)
     if context != NULL:
         context_pyobj = <PyObject*>context
         if context_pyobj.ob_refcnt == 0: # context is being garbage collected, skip the callback
@@ -114,6 +143,27 @@ cdef void on_message_send_complete(void* context, c_message_sender.MESSAGE_SEND_
             context_obj._on_message_sent(context_obj, send_result, delivery_state=wrapped)
 
 
+cdef void on_encoded_message_settled(void* context, c_amqp_definitions.delivery_number delivery_no, c_link.LINK_DELIVERY_SETTLE_REASON_TAG reason, c_amqpvalue.AMQP_VALUE delivery_state) noexcept:
+    # The settle reason of an encoded transfer is mapped to a send result in the same way
+    # as in the C message sender, and the described value of the outcome is passed on.
+    cdef c_message_sender.MESSAGE_SEND_RESULT_TAG send_result = c_message_sender.MESSAGE_SEND_RESULT_TAG.MESSAGE_SEND_ERROR
+    cdef c_amqpvalue.AMQP_VALUE described = <c_amqpvalue.AMQP_VALUE>NULL
+    cdef c_amqpvalue.AMQP_VALUE descriptor
+    if reason == c_link.LINK_DELIVERY_SETTLE_REASON_TAG.LINK_DELIVERY_SETTLE_REASON_DISPOSITION_RECEIVED:
+        if <void*>delivery_state != NULL:
+            descriptor = c_amqpvalue.amqpvalue_get_inplace_descriptor(delivery_state)
+            described = c_amqpvalue.amqpvalue_get_inplace_described_value(delivery_state)
+            if <void*>descriptor != NULL and c_amqp_definitions.is_accepted_type_by_descriptor(descriptor):
+                send_result = c_message_sender.MESSAGE_SEND_RESULT_TAG.MESSAGE_SEND_OK
+    elif reason == c_link.LINK_DELIVERY_SETTLE_REASON_TAG.LINK_DELIVERY_SETTLE_REASON_SETTLED:
+        send_result = c_message_sender.MESSAGE_SEND_RESULT_TAG.MESSAGE_SEND_OK
+    elif reason == c_link.LINK_DELIVERY_SETTLE_REASON_TAG.LINK_DELIVERY_SETTLE_REASON_TIMEOUT:
+        send_result = c_message_sender.MESSAGE_SEND_RESULT_TAG.MESSAGE_SEND_TIMEOUT
+    elif reason == c_link.LINK_DELIVERY_SETTLE_REASON_TAG.LINK_DELIVERY_SETTLE_REASON_CANCELLED:
+        send_result = c_message_sender.MESSAGE_SEND_RESULT_TAG.MESSAGE_SEND_CANCELLED
+    on_message_send_complete(context, send_result, described)
+
+
 cdef void on_message_sender_state_changed(void* context, c_message_sender.MESSAGE_SENDER_STATE_TAG new_state, c_message_sender.MESSAGE_SENDER_STATE_TAG previous_state) noexcept:
     if context != NULL:
         context_pyobj = <PyObject*>context
@@ -6,7 +6,10 @@
 
 # Python imports
 from enum import Enum
+import collections
 import logging
+import threading
+import time
 import io
 
 # C imports
@@ -15,6 +18,13 @@ cimport c_xlogging
 
 
 _logger = logging.getLogger('uamqp.c_uamqp')
+_log_enabled = _logger.isEnabledFor
+
+# Fragments of the log line currently being written by each thread.
+_line_buffers = threading.local()
+
+# The most recent log lines, kept when enabled with enable_trace_buffer.
+_trace_buffer = None
 
 
 class LogCategory(Enum):
@@ -43,14 +53,16 @@ cdef char* vprintf_alloc(const char* format, c_xlogging.va_list va):
 
 
 cdef void custom_logging_function(c_xlogging.LOG_CATEGORY_TAG log_category, const char* file, const char* func, const int line, unsigned int options, const char* format, ...):
-    log_level = LogCategory(log_category)
     cdef c_xlogging.va_list args
-    cdef char* text
+    cdef char* text = NULL
+    # Skip formatting entirely when nothing would be done with the text.
+    if _trace_buffer is None and not _log_enabled(logging.INFO):
+        return
     c_xlogging.va_start(args, format)
     try:
         text = vprintf_alloc(format, args)
         if <void*>text != NULL:
-            _python_log(log_level, text, bool(options), file=file, func=func, line=line)
+            _python_log(log_category, text, options != 0, file, func, line)
     except KeyboardInterrupt:
         pass
     finally:
@@ -63,15 +75,59 @@ cpdef set_python_logger():
     c_xlogging.xlogging_set_log_function(<c_xlogging.LOGGER_LOG>custom_logging_function)
 
 
-def _python_log(category, text, end, text_bldr=[], file=None, func=None, line=None):
-    text_bldr.append(text)
-    if not end:
+cpdef enable_trace_buffer(size_t size=1000):
+    """Keep the most recent `size` lines of C log output, including the frame trace
+    of links and connections with debug enabled, whether or not the Python logger
+    is enabled. The lines can be read with `get_trace_buffer`.
+    """
+    global _trace_buffer
+    _trace_buffer = collections.deque(maxlen=size)
+
+
+cpdef disable_trace_buffer():
+    global _trace_buffer
+    _trace_buffer = None
+
+
+cpdef get_trace_buffer():
+    """Get the lines held by the trace buffer, oldest first, as a list of
+    (timestamp, line) tuples.
+    """
+    if _trace_buffer is None:
+        return []
+    return list(_trace_buffer)
+
+
+cpdef dump_trace_buffer(level=logging.WARNING):
+    """Log and clear the lines held by the trace buffer, if it is enabled."""
+    if not _trace_buffer:
         return
+    lines = list(_trace_buffer)
+    _trace_buffer.clear()
+    _logger.log(level, "Dumping %r recent trace lines.", len(lines))
+    for timestamp, log_line in lines:
+        _logger.log(level, "%.6f %r", timestamp, log_line)
 
-    log_line = b''
-    while text_bldr:
-        log_line += text_bldr.pop(0)
-    if category == LogCategory.Debug or category == LogCategory.Info:
+
+cdef _python_log(c_xlogging.LOG_CATEGORY_TAG log_category, bytes text, bint end, const char* file, const char* func, int line):
+    try:
+        fragments = _line_buffers.fragments
+    except AttributeError:
+        fragments = _line_buffers.fragments = []
+    if not end:
+        fragments.append(text)
+        return
+    if fragments:
+        fragments.append(text)
+        log_line = b"".join(fragments)
+        del fragments[:]
+    else:
+        log_line = text
+    if _trace_buffer is not None:
+        _trace_buffer.append((time.time(), log_line))
+    if not _log_enabled(logging.INFO):
+        return
+    if log_category != c_xlogging.LOG_CATEGORY_TAG.AZ_LOG_ERROR:
         _logger.info("%r", log_line)
     else:
         _logger.info("%r (%r:%r:%r)", log_line, file, func, line)
@@ -163,12 +163,45 @@ def test_binary_value():
     assert value.value == b"\x00Sr\xc1(\x02\xa3\x1cx-opt-scheduled-enqueue-time\x83\x00\x00\x01f\xcc\x90\xe5\xa0\x00Ss\xc0\'\x01\xa1$e3a98c25-4574-4dbf-a5bf-2e5cd7f19882\x00Su\xa0\nhalloween2"
 
 
+def test_binary_value_from_buffer():
+    import mmap
+    payload = bytes(range(256)) * 4096
+    value = c_uamqp.binary_value(memoryview(payload)[256:])
+    assert len(value) == len(payload) - 256
+    assert value.value == payload[256:]
+
+    with mmap.mmap(-1, len(payload)) as mapped:
+        mapped.write(payload)
+        value = c_uamqp.binary_value(mapped)
+        assert value.value == payload
+
+    value = c_uamqp.binary_value(b'')
+    assert len(value) == 0
+    assert value.value == b''
+    with pytest.raises(TypeError):
+        c_uamqp.binary_value(u'Test')
+
+    import array
+    ints = array.array('i', [1, 2])
+    value = c_uamqp.binary_value(memoryview(ints))
+    assert value.value == ints.tobytes()
+    value = c_uamqp.binary_value(memoryview(b'abcdef')[::2])
+    assert value.value == b'ace'
+    value = c_uamqp.string_value(memoryview(b'abcdef')[::2])
+    assert value.value == b'ace'
+
+
 def test_string_value():
     value = c_uamqp.string_value('Test'.encode('utf-8'))
     assert value.value == b'Test'
     assert value.type == c_uamqp.AMQPType.StringValue
     assert str(value) == "Test"
 
+    value = c_uamqp.string_value(memoryview(b'TestString')[:4])
+    assert value.value == b'Test'
+    value = c_uamqp.symbol_value(bytearray(b'x-opt-offset'))
+    assert value.value == b'x-opt-offset'
+
 
 def test_symbol_value():
     value = c_uamqp.symbol_value(b'Test')
@@ -258,4 +291,112 @@ def test_equal_values():
     assert value_a == value_b
     assert value_c == value_d
     assert value_a != value_c
-    assert value_d != value_e
\ No newline at end of file
+    assert value_d != value_e
+
+def test_nested_value():
+    uuid_val = uuid.uuid4()
+    inner = c_uamqp.list_value()
+    inner.size = 4
+    inner[0] = c_uamqp.bool_value(False)
+    inner[1] = c_uamqp.uuid_value(uuid_val)
+    inner[2] = c_uamqp.null_value()
+    inner[3] = c_uamqp.binary_value(b'')
+    array = c_uamqp.array_value()
+    array.append(c_uamqp.double_value(1.5))
+    array.append(c_uamqp.double_value(-2.0))
+
+    value = c_uamqp.dict_value()
+    value[c_uamqp.symbol_value(b'x-opt-sequence-number')] = c_uamqp.long_value(-12345678901)
+    value[c_uamqp.symbol_value(b'x-opt-enqueued-time')] = c_uamqp.timestamp_value(1600000000000)
+    value[c_uamqp.string_value(b'nested')] = inner
+    value[c_uamqp.int_value(3)] = array
+    value[c_uamqp.string_value(b'char')] = c_uamqp.char_value(ord('x'))
+    value[c_uamqp.string_value(b'ulong')] = c_uamqp.ulong_value(2**64 - 1)
+
+    expected = {
+        b'x-opt-sequence-number': -12345678901,
+        b'x-opt-enqueued-time': 1600000000000,
+        b'nested': [False, uuid_val, None, b''],
+        3: [1.5, -2.0],
+        b'char': 'x',
+        b'ulong': 2**64 - 1
+    }
+    assert value.value == expected
+    assert value.value is not value.value
+
+    described = c_uamqp.described_value(c_uamqp.ulong_value(0x74), value)
+    assert described.value == expected
+
+
+def test_data_factory():
+    from collections import OrderedDict
+    from datetime import datetime
+    from uamqp import types, utils
+
+    uuid_val = uuid.uuid4()
+    value = utils.data_factory(OrderedDict([
+        ('str', 'value'),
+        (b'bytes', b'value'),
+        ('binary', bytearray(b'\x00\x01')),
+        ('int', 1),
+        ('long', 2**40),
+        ('huge', 2**70),
+        ('bool', True),
+        ('float', 1.5),
+        ('uuid', uuid_val),
+        ('timestamp', datetime(2020, 9, 13, 12, 26, 40)),
+        ('nested', [None, (1, 2), {'a': types.AMQPSymbol(b'sym')}]),
+        (types.AMQPSymbol(b'x-opt-key'), types.AMQPuLong(7))
+    ]))
+    assert value.type == c_uamqp.AMQPType.DictValue
+    assert value[c_uamqp.string_value(b'int')].type == c_uamqp.AMQPType.IntValue
+    assert value[c_uamqp.string_value(b'long')].type == c_uamqp.AMQPType.LongValue
+    assert value[c_uamqp.string_value(b'huge')].type == c_uamqp.AMQPType.DoubleValue
+    assert value[c_uamqp.string_value(b'binary')].type == c_uamqp.AMQPType.BinaryValue
+    assert value[c_uamqp.symbol_value(b'x-opt-key')].type == c_uamqp.AMQPType.ULongValue
+    assert value.value == {
+        b'str': b'value',
+        b'bytes': b'value',
+        b'binary': b'\x00\x01',
+        b'int': 1,
+        b'long': 2**40,
+        b'huge': float(2**70),
+        b'bool': True,
+        b'float': 1.5,
+        b'uuid': uuid_val,
+        b'timestamp': 1600000000000,
+        b'nested': [None, [1, 2], {b'a': b'sym'}],
+        b'x-opt-key': 7
+    }
+
+    wrapped = c_uamqp.int_value(1)
+    assert utils.data_factory(wrapped) is wrapped
+    assert utils.data_factory(object()) is None
+    with pytest.raises(TypeError):
+        utils.data_factory({'key': object()})
+
+
+def test_wire_encoder():
+    encoder = c_uamqp.WireEncoder(capacity=4)
+    encoder.encode_value(None)
+    encoder.encode_value(True)
+    encoder.encode_value(-1)
+    encoder.encode_value(2**40)
+    encoder.encode_value('ab')
+    encoder.encode_value([])
+    encoder.encode_value({b'k': 1})
+    assert encoder.getvalue() == (
+        b'\x40' b'\x41' b'\x54\xff' b'\x81\x00\x00\x01\x00\x00\x00\x00\x00'
+        b'\xa1\x02ab' b'\x45' b'\xc1\x06\x02\xa1\x01k\x54\x01')
+
+    encoder.reset()
+    encoder.encode_value([1] * 200)
+    encoded = encoder.getvalue()
+    assert encoded[:9] == b'\xd0\x00\x00\x01\x94\x00\x00\x00\xc8'
+    assert len(encoded) == 9 + 400
+
+    encoder.reset()
+    encoder.encode_binary(memoryview(b'\x00' * 256))
+    assert encoder.getvalue()[:5] == b'\xb0\x00\x00\x01\x00'
+    with pytest.raises(TypeError):
+        encoder.encode_value(object())
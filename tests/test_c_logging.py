@@ -0,0 +1,41 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import logging
+
+import pytest
+
+from uamqp import c_uamqp
+
+
+def _log_c_error():
+    # An invalid base64 key makes the C library log an error.
+    with pytest.raises(ValueError):
+        c_uamqp.create_sas_token(b"abc", b"scope", b"name", 9999999999)
+
+
+def test_trace_buffer(caplog):
+    c_uamqp.enable_trace_buffer(1)
+    try:
+        with caplog.at_level(logging.WARNING, logger="uamqp.c_uamqp"):
+            _log_c_error()
+            assert not caplog.records
+            lines = c_uamqp.get_trace_buffer()
+            assert len(lines) == 1
+            assert lines[0][1] == b"Unable to decode the key for generating the SAS."
+            c_uamqp.dump_trace_buffer()
+        assert len(caplog.records) == 2
+        assert not c_uamqp.get_trace_buffer()
+    finally:
+        c_uamqp.disable_trace_buffer()
+    assert c_uamqp.get_trace_buffer() == []
+
+
+def test_c_logging_level(caplog):
+    with caplog.at_level(logging.INFO, logger="uamqp.c_uamqp"):
+        _log_c_error()
+    assert [r.getMessage() for r in caplog.records][-1].startswith(
+        "b'Unable to decode the key for generating the SAS.'")
@@ -38,6 +38,26 @@ def test_body_value():
     assert body.type == c_uamqp.AMQPType.StringValue
 
 
+def test_body_data_from_buffer():
+    message = c_uamqp.create_message()
+    payload = b'x' * 1024 + b'y' * 1024
+    message.add_body_data(memoryview(payload)[1024:])
+    message.add_body_data(bytearray(b'z'))
+    message.add_body_data(b'')
+    assert message.body_type == c_uamqp.MessageBodyType.DataType
+    assert message.count_body_data() == 3
+    assert message.get_body_data(0) == b'y' * 1024
+    assert message.get_body_data(1) == b'z'
+    assert message.get_body_data(2) == b''
+
+    import array
+    ints = array.array('i', [1, 2])
+    message.add_body_data(memoryview(ints))
+    message.add_body_data(memoryview(b'abcdef')[::2])
+    assert message.get_body_data(3) == ints.tobytes()
+    assert message.get_body_data(4) == b'ace'
+
+
 def test_delivery_tag():
     message = c_uamqp.create_message()
     assert not message.delivery_tag
@@ -67,3 +87,138 @@ def test_message_properties():
     value = c_uamqp.create_properties()
     value.user_id = utils.data_factory(bytearray(b'\nweird\0user\1id\0\t'))
     assert value.user_id == b'\nweird\0user\1id\0\t'
+
+
+def test_columnar_batch():
+    from array import array
+    from uamqp import Message, constants, types
+
+    encoded = [
+        Message(body=[b'first', b'-body'], annotations={
+            types.AMQPSymbol(b'x-opt-sequence-number'): types.AMQPLong(7),
+            types.AMQPSymbol(b'x-opt-offset'): b'1024',
+            types.AMQPSymbol(b'x-opt-enqueued-time'): types.AMQPLong(1600000000000),
+            types.AMQPSymbol(b'x-opt-partition-key'): types.AMQPSymbol(b'key')}).encode_message(),
+        Message(body=b'second').encode_message(),
+        Message(body=u'value').encode_message(),
+    ]
+    batch = c_uamqp.ColumnarBatch(2, constants.COLUMNAR_BATCH_FIELDS)
+    assert all(batch.append(c_uamqp.decode_message(len(e), e)) for e in encoded[:2])
+    assert not batch.append(c_uamqp.decode_message(len(encoded[2]), encoded[2]))
+    assert len(batch) == 2
+
+    assert list(batch.bodies) == [b'first-body', b'second']
+    assert bytes(batch.bodies.data) == b'first-bodysecond'
+    assert list(batch.bodies.offsets) == [0, 10, 16]
+    assert batch.columns['sequence_number'] == array('q', [7, -1])
+    assert batch.columns['enqueued_time'] == array('q', [1600000000000, -1])
+    assert list(batch.columns['offset']) == [b'1024', b'']
+    assert batch.columns['partition_key'][-2] == b'key'
+    assert memoryview(batch.columns['sequence_number']).format == 'q'
+
+    with pytest.raises(ValueError):
+        c_uamqp.ColumnarBatch(1, [("sequence_number", b"x-opt-sequence-number", "float")])
+
+
+def test_columnar_batch_receiver():
+    from uamqp import Message, constants, metrics
+    from uamqp.receiver import MessageReceiver
+
+    class MockCReceiver(object):
+        def __init__(self):
+            self.accepted = []
+
+        def last_received_message_number(self):
+            return len(self.accepted)
+
+        def settle_accepted_message(self, message_number):
+            self.accepted.append(message_number)
+
+    class MockReceiver(object):
+        def __init__(self):
+            self._receiver = MockCReceiver()
+            self._settle_mode = constants.ReceiverSettleMode.PeekLock
+            self._columnar_batch = c_uamqp.ColumnarBatch(1, [])
+            self.metrics = metrics.Metrics('receiver')
+            self.received = []
+            self.encoding = 'UTF-8'
+
+        def on_message_received(self, message):
+            self.received.append(message)
+
+    encoded = Message(body=b'event').encode_message()
+    receiver = MockReceiver()
+    for _ in range(2):
+        MessageReceiver._message_received(receiver, c_uamqp.decode_message(len(encoded), encoded))
+    assert receiver._receiver.accepted == [0]
+    assert list(receiver._columnar_batch.bodies) == [b'event']
+    assert len(receiver.received) == 1
+    assert receiver.metrics.snapshot()['counters'] == {'transfers': 2, 'dispositions.accepted': 1}
+
+
+def test_message_pool():
+    from uamqp import Message
+
+    c_uamqp.set_pool_limits(messages=1)
+    try:
+        scratch = c_uamqp.acquire_message()
+        Message(body=b'', application_properties={'key': 'value'})._populate_message_attributes(scratch)
+        assert scratch.application_properties is not None
+        c_uamqp.release_message(scratch)
+        assert c_uamqp.get_pool_stats()['messages']['size'] == 1
+
+        reused = c_uamqp.acquire_message()
+        assert reused is scratch
+        assert reused.application_properties is None
+        assert reused.body_type == c_uamqp.MessageBodyType.NoneType
+
+        # Messages with a body cannot be reset and are destroyed.
+        reused.add_body_data(b'data')
+        before = c_uamqp.get_pool_stats()['messages']
+        c_uamqp.release_message(reused)
+        after = c_uamqp.get_pool_stats()['messages']
+        assert after['size'] == 0
+        assert after['discarded'] == before['discarded'] + 1
+    finally:
+        c_uamqp.set_pool_limits(messages=64)
+
+
+def test_value_pool():
+    before = c_uamqp.get_pool_stats()['values']
+    first = c_uamqp.create_value({'pooled-key': None, b'pooled-key': True})
+    assert first.value == {b'pooled-key': True}
+    assert c_uamqp.get_pool_stats()['values']['hits'] >= before['hits'] + 2
+
+    # A value is only pooled once it is used a second time.
+    c_uamqp.set_pool_limits(values=2)
+    try:
+        before = c_uamqp.get_pool_stats()['values']
+        values = [c_uamqp.symbol_value(b'pooled-symbol') for _ in range(3)]
+        assert values[0] == values[2]
+        stats = c_uamqp.get_pool_stats()['values']
+        assert stats['misses'] == before['misses'] + 2
+        assert stats['hits'] == before['hits'] + 1
+
+        for i in range(10):
+            assert c_uamqp.string_value('unique-{}'.format(i).encode('utf-8')).value
+        assert c_uamqp.get_pool_stats()['values']['size'] <= 2
+        before = c_uamqp.get_pool_stats()['values']
+        c_uamqp.symbol_value(b'pooled-symbol')
+        assert c_uamqp.get_pool_stats()['values']['hits'] == before['hits'] + 1
+
+        # The least recently used value is evicted when the pool is full.
+        for value in (b'a', b'a', b'b', b'b', b'c', b'c'):
+            c_uamqp.string_value(value)
+        stats = c_uamqp.get_pool_stats()['values']
+        assert stats['size'] == 2
+        assert stats['discarded'] > before['discarded']
+    finally:
+        c_uamqp.set_pool_limits(values=1024)
+
+    c_uamqp.set_pool_limits(values=0)
+    try:
+        assert c_uamqp.get_pool_stats()['values']['size'] == 0
+        assert c_uamqp.string_value(b'unpooled').value == b'unpooled'
+        assert c_uamqp.get_pool_stats()['values']['size'] == 0
+    finally:
+        c_uamqp.set_pool_limits(values=1024)
@@ -92,3 +92,42 @@ def test_delivery_modified():
     #assert mod_val[1].type == c_uamqp.AMQPType.BoolValue
     #assert mod_val[1].value == False
     assert mod_val[2].type == c_uamqp.AMQPType.StringValue
+
+
+
+def _described_list(descriptor, *items):
+    # Build a performative as it is decoded from the wire, rather than as a composite.
+    value = c_uamqp.list_value()
+    value.size = len(items)
+    for index, item in enumerate(items):
+        value[index] = item
+    return c_uamqp.described_value(c_uamqp.ulong_value(descriptor), value)
+
+
+def test_delivery_state_conversion():
+    from uamqp import constants, errors
+
+    class SendContext(object):
+        def __init__(self):
+            self.results = []
+
+        def _on_message_sent(self, message, result, delivery_state=None):
+            self.results.append((result, delivery_state))
+
+    context = SendContext()
+    c_uamqp._on_disposition_received(context, c_uamqp.Messaging.delivery_accepted())
+    assert context.results.pop() == (constants.MessageSendResult.Ok.value, ())
+    c_uamqp._on_disposition_received(context, _described_list(0x24))
+    assert context.results.pop() == (constants.MessageSendResult.Ok.value, ())
+
+    error = _described_list(0x1d, c_uamqp.symbol_value(b'amqp:internal-error'), c_uamqp.string_value(b'Failed'))
+    c_uamqp._on_disposition_received(context, _described_list(0x25, error))
+    result, delivery_state = context.results.pop()
+    assert result == constants.MessageSendResult.Error.value
+    response = errors.ErrorResponse(delivery_state)
+    assert response.condition == b'amqp:internal-error'
+    assert response.description == b'Failed'
+
+    c_uamqp._on_disposition_received(
+        context, _described_list(0x27, c_uamqp.bool_value(True), c_uamqp.bool_value(False)))
+    assert context.results.pop() == (constants.MessageSendResult.Error.value, [True, False])
@@ -0,0 +1,91 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import functools
+import os
+import sys
+from datetime import datetime
+
+root_path = os.path.realpath('.')
+sys.path.append(root_path)
+
+from uamqp import Message, ReceivedMessage, c_uamqp, errors, types
+
+
+ITERATIONS = 2000
+
+
+def _event_hubs_message():
+    # The annotations set by Event Hubs on every received event.
+    annotations = {
+        types.AMQPSymbol(b'x-opt-sequence-number'): types.AMQPLong(4815162342),
+        types.AMQPSymbol(b'x-opt-offset'): b'1099511627776',
+        types.AMQPSymbol(b'x-opt-enqueued-time'): datetime(2020, 9, 13, 12, 26, 40),
+        types.AMQPSymbol(b'x-opt-partition-key'): b'device-42',
+    }
+    application_properties = {b'tenant': b'contoso', b'retry': 3}
+    message = Message(
+        body=b'{"temperature": 21.5}',
+        annotations=annotations,
+        application_properties=application_properties)
+    return message.encode_message()
+
+
+def test_annotation_map_decode():
+    encoded = _event_hubs_message()
+    messages = [Message.decode_from_bytes(encoded) for _ in range(ITERATIONS)]
+    expected = {
+        b'x-opt-sequence-number': 4815162342,
+        b'x-opt-offset': b'1099511627776',
+        b'x-opt-enqueued-time': 1600000000000,
+        b'x-opt-partition-key': b'device-42',
+    }
+    assert messages[0].annotations == expected
+
+    # Converting the whole map through the C section wrapper.
+    c_annotations = [m._message.message_annotations for m in messages]
+    assert all(a.map == c_annotations[0].map for a in c_annotations)
+
+    # Wrapping the map as AMQPValue objects, as done for every received value.
+    assert all(a.value.value == c_annotations[0].value.value for a in c_annotations)
+
+    # Looking up a single annotation without converting the map.
+    assert all(m.get_annotation(b'x-opt-sequence-number') == 4815162342 for m in messages)
+
+
+def test_receive_path():
+    encoded = _event_hubs_message()
+    c_messages = [c_uamqp.decode_message(len(encoded), encoded) for _ in range(ITERATIONS)]
+
+    class MockReceiver(object):
+        def __init__(self):
+            self.settled = 0
+
+        def _settle_message(self, message_number, response):
+            if response and not isinstance(response, errors.MessageAlreadySettled):
+                self.settled += 1
+
+    receiver = MockReceiver()
+
+    def message_path():
+        # Wrap, read the sequence number and accept, with a settler closure for every message.
+        for number, c_message in enumerate(c_messages):
+            message = Message(
+                message=c_message,
+                settler=functools.partial(receiver._settle_message, number),
+                delivery_no=number)
+            message.get_annotation(b'x-opt-sequence-number')
+            message.accept()
+
+    def received_message_path():
+        for number, c_message in enumerate(c_messages):
+            message = ReceivedMessage(message=c_message, delivery_no=number, receiver=receiver)
+            message.get_annotation(b'x-opt-sequence-number')
+            message.accept()
+
+    message_path()
+    received_message_path()
+    assert receiver.settled == ITERATIONS * 2
@@ -0,0 +1,312 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import threading
+import time
+
+import pytest
+
+from uamqp import authentication, constants, errors
+
+
+class MockConnection(object):
+    container_id = "mock"
+    _closing = False
+    _error = None
+
+    def lock(self):
+        pass
+
+    def release(self):
+        pass
+
+
+class MockCBSAuth(object):
+
+    def __init__(self, status):
+        self.status = status
+        self.refreshed = []
+
+    def get_status(self):
+        return self.status.value
+
+    def refresh(self, token, expires_at):
+        self.refreshed.append(token)
+        self.status = constants.CBSAuthStatus.InProgress
+
+    def destroy(self):
+        self.status = constants.CBSAuthStatus.Idle
+
+
+class AccessToken(object):
+
+    def __init__(self, token):
+        self.token = token
+        self.expires_on = time.time() + 3600
+
+
+def test_refresh_token_in_background():
+    fetched = threading.Event()
+    release = threading.Event()
+
+    def get_token():
+        fetched.set()
+        release.wait(5)
+        return AccessToken("refreshed")
+
+    auth = authentication.JWTTokenAuth(
+        "sb://fake/fake", "sb://fake/fake", get_token, refresh_in_background=True)
+    auth.token = b"current"
+    auth._connection = MockConnection()
+    auth._cbs_auth = MockCBSAuth(constants.CBSAuthStatus.RefreshRequired)
+
+    assert auth.handle_token() == (False, False)
+    assert fetched.wait(5)
+    assert auth.handle_token() == (False, False)
+    assert auth.token == b"current"
+    assert not auth._cbs_auth.refreshed
+
+    release.set()
+    auth._token_refresh.join(5)
+    assert auth.handle_token() == (False, False)
+    assert auth._cbs_auth.refreshed == [b"refreshed"]
+    assert auth._token_refresh is None
+
+
+def test_refresh_token_in_background_error():
+    def get_token():
+        raise errors.TokenExpired("No token")
+
+    auth = authentication.JWTTokenAuth(
+        "sb://fake/fake", "sb://fake/fake", get_token, refresh_in_background=True)
+    auth._connection = MockConnection()
+    auth._cbs_auth = MockCBSAuth(constants.CBSAuthStatus.RefreshRequired)
+    auth.handle_token()
+    auth._token_refresh.join(5)
+    with pytest.raises(errors.TokenExpired):
+        auth.handle_token()
+
+
+def test_refresh_token_before_refresh_window():
+    fetched = []
+
+    def get_token():
+        fetched.append(1)
+        return AccessToken("refreshed")
+
+    auth = authentication.JWTTokenAuth(
+        "sb://fake/fake", "sb://fake/fake", get_token, expires_at=time.time() + 100,
+        refresh_window=10, refresh_in_background=True, refresh_lead_time=30)
+    auth.token = b"current"
+    auth._connection = MockConnection()
+    auth._cbs_auth = MockCBSAuth(constants.CBSAuthStatus.Ok)
+    assert auth.handle_token() == (False, False)
+    assert auth._token_refresh is None
+
+    # The new token is fetched once the lead time before the refresh window is reached.
+    auth.expires_at = time.time() + 35
+    assert auth.handle_token() == (False, False)
+    auth._token_refresh.join(5)
+    assert fetched == [1]
+    assert auth.token == b"current"
+    assert not auth._cbs_auth.refreshed
+
+    # It is ready when the refresh is due.
+    auth._cbs_auth.status = constants.CBSAuthStatus.RefreshRequired
+    assert auth.handle_token() == (False, False)
+    assert auth._cbs_auth.refreshed == [b"refreshed"]
+    assert fetched == [1]
+
+
+def test_close_discards_token_refresh():
+    release = threading.Event()
+
+    def get_token():
+        release.wait(5)
+        return AccessToken("refreshed")
+
+    auth = authentication.JWTTokenAuth(
+        "sb://fake/fake", "sb://fake/fake", get_token, refresh_in_background=True)
+    auth.token = b"current"
+    auth._connection = MockConnection()
+    auth._cbs_auth = MockCBSAuth(constants.CBSAuthStatus.RefreshRequired)
+    auth._session = MockCBSAuth(constants.CBSAuthStatus.Ok)
+    auth.handle_token()
+    token_refresh = auth._token_refresh
+
+    auth.close_authenticator()
+    assert auth._token_refresh is None
+    release.set()
+    token_refresh.join(5)
+    assert auth.token == b"current"
+
+
+def test_token_cache(tmp_path):
+    cache = authentication.TokenCache(max_size=2)
+    cache.put(b"a", b"jwt", b"token-a", time.time() + 100)
+    cache.put(b"b", b"jwt", b"token-b", time.time() - 1)
+    assert cache.get(b"a", b"jwt")[0] == b"token-a"
+    assert cache.get(b"a", b"jwt", min_validity=200) is None
+    assert cache.get(b"b", b"jwt") is None
+    cache.put(b"c", b"jwt", b"token-c", time.time() + 100)
+    assert len(cache) == 2
+    assert cache.get(b"a", b"jwt")[0] == b"token-a"
+    cache.put(b"d", b"jwt", b"token-d", time.time() + 100)
+    assert cache.get(b"c", b"jwt") is None
+
+    shared = authentication.TokenCache(path=str(tmp_path))
+    shared.put(b"a", b"jwt", b"token-a", time.time() + 100)
+    other = authentication.TokenCache(path=str(tmp_path))
+    assert other.get(b"a", b"jwt")[0] == b"token-a"
+    other.remove(b"a", b"jwt")
+    shared.clear()
+    assert shared.get(b"a", b"jwt") is None
+
+
+def test_token_cache_shared_between_auths():
+    calls = []
+
+    def get_token():
+        calls.append(1)
+        return AccessToken("token-{}".format(len(calls)))
+
+    cache = authentication.TokenCache()
+    auths = [authentication.JWTTokenAuth(
+        "sb://fake/fake", "sb://fake/fake", get_token, token_cache=cache) for _ in range(3)]
+    for auth in auths:
+        auth.update_token()
+    assert len(calls) == 1
+    assert all(auth.token == b"token-1" for auth in auths)
+
+    sas_auth = authentication.SASTokenAuth.from_shared_access_key(
+        "sb://fake/fake", "key", "secret", token_cache=cache)
+    sas_auth.update_token()
+    assert cache.get(sas_auth.audience, sas_auth.token_type)[0] == sas_auth.token
+
+
+def test_token_cache_coalesces_fetches():
+    import asyncio
+    calls = []
+
+    def get_token():
+        calls.append(1)
+        time.sleep(0.05)
+        return AccessToken("token-{}".format(len(calls)))
+
+    cache = authentication.TokenCache()
+    auths = [authentication.JWTTokenAuth(
+        "sb://fake/fake", "sb://fake/fake", get_token, token_cache=cache) for _ in range(5)]
+    threads = [threading.Thread(target=auth.update_token) for auth in auths]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 1
+    assert all(auth.token == b"token-1" for auth in auths)
+
+    # A failed fetch is retried by a waiting caller.
+    def fail():
+        raise errors.TokenExpired("No token")
+    with pytest.raises(errors.TokenExpired):
+        cache.fetch(b"other", b"jwt", fail)
+    assert cache.fetch(b"other", b"jwt", lambda: (b"token", time.time() + 60))[0] == b"token"
+
+    async_calls = []
+
+    async def get_token_async():
+        async_calls.append(1)
+        await asyncio.sleep(0.01)
+        return AccessToken("async-token")
+
+    async def update_all():
+        async_cache = authentication.TokenCache()
+        async_auths = [authentication.JWTTokenAsync(
+            "sb://fake/fake", "sb://fake/fake", get_token_async, token_cache=async_cache) for _ in range(5)]
+        await asyncio.gather(*[auth.update_token() for auth in async_auths])
+        return async_auths
+
+    assert all(auth.token == b"async-token" for auth in asyncio.run(update_all()))
+    assert len(async_calls) == 1
+
+
+def test_sas_token_factory():
+    import base64
+    import datetime
+    from uamqp import c_uamqp, utils
+
+    key = b"a secret key with + and / in its signature?"
+    factory = utils.SASTokenFactory(b"RootManageSharedAccessKey", key)
+    now = int(time.time())
+    for scope, expiry in [(b"sb%3A%2F%2Ffake%2Ffake", now + 3600), (b"sb://fake", now + 123)]:
+        expected = c_uamqp.create_sas_token(base64.b64encode(key), scope, b"RootManageSharedAccessKey", expiry)
+        assert factory.create_token(scope, expiry) == expected
+
+    token, expires_at = factory.get_token(b"scope", datetime.timedelta(seconds=3600))
+    assert expires_at >= time.time() + 3590
+    assert factory.get_token(b"scope", datetime.timedelta(seconds=3600)) == (token, expires_at)
+    assert factory.get_token(b"scope", datetime.timedelta(seconds=7200))[0] != token
+    assert utils.SASTokenFactory.for_key(b"name", key) is utils.SASTokenFactory.for_key(b"name", key)
+    assert all(key not in k for k in utils.SASTokenFactory._factories)
+
+    bounded = utils.SASTokenFactory(b"name", key, max_tokens=2)
+    for i in range(5):
+        bounded.get_token(str(i).encode())
+    assert list(bounded._tokens) == [b"3", b"4"]
+
+    max_factories = utils.SASTokenFactory.max_factories
+    utils.SASTokenFactory.max_factories = 2
+    try:
+        for i in range(4):
+            utils.SASTokenFactory.for_key(b"name", key + str(i).encode())
+        assert len(utils.SASTokenFactory._factories) == 2
+    finally:
+        utils.SASTokenFactory.max_factories = max_factories
+
+
+def test_authorize_many():
+    from uamqp import c_uamqp
+
+    class MockConnectionWork(MockConnection):
+        def __init__(self):
+            self.operations = []
+
+        def work(self):
+            for operation in self.operations:
+                status_code = 401 if operation.audience == b"denied" else 202
+                operation._cbs_put_token_compelete(
+                    c_uamqp.CBS_OPERATION_RESULT_OK if status_code == 202 else c_uamqp.CBS_OPERATION_RESULT_OPERATION_FAILED,
+                    status_code, b"Accepted")
+
+    class MockPutTokenAuth(object):
+        def __init__(self, connection):
+            self.connection = connection
+
+        def authorize_many(self, tokens):
+            operations = [c_uamqp.CBSPutTokenOperation(a, t, e, 10) for a, t, e in tokens]
+            self.connection.operations = operations
+            return operations
+
+    auth = authentication.SASTokenAuth.from_shared_access_key("sb://fake/fake", "key", "secret")
+    auth._connection = MockConnectionWork()
+    auth._cbs_auth = MockPutTokenAuth(auth._connection)
+    expires_at = time.time() + 60
+    operations = auth.authorize_many([("sb://fake/p{}".format(i), "token", expires_at) for i in range(3)])
+    assert [o.audience for o in operations] == [b"sb://fake/p0", b"sb://fake/p1", b"sb://fake/p2"]
+    assert all(o.state == constants.CBSAuthStatus.Ok.value and o.completed for o in operations)
+    assert operations[0].status_code == 202
+    with pytest.raises(errors.TokenAuthFailure):
+        auth.authorize_many([("sb://fake/p0", "token", expires_at), (b"denied", b"token", expires_at)])
+
+
+def test_put_token_operation():
+    from uamqp import c_uamqp
+    operation = c_uamqp.CBSPutTokenOperation(b"audience", b"token", int(time.time()) + 60, 0)
+    assert operation.get_status() == constants.CBSAuthStatus.InProgress.value
+    assert not operation.completed
+    operation._cbs_put_token_compelete(c_uamqp.CBS_OPERATION_RESULT_CBS_ERROR, 500, b"Error")
+    operation._cbs_put_token_compelete(c_uamqp.CBS_OPERATION_RESULT_OK, 202, b"Accepted")
+    assert operation.get_status() == constants.CBSAuthStatus.Error.value
+    assert (operation.status_code, operation.status_description) == (500, b"Error")
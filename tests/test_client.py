@@ -33,3 +33,19 @@ def test_keep_alive_thread_fail_to_start():
 
     # check that kwargs can be passed to client.do_work
     client.do_work(fake_kwarg="ignore")
+
+
+def test_receive_columnar_batch_requires_accept():
+    import asyncio
+    import pytest
+    from uamqp import ReceiveClient, ReceiveClientAsync
+
+    client = ReceiveClient("amqps://fake/fake", auto_complete=False)
+    with pytest.raises(ValueError):
+        client.receive_columnar_batch()
+    assert not client._connection
+
+    client = ReceiveClientAsync("amqps://fake/fake", auto_complete=False)
+    with pytest.raises(ValueError):
+        asyncio.run(client.receive_columnar_batch_async(accept=False))
+    assert not client._connection
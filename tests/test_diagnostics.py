@@ -0,0 +1,152 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import asyncio
+import time
+
+import pytest
+
+from uamqp import Connection, MessageReceiver, c_uamqp, constants, diagnostics, metrics
+
+
+def test_profiler_exclusive_time():
+    profiler = diagnostics.Profiler()
+    profiler.enter('connection_dowork')
+    time.sleep(0.01)
+    profiler.enter('on_message_received')
+    time.sleep(0.02)
+    profiler.exit('on_message_received')
+    profiler.exit('connection_dowork')
+
+    # A span left open by an exception is discarded by the exit of its parent.
+    profiler.enter('connection_dowork')
+    profiler.enter('message_construction')
+    profiler.exit('connection_dowork')
+    profiler.exit('unknown')
+
+    report = profiler.report()
+    assert list(report) == ['on_message_received', 'connection_dowork']
+    dowork = report['connection_dowork']
+    callback = report['on_message_received']
+    assert dowork['count'] == 2
+    assert callback['count'] == 1
+    assert dowork['total_ms'] >= 30
+    assert 10 <= dowork['self_ms'] < dowork['total_ms'] - 15
+    assert abs(dowork['percent'] + callback['percent'] - 100) < 0.01
+
+    profiler.reset()
+    assert profiler.report() == {}
+
+
+class MockClient(object):
+
+    def __init__(self, cycles):
+        self.cycles = cycles
+
+    def _work(self):
+        diagnostics.profiler.enter('connection_dowork')
+        diagnostics.profiler.enter('on_message_received')
+        diagnostics.profiler.exit('on_message_received')
+        diagnostics.profiler.exit('connection_dowork')
+        self.cycles -= 1
+        return self.cycles > 0
+
+    def do_work(self):
+        return self._work()
+
+    async def do_work_async(self):
+        return self._work()
+
+
+def test_profile_client():
+    report = diagnostics.profile(MockClient(5), 10)
+    assert diagnostics.profiler is None
+    assert report['cycles'] == 5
+    assert set(report['spans']) == {'do_work', 'connection_dowork', 'on_message_received'}
+    assert all(span['count'] == 5 for span in report['spans'].values())
+    assert report['spans']['do_work']['total_ms'] <= report['elapsed_ms']
+
+
+def test_profile_client_async():
+    loop = asyncio.new_event_loop()
+    try:
+        report = loop.run_until_complete(diagnostics.profile_async(MockClient(3), 10))
+    finally:
+        loop.close()
+    assert diagnostics.profiler is None
+    assert report['cycles'] == 3
+    assert report['spans']['connection_dowork']['count'] == 3
+
+
+class MockCConnection(object):
+
+    def do_work(self):
+        raise ValueError("Connection error")
+
+
+class MockConnection(object):
+    container_id = "mock"
+    _error = None
+
+    def __init__(self):
+        self._conn = MockCConnection()
+        self.metrics = metrics.Metrics('connection')
+
+    def lock(self):
+        pass
+
+    def release(self):
+        pass
+
+
+class MockCReceiver(object):
+
+    def __init__(self):
+        self.modified = []
+
+    def last_received_message_number(self):
+        return 1
+
+    def settle_modified_message(self, message_number, failed, undeliverable, annotations):
+        self.modified.append(message_number)
+
+
+class MockReceiver(object):
+    encoding = 'UTF-8'
+    _columnar_batch = None
+    _settle_mode = constants.ReceiverSettleMode.PeekLock
+
+    def __init__(self):
+        self._receiver = MockCReceiver()
+        self.metrics = metrics.Metrics('receiver')
+
+    def on_message_received(self, message):
+        raise ValueError("Callback error")
+
+
+def test_profiler_spans_closed_on_error():
+    profiler = diagnostics.Profiler()
+    previous = diagnostics.set_profiler(profiler)
+    try:
+        connection = MockConnection()
+        profiler.enter('do_work')
+        with pytest.raises(ValueError):
+            Connection.work(connection)
+        profiler.exit('do_work')
+        assert connection.metrics.snapshot()['histograms']['do_work_ms']['count'] == 1
+
+        receiver = MockReceiver()
+        profiler.enter('do_work')
+        MessageReceiver._message_received(receiver, c_uamqp.create_message())
+        profiler.exit('do_work')
+        assert receiver._receiver.modified == [1]
+    finally:
+        diagnostics.set_profiler(previous)
+    report = profiler.report()
+    assert report['do_work']['count'] == 2
+    assert report['connection_dowork']['count'] == 1
+    assert report['message_construction']['count'] == 1
+    assert report['on_message_received']['count'] == 1
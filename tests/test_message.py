@@ -17,9 +17,11 @@ from uamqp.message import (
     SequenceBody,
     DataBody,
     ValueBody,
-    BatchMessage
+    BatchMessage,
+    EncodedMessage,
+    ReceivedMessage
 )
-from uamqp import MessageBodyType
+from uamqp import MessageBodyType, types
 
 
 def test_message_properties():
@@ -371,3 +373,337 @@ def test_message_body_sequence_type():
 
     with pytest.raises(TypeError):
         Message(body=True, body_type=MessageBodyType.Sequence)
+
+
+def test_encoded_message():
+    properties = MessageProperties(message_id=b'fanout', subject=b'notification')
+    message = Message(
+        body=b'payload',
+        properties=properties,
+        application_properties={b'key': b'value'},
+        annotations={b'x-opt-partition-key': b'pk'})
+    encoded = EncodedMessage.from_message(message)
+    assert bytes(encoded) == message.encode_message()
+    assert len(encoded) == message.get_message_encoded_size()
+    assert encoded.get_message_encoded_size() == len(encoded)
+
+    first = encoded.gather()[0]
+    second = encoded.gather()[0]
+    assert first is not second
+    assert first.get_message() is second.get_message() is encoded.get_message()
+    assert first.state == constants.MessageState.WaitingToBeSent
+    first.state = constants.MessageState.SendComplete
+    assert second.state == constants.MessageState.WaitingToBeSent
+    assert first.encode_message() == encoded.encode_message()
+    assert list(first.get_data()) == list(second.get_data()) == [b'payload']
+    assert str(first) == str(second) == 'payload'
+    assert encoded._decoded_message is not None
+    assert encoded.decode() is not encoded._decoded_message
+
+    decoded = encoded.decode()
+    assert list(decoded.get_data()) == [b'payload']
+    assert decoded.properties.message_id == b'fanout'
+    assert decoded.application_properties == {b'key': b'value'}
+    assert decoded.annotations == {b'x-opt-partition-key': b'pk'}
+
+    pickled = pickle.loads(pickle.dumps(encoded))
+    assert pickled.encode_message() == encoded.encode_message()
+
+    batch = BatchMessage(data=[encoded, b'raw'])
+    batch_message = batch.gather()[0]
+    assert list(batch_message.get_data())[0] == encoded.encode_message()
+
+
+def test_encoded_message_user_id_round_trip():
+    sent = Message(body=b'payload', properties=MessageProperties(message_id=b'id', user_id=b'user'))
+    wire = sent.encode_message()
+    assert b'\xa0\x04user' in wire
+
+    # Re-encode a received message, whose user_id is read back from C as bytes.
+    received = Message(message=c_uamqp.decode_message(len(wire), wire))
+    assert received.properties.user_id == b'user'
+    encoded = EncodedMessage.from_message(received)
+    assert b'\xa0\x04user' in encoded.encode_message()
+    assert encoded.decode().properties.user_id == b'user'
+    assert list(encoded.decode().get_data()) == [b'payload']
+
+
+def test_encoded_message_send():
+    from uamqp.sender import MessageSender
+
+    class MockCSender(object):
+        def __init__(self, busy):
+            self.busy = busy
+            self.sent = []
+
+        def send_encoded(self, data, message_format, timeout, context):
+            self.sent.append(('encoded', data, message_format))
+            return not self.busy
+
+        def send(self, c_message, timeout, context):
+            self.sent.append(('message', c_message))
+            return True
+
+    encoded = EncodedMessage(Message(body=b'payload').encode_message(), msg_format=5)
+    sender = MessageSender.__new__(MessageSender)
+    sender._sender = MockCSender(busy=False)
+    assert sender._send_message(encoded.gather()[0], 0)
+    assert sender._sender.sent == [('encoded', encoded.encode_message(), 5)]
+
+    # A transfer the link cannot take now is queued as the C message.
+    sender._sender = MockCSender(busy=True)
+    assert sender._send_message(encoded.gather()[0], 0)
+    assert sender._sender.sent[1] == ('message', encoded.get_message())
+
+    sender._send_message(Message(body=b'payload'), 0)
+    assert sender._sender.sent[2][0] == 'message'
+
+
+def test_message_lazy_section_lookup():
+    message = Message(
+        body=b'event',
+        properties=MessageProperties(message_id=b'lazy'),
+        application_properties={b'tenant': b'contoso', b'retry': 3},
+        annotations={
+            types.AMQPSymbol(b'x-opt-sequence-number'): types.AMQPLong(42),
+            types.AMQPSymbol(b'x-opt-partition-key'): b'pk'
+        })
+    received = Message.decode_from_bytes(message.encode_message())
+    assert received.get_annotation(b'x-opt-sequence-number') == 42
+    assert received.get_annotation('x-opt-partition-key') == b'pk'
+    assert received.get_annotation(b'x-opt-offset', default=-1) == -1
+    assert received.get_application_property('tenant') == b'contoso'
+    assert received.get_application_property(b'missing') is None
+    with pytest.raises(TypeError):
+        received.get_annotation(1)
+    assert received._annotations is None
+    assert received._application_properties is None
+
+    assert received.properties.message_id == b'lazy'
+    assert received._annotations is None
+    received.application_properties = {b'tenant': b'fabrikam'}
+    assert received.get_application_property(b'tenant') == b'fabrikam'
+    assert received.annotations[b'x-opt-sequence-number'] == 42
+    assert received.get_annotation(b'x-opt-sequence-number') == 42
+    assert received.application_properties == {b'tenant': b'fabrikam'}
+
+    unpickled = pickle.loads(pickle.dumps(Message.decode_from_bytes(message.encode_message())))
+    assert unpickled.annotations[b'x-opt-partition-key'] == b'pk'
+    assert unpickled.application_properties[b'retry'] == 3
+
+
+def test_message_section_lookup_keys():
+    local = Message(
+        body=b'event',
+        application_properties={'tenant': b'contoso', b'retry': 3},
+        annotations={'k': 1, types.AMQPSymbol(b'x-opt-partition-key'): b'pk'})
+    assert local.get_annotation('k') == 1
+    assert local.get_annotation(b'k') == 1
+    assert local.get_annotation(b'x-opt-partition-key') == b'pk'
+    assert local.get_annotation(types.AMQPSymbol(b'x-opt-partition-key')) == b'pk'
+    assert local.get_application_property('tenant') == b'contoso'
+    assert local.get_application_property(b'tenant') == b'contoso'
+    assert local.get_application_property('retry') == 3
+    assert local.get_annotation('missing', default=-1) == -1
+
+    received = Message.decode_from_bytes(local.encode_message())
+    symbol_key = types.AMQPSymbol(b'x-opt-partition-key')
+    before = [received.get_annotation(k) for k in (symbol_key, b'x-opt-partition-key', 'x-opt-partition-key')]
+    assert received._annotations is None
+    assert received.annotations
+    after = [received.get_annotation(k) for k in (symbol_key, b'x-opt-partition-key', 'x-opt-partition-key')]
+    assert before == after == [b'pk', b'pk', b'pk']
+    assert received.get_application_property('tenant') == b'contoso'
+
+
+def test_received_message():
+    message = Message(
+        body=b'event',
+        properties=MessageProperties(message_id=b'slotted'),
+        annotations={types.AMQPSymbol(b'x-opt-sequence-number'): types.AMQPLong(7)})
+    encoded = message.encode_message()
+    responses = []
+    received = ReceivedMessage(
+        message=c_uamqp.decode_message(len(encoded), encoded),
+        settler=responses.append,
+        delivery_no=3)
+    assert isinstance(received, Message)
+    assert received.state == constants.MessageState.ReceivedUnsettled
+    assert not received.settled
+    assert received.retries == 0 and received.on_send_complete is None
+    assert received.get_annotation(b'x-opt-sequence-number') == 7
+    assert received._annotations is None
+    assert received.properties.message_id == b'slotted'
+    with pytest.raises(AttributeError):
+        received.missing
+
+    unpickled = pickle.loads(pickle.dumps(received))
+    assert type(unpickled) is ReceivedMessage
+    assert list(unpickled.get_data()) == [b'event']
+    assert unpickled.annotations[b'x-opt-sequence-number'] == 7
+    assert unpickled.delivery_no == 3
+    assert unpickled.settled
+    assert list(copy.deepcopy(received).get_data()) == [b'event']
+
+    assert received.accept()
+    assert isinstance(responses[0], errors.MessageAccepted)
+    assert received.state == constants.MessageState.ReceivedSettled
+    assert not received.accept()
+
+    settled = ReceivedMessage.decode_from_bytes(encoded)
+    assert settled.settled
+    settled.retries = 1
+    assert pickle.loads(pickle.dumps(settled)).retries == 1
+
+
+def test_received_message_receiver_settle():
+    class MockReceiver(object):
+        def __init__(self):
+            self.settled = []
+
+        def _settle_message(self, message_number, response):
+            self.settled.append((message_number, response))
+
+    encoded = Message(body=b'event').encode_message()
+    receiver = MockReceiver()
+    received = ReceivedMessage(
+        message=c_uamqp.decode_message(len(encoded), encoded),
+        delivery_no=8,
+        receiver=receiver)
+    assert received._state == constants.MessageState.ReceivedUnsettled.value
+    assert received.state == constants.MessageState.ReceivedUnsettled
+    assert received.release()
+    assert receiver.settled[0][0] == 8
+    assert isinstance(receiver.settled[0][1], errors.MessageReleased)
+    assert received.state == constants.MessageState.ReceivedSettled
+    assert not received.reject()
+
+    settled = ReceivedMessage(message=c_uamqp.decode_message(len(encoded), encoded))
+    assert settled._response is ReceivedMessage.decode_from_bytes(encoded)._response
+    settled.state = constants.MessageState.SendComplete
+    with pytest.raises(TypeError):
+        settled.accept()
+
+
+def test_message_wire_encoding():
+    header = MessageHeader()
+    header.durable = True
+    header.time_to_live = 30000
+    properties = MessageProperties(
+        message_id=b'wire', content_type='application/json', creation_time=1600000000000, group_sequence=300)
+    message = Message(
+        body=[b'a', b'b' * 300],
+        header=header,
+        properties=properties,
+        application_properties={'small': 1, 'large': 2**40, 'items': list(range(300)), 'empty': []},
+        annotations={types.AMQPSymbol(b'x-opt-partition-key'): b'pk'})
+
+    # Matches the encoding produced from the C message sections.
+    c_message = message._message.clone()
+    message._populate_message_attributes(c_message)
+    c_encoded = []
+    c_uamqp.get_encoded_message_size(c_message, c_encoded)
+    assert message.encode_message() == b"".join(c_encoded)
+    assert len(message.encode_message()) == message.get_message_encoded_size()
+
+    message.footer = {b'footer': 1}
+    message.delivery_annotations = {b'delivery': 2}
+    decoded = Message.decode_from_bytes(message.encode_message())
+    assert list(decoded.get_data()) == [b'a', b'b' * 300]
+    assert decoded.header.time_to_live == 30000
+    assert decoded.properties.content_type == b'application/json'
+    assert decoded.properties.group_sequence == 300
+    assert decoded.application_properties[b'items'] == list(range(300))
+    assert decoded.annotations == {b'x-opt-partition-key': b'pk'}
+    assert decoded.footer == {b'footer': 1}
+    assert decoded.delivery_annotations == {b'delivery': 2}
+
+
+def test_message_buffer_body():
+    import mmap
+    payload = b'0123456789' * 100
+    with mmap.mmap(-1, len(payload)) as mapped:
+        mapped.write(payload)
+        message = Message(body=mapped)
+        assert message._body.type == c_uamqp.MessageBodyType.DataType
+        assert list(message.get_data()) == [payload]
+
+        chunks = [memoryview(mapped)[i:i + 300] for i in range(0, len(payload), 300)]
+        chunked = Message(body=[b'head'] + chunks)
+        assert list(chunked.get_data()) == [b'head', payload[:300], payload[300:600], payload[600:900], payload[900:]]
+        assert chunked._body[0] == b'head'
+        assert chunked._body[2] == payload[300:600]
+        assert chunked._body[-1] == payload[900:]
+        with pytest.raises(IndexError):
+            chunked._body[5]
+        assert len(chunked.encode_message()) == chunked.get_message_encoded_size()
+        decoded = Message.decode_from_bytes(chunked.encode_message())
+        assert b''.join(decoded.get_data()) == b'head' + payload
+        assert decoded._body[1] == payload[:300]
+
+        # The buffer is referenced until the message is sent.
+        buffer = bytearray(b'before')
+        message = Message(body=buffer, body_type=MessageBodyType.Data)
+        buffer[:] = b'after!'
+        assert message.get_message().count_body_data() == 1
+        buffer[:] = b'ignore'
+        assert list(message.get_data()) == [b'after!']
+        del chunks, chunked
+
+    # Buffers are normalised to contiguous bytes when the body is set.
+    import array
+    ints = array.array('i', [1, 2])
+    strided = Message(body=[memoryview(ints), memoryview(b'abcdef')[::2]])
+    assert strided._body[1] == b'ace'
+    assert strided.get_message().count_body_data() == 2
+    assert list(strided.get_data()) == [ints.tobytes(), b'ace']
+    assert len(strided.encode_message()) == strided.get_message_encoded_size()
+
+    with pytest.raises(TypeError):
+        Message(body=[1, 2], body_type=MessageBodyType.Data)
+
+
+def test_deferred_message():
+    import io
+    from uamqp import DeferredMessage
+    payload = bytes(range(256)) * 40
+    message = DeferredMessage(
+        io.BytesIO(payload), chunk_size=4096, application_properties={b'name': b'file.bin'})
+    assert message._body._source is not None
+    assert message.get_message_encoded_size() == len(message.encode_message())
+    assert message._body._source is None
+    assert message.get_message().count_body_data() == 1
+    decoded = Message.decode_from_bytes(message.encode_message())
+    assert list(decoded.get_data()) == [payload]
+    assert decoded.application_properties == {b'name': b'file.bin'}
+
+    def generate():
+        yield 'text'
+        yield memoryview(b'view')
+        yield memoryview(b'b-y-t-e-s')[::2]
+    message = DeferredMessage(generate())
+    assert list(message.get_data()) == [b'textviewbytes']
+    assert message.gather()[0].get_message().get_body_data(0) == b'textviewbytes'
+    unpickled = pickle.loads(pickle.dumps(message))
+    assert list(unpickled.get_data()) == [b'textviewbytes']
+
+    empty = DeferredMessage(io.StringIO(u''))
+    assert len(empty._body) == 0
+    assert empty.encode_message() == b""
+
+
+def test_message_data_chunks():
+    payload = bytes(range(256)) * 40
+    decoded = Message.decode_from_bytes(Message(body=[payload, b'tail']).encode_message())
+    chunks = list(decoded.get_data_chunks(4096))
+    assert [len(c) for c in chunks] == [4096, 4096, 2048, 4]
+    assert b''.join(chunks) == payload + b'tail'
+    assert decoded.get_message().read_body_data(0, 10230, 100) == payload[10230:]
+    assert decoded.get_message().read_body_data(1, 4, 100) == b''
+
+    message = Message(body=[b'abc', bytearray(b'defgh')])
+    assert list(message.get_data_chunks(2)) == [b'ab', b'c', b'de', b'fg', b'h']
+    with pytest.raises(ValueError):
+        list(message.get_data_chunks(-1))
+    with pytest.raises(TypeError):
+        Message(body=[1, 2], body_type=MessageBodyType.Sequence).get_data_chunks()
@@ -0,0 +1,77 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+from uamqp import Connection, constants, metrics
+from uamqp.authentication import SASLAnonymous
+from uamqp.sender import MessageSender
+
+
+def test_metrics_snapshot():
+    recorded = []
+    metrics.set_metrics_callback(lambda *args: recorded.append(args))
+    try:
+        m = metrics.Metrics('sender', link=b"link")
+        m.increment('transfers')
+        m.increment('transfers', 2)
+        m.record('send_ack_latency_ms', 0.2)
+        m.record('send_ack_latency_ms', 20000)
+    finally:
+        metrics.set_metrics_callback(None)
+
+    snapshot = m.snapshot()
+    assert snapshot['counters'] == {'transfers': 3}
+    histogram = snapshot['histograms']['send_ack_latency_ms']
+    assert histogram['count'] == 2
+    assert histogram['min'] == 0.2 and histogram['max'] == 20000
+    assert len(histogram['counts']) == len(histogram['boundaries']) + 1
+    assert histogram['counts'][1] == 1 and histogram['counts'][-1] == 1
+    assert recorded[0] == ('counter', 'transfers', 1, {'source': 'sender', 'link': b"link"})
+    assert recorded[-1][:3] == ('histogram', 'send_ack_latency_ms', 20000)
+
+    m.reset()
+    assert m.snapshot()['counters'] == {}
+
+
+def test_metrics_callback_error_ignored():
+    def callback(*args):
+        raise ValueError("Export failed.")
+
+    metrics.set_metrics_callback(callback)
+    try:
+        m = metrics.Metrics('connection')
+        m.increment('retries')
+    finally:
+        metrics.set_metrics_callback(None)
+    assert m.snapshot()['counters'] == {'retries': 1}
+
+
+def test_connection_lock_wait_metrics():
+    connection = Connection("fake.host", SASLAnonymous("fake.host"))
+    try:
+        connection.lock()
+        connection.release()
+        histogram = connection.metrics.snapshot()['histograms']['lock_wait_ms']
+        assert histogram['count'] == 1
+    finally:
+        connection._conn.destroy()
+
+
+def test_sender_send_result_metrics():
+    class MockSender(object):
+        def __init__(self):
+            self.metrics = metrics.Metrics('sender')
+
+    results = []
+    sender = MockSender()
+    MessageSender._message_sent(
+        sender, lambda *args, **kwargs: results.append(args), 0, "message", constants.MessageSendResult.Ok.value)
+    MessageSender._message_sent(
+        sender, lambda *args, **kwargs: results.append(args), 0, "message", constants.MessageSendResult.Error.value)
+    snapshot = sender.metrics.snapshot()
+    assert snapshot['counters'] == {'dispositions.ok': 1, 'dispositions.error': 1}
+    assert snapshot['histograms']['send_ack_latency_ms']['count'] == 2
+    assert results == [("message", constants.MessageSendResult.Ok.value),
+                       ("message", constants.MessageSendResult.Error.value)]
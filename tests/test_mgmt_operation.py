@@ -0,0 +1,239 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import asyncio
+
+import pytest
+
+from uamqp import Message, c_uamqp, compat, constants, metrics
+from uamqp.mgmt_operation import MgmtOperation
+from uamqp.async_ops.mgmt_operation_async import MgmtOperationAsync
+
+
+class MockManagementLink(object):
+
+    def __init__(self):
+        self.requests = []
+
+    def execute(self, operation, op_type, locales, message, callback):
+        self.requests.append((operation, op_type, callback))
+
+
+class MockConnection(object):
+
+    def __init__(self, link, respond=True):
+        self.link = link
+        self.respond = respond
+
+    def complete(self):
+        # Respond out of order, as the peer is free to do.
+        while self.respond and self.link.requests:
+            operation, op_type, callback = self.link.requests.pop()
+            callback(constants.MgmtExecuteResult.Ok.value, 200, operation + b":" + op_type, None)
+
+    def work(self):
+        self.complete()
+
+    async def work_async(self):
+        self.complete()
+
+
+def create_mgmt_operation(cls, respond=True):
+    mgmt_op = cls.__new__(cls)
+    mgmt_op._encoding = 'UTF-8'
+    mgmt_op._responses = {}
+    mgmt_op._callbacks = {}
+    mgmt_op._request_count = 0
+    mgmt_op._timeout_count = 0
+    mgmt_op._total_latency = 0
+    mgmt_op._last_latency = None
+    mgmt_op.open = constants.MgmtOpenStatus.Ok
+    mgmt_op._counter = c_uamqp.TickCounter()
+    mgmt_op._mgmt_op = MockManagementLink()
+    mgmt_op.connection = MockConnection(mgmt_op._mgmt_op, respond=respond)
+    mgmt_op.mgmt_error = None
+    return mgmt_op
+
+
+def test_mgmt_execute_many():
+    mgmt_op = create_mgmt_operation(MgmtOperation)
+    requests = [(b"READ", "partition-{}".format(i), Message(b"")) for i in range(5)]
+    responses = mgmt_op.execute_many(requests)
+    assert [r[2] for r in responses] == [b"READ:partition-" + str(i).encode() for i in range(5)]
+    assert mgmt_op.execute(b"READ", b"entity", Message(b""))[0] == 200
+    assert not mgmt_op._responses
+    assert not mgmt_op._callbacks
+    stats = mgmt_op.get_stats()
+    assert stats['open'] and stats['requests'] == 6 and stats['pending'] == 0
+    assert stats['average_latency_ms'] is not None
+
+    mgmt_op = create_mgmt_operation(MgmtOperation, respond=False)
+    with pytest.raises(compat.TimeoutException):
+        mgmt_op.execute_many(requests, timeout=10)
+    assert not mgmt_op._responses
+    assert len(mgmt_op._callbacks) == 5
+    assert mgmt_op.get_stats()['timeouts'] == 5
+
+
+def test_mgmt_execute_many_async():
+    mgmt_op = create_mgmt_operation(MgmtOperationAsync)
+    requests = [(b"READ", b"partition-" + str(i).encode(), Message(b"")) for i in range(3)]
+    responses = asyncio.run(mgmt_op.execute_many_async(requests))
+    assert [r[2] for r in responses] == [b"READ:partition-0", b"READ:partition-1", b"READ:partition-2"]
+
+
+def test_session_mgmt_link_pool():
+    from uamqp import errors
+    from uamqp.session import Session
+
+    opened = []
+    failed = []
+
+    class MockSession(Session):
+        def __init__(self):
+            self._mgmt_links = {}
+            self._connection = None
+            self.metrics = metrics.Metrics('session')
+
+        def _create_mgmt_link(self, node, **kwargs):
+            mgmt_op = create_mgmt_operation(MgmtOperation)
+            mgmt_op.target = node
+            mgmt_op.destroy = lambda: opened.remove(node)
+            if node == b"broken" or (node == b"flaky" and node not in failed):
+                failed.append(node)
+                mgmt_op.open = constants.MgmtOpenStatus.Error
+            opened.append(node)
+            return mgmt_op
+
+    session = MockSession()
+    link = session.open_mgmt_link()
+    assert session.open_mgmt_link(b"$management") is link
+    assert session.mgmt_request(Message(b""), b"READ", op_type=b"entity", node=None) is None
+    assert session.get_mgmt_link_stats()[b"$management"]['requests'] == 1
+    with pytest.raises(errors.AMQPConnectionError):
+        session.mgmt_request(Message(b""), b"READ", node=b"broken")
+    assert opened == [b"$management"]
+
+    # A failed link opened with a str node is replaced by the next request.
+    with pytest.raises(errors.AMQPConnectionError):
+        session.mgmt_request(Message(b""), b"READ", node="flaky")
+    assert b"flaky" not in session._mgmt_links
+    assert session.mgmt_request(Message(b""), b"READ", node="flaky") is None
+    assert session.open_mgmt_link(b"flaky") is session.open_mgmt_link("flaky")
+    assert opened == [b"$management", b"flaky"]
+
+
+def test_session_async_mgmt_link_pool():
+    from uamqp import errors
+    from uamqp.async_ops.session_async import SessionAsync
+
+    destroyed = []
+
+    class MockSessionAsync(SessionAsync):
+        def __init__(self):
+            self._mgmt_links = {}
+            self._connection = None
+            self.metrics = metrics.Metrics('session')
+
+        def _create_mgmt_link(self, node, **kwargs):
+            mgmt_op = create_mgmt_operation(MgmtOperationAsync)
+            mgmt_op.target = node
+            mgmt_op.destroy = lambda: pytest.fail("The sync destroy was called.")
+
+            async def destroy_async():
+                destroyed.append(node)
+            mgmt_op.destroy_async = destroy_async
+            if node == b"broken":
+                mgmt_op.open = constants.MgmtOpenStatus.Error
+            return mgmt_op
+
+    async def main():
+        session = MockSessionAsync()
+        assert await session.mgmt_request_async(Message(b""), b"READ", op_type=b"entity") is None
+        with pytest.raises(errors.AMQPConnectionError):
+            await session.mgmt_request_async(Message(b""), b"READ", node=b"broken")
+        return session
+
+    session = asyncio.run(main())
+    assert destroyed == [b"broken"]
+    assert list(session._mgmt_links) == [b"$management"]
+
+
+def test_mgmt_response_cache():
+    from uamqp import MgmtResponseCache
+    import time as _time
+
+    cache = MgmtResponseCache(ttl=60, max_size=2)
+    assert cache.get_key(None, b"CREATE", b"entity", Message(b"")) is None
+    key = cache.get_key(None, "READ", b"entity", Message(b"a"))
+    assert key[:3] == (b"$management", b"READ", b"entity")
+    assert key != cache.get_key(None, b"READ", b"entity", Message(b"b"))
+
+    calls = []
+
+    def request():
+        calls.append(1)
+        return 200, None, b"OK"
+
+    assert cache.execute(key, request) == (200, None, b"OK")
+    assert cache.execute(key, request) == (200, None, b"OK")
+    assert len(calls) == 1
+
+    cache.put(("node", b"READ", b"other", b""), (404, None, b"Not found"))
+    assert len(cache) == 1
+    cache.put((b"node", b"READ", b"a", b""), (200, None, b""))
+    cache.put((b"node", b"READ", b"b", b""), (200, None, b""))
+    assert cache.get(key) is None
+    cache.invalidate(node=b"node", op_type=b"a")
+    assert len(cache) == 1
+
+    expiring = MgmtResponseCache(ttl=0)
+    expiring.put(key, (200, None, b""))
+    _time.sleep(0.001)
+    assert expiring.get(key) is None
+
+
+def test_mgmt_response_cache_coalescing():
+    from uamqp import MgmtResponseCache
+    cache = MgmtResponseCache()
+    key = cache.get_key(b"$management", b"READ", b"partition", Message(b""))
+    calls = []
+
+    async def request():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 200, None, b"OK"
+
+    async def main():
+        return await asyncio.gather(*[cache.execute_async(key, request) for _ in range(10)])
+
+    assert asyncio.run(main()) == [(200, None, b"OK")] * 10
+    assert len(calls) == 1
+
+
+def test_mgmt_response_cache_wait_timeout():
+    import threading
+    from uamqp import MgmtResponseCache
+    cache = MgmtResponseCache()
+    key = cache.get_key(b"$management", b"READ", b"partition", Message(b""))
+    started = threading.Event()
+    release = threading.Event()
+
+    def request():
+        started.set()
+        release.wait()
+        return 200, None, b"OK"
+
+    leader = threading.Thread(target=cache.execute, args=(key, request))
+    leader.start()
+    try:
+        started.wait()
+        with pytest.raises(compat.TimeoutException):
+            cache.execute(key, request, timeout=10)
+    finally:
+        release.set()
+        leader.join()
+    assert cache.execute(key, request, timeout=10) == (200, None, b"OK")
@@ -11,11 +11,12 @@ import sys
 
 from uamqp import c_uamqp  # pylint: disable=import-self
 
-from uamqp.message import Message, BatchMessage
+from uamqp.message import Message, BatchMessage, EncodedMessage, ReceivedMessage, DeferredMessage
 from uamqp.address import Source, Target
 
 from uamqp.connection import Connection
 from uamqp.session import Session
+from uamqp.mgmt_operation import MgmtResponseCache
 from uamqp.client import AMQPClient, SendClient, ReceiveClient
 from uamqp.sender import MessageSender
 from uamqp.receiver import MessageReceiver
@@ -12,7 +12,7 @@ import collections.abc
 import logging
 import uuid
 
-from uamqp import address, authentication, client, constants, errors, compat, c_uamqp
+from uamqp import address, authentication, client, constants, diagnostics, errors, compat, c_uamqp
 from uamqp.async_ops.connection_async import ConnectionAsync
 from uamqp.async_ops.receiver_async import MessageReceiverAsync
 from uamqp.async_ops.sender_async import MessageSenderAsync
@@ -91,6 +91,12 @@ class AMQPClientAsync(client.AMQPClient):
     :param encoding: The encoding to use for parameters supplied as strings.
      Default is 'UTF-8'
     :type encoding: str
+    :param mgmt_nodes: The request/response nodes, such as `b"$management"`, for which links
+     are opened as soon as the client has been authenticated, and kept open for `mgmt_request_async`.
+    :type mgmt_nodes: list[bytes]
+    :param mgmt_cache: A cache of the responses to idempotent management requests, such as
+     READ operations, shared by the management requests made with this client.
+    :type mgmt_cache: ~uamqp.mgmt_operation.MgmtResponseCache
     """
 
     def __init__(
@@ -240,6 +246,7 @@ class AMQPClientAsync(client.AMQPClient):
                 debug=self._debug_trace,
                 **self._internal_kwargs)
             await self._build_session_async()
+            self._mgmt_links_pending = bool(self._mgmt_nodes)
             if self._keep_alive_interval:
                 self._keep_alive_thread = asyncio.ensure_future(self._keep_alive_async(), **self._internal_kwargs)
         finally:
@@ -311,6 +318,8 @@ class AMQPClientAsync(client.AMQPClient):
         """
         while not await self.auth_complete_async():
             await asyncio.sleep(0.05, **self._internal_kwargs)
+        self._open_mgmt_links()
+        kwargs.setdefault('cache', self._mgmt_cache)
         response = await asyncio.shield(
             self._session.mgmt_request_async(
                 message,
@@ -355,6 +364,7 @@ class AMQPClientAsync(client.AMQPClient):
         """
         if not await self.auth_complete_async():
             return False
+        self._open_mgmt_links()
         if not await self._client_ready_async():
             await self._connection.work_async()
             return False
@@ -521,15 +531,32 @@ class SendClientAsync(client.SendClient, AMQPClientAsync):
         return True
 
     async def _transfer_message_async(self, message, timeout):
-        sent = await asyncio.shield(
-            self.message_handler.send_async(message, self._on_message_sent, timeout=timeout),
-            **self._internal_kwargs
-            )
+        profiler = diagnostics.profiler
+        if profiler is not None:
+            profiler.enter('transfer_message')
+        try:
+            sent = await asyncio.shield(
+                self.message_handler.send_async(message, self._on_message_sent, timeout=timeout),
+                **self._internal_kwargs
+                )
+        finally:
+            if profiler is not None:
+                profiler.exit('transfer_message')
         if not sent:
             _logger.info("Message not sent, raising RuntimeError.")
             raise RuntimeError("Message sender failed to add message data to outgoing queue.")
 
     async def _filter_pending_async(self):
+        profiler = diagnostics.profiler
+        if profiler is None:
+            return await self._filter_pending_messages_async()
+        profiler.enter('filter_pending')
+        try:
+            return await self._filter_pending_messages_async()
+        finally:
+            profiler.exit('filter_pending')
+
+    async def _filter_pending_messages_async(self):
         filtered = []
         for message in self._pending_messages:
             if message.state in constants.DONE_STATES:
@@ -956,6 +983,76 @@ class ReceiveClientAsync(client.ReceiveClient, AMQPClientAsync):
                 self._received_messages.task_done()
         return batch
 
+    async def receive_columnar_batch_async(self, max_batch_size=None, fields=None, timeout=0, accept=None):
+        """Receive a batch of messages asynchronously as columns rather than as Message objects.
+        The message bodies are stored in a single contiguous buffer and the selected message
+        annotations are read into arrays, without creating a Python object per message. This
+        method will return as soon as some messages are available.
+
+        Messages in a columnar batch cannot be settled individually, so in PeekLock mode they
+        are accepted on receipt. This requires `auto_complete` to be set, or `accept=True` to
+        be passed. Messages that were already received as Message objects are added to the
+        batch first.
+
+        :param max_batch_size: The maximum number of messages that can be returned in
+         one call. This value cannot be larger than the prefetch value, and if not specified,
+         the prefetch value will be used.
+        :type max_batch_size: int
+        :param fields: The message annotations to read into columns, as tuples of the column
+         name, the annotation key and the column type, either 'int' or 'bytes'. The default is
+         the Event Hubs sequence number, offset, enqueued time and partition key.
+        :type fields: list[tuple[str, bytes, str]]
+        :param timeout: The timeout in milliseconds for which to wait to receive any messages.
+         If no messages are received in this time, an empty batch will be returned. If set to
+         0, the client will continue to wait until at least one message is received. The
+         default is 0.
+        :type timeout: float
+        :param accept: Whether to accept the messages read into the batch in PeekLock mode.
+         The default is the `auto_complete` setting of the client.
+        :type accept: bool
+        :rtype: ~uamqp.c_uamqp.ColumnarBatch
+        """
+        # pylint: disable=protected-access
+        accept = self.auto_complete if accept is None else accept
+        if not accept and self._receive_settle_mode == constants.ReceiverSettleMode.PeekLock:
+            raise ValueError(
+                'Messages in a columnar batch are accepted on receipt. Set auto_complete '
+                'or pass accept=True to receive a columnar batch in PeekLock mode.')
+        max_batch_size = max_batch_size or self._prefetch
+        if max_batch_size > self._prefetch:
+            raise ValueError(
+                'Maximum batch size {} cannot be greater than the '
+                'connection link credit: {}'.format(max_batch_size, self._prefetch))
+        timeout = self._counter.get_current_ms() + int(timeout) if timeout else 0
+        await self.open_async()
+        batch = c_uamqp.ColumnarBatch(max_batch_size, fields or constants.COLUMNAR_BATCH_FIELDS)
+        while not self._received_messages.empty() and len(batch) < max_batch_size:
+            message = self._received_messages.get()
+            message.accept()
+            batch.append(message._message)
+            self._received_messages.task_done()
+        if len(batch) >= max_batch_size:
+            return batch
+
+        self._timeout_reached = False
+        self._last_activity_timestamp = None
+        receiving = True
+        try:
+            while receiving and len(batch) < max_batch_size and not self._timeout_reached:
+                if timeout and self._counter.get_current_ms() > timeout:
+                    break
+                if self.message_handler:
+                    self.message_handler._columnar_batch = batch
+                before = len(batch)
+                receiving = await self.do_work_async()
+                if len(batch) > 0 and len(batch) == before:
+                    # No new messages arrived, but we have some - so return what we have.
+                    break
+        finally:
+            if self.message_handler:
+                self.message_handler._columnar_batch = None
+        return batch
+
     def receive_messages_iter_async(self, on_message_received=None):
         """Receive messages by asynchronous generator. Messages returned in the
         generator have already been accepted - if you wish to add logic to accept
@@ -6,9 +6,10 @@
 
 import asyncio
 import logging
+import time
 
 import uamqp
-from uamqp import c_uamqp, connection
+from uamqp import c_uamqp, connection, diagnostics
 from uamqp.async_ops.utils import get_dict_with_loop_if_needed
 
 _logger = logging.getLogger(__name__)
@@ -108,7 +109,9 @@ class ConnectionAsync(connection.Connection):
         return self._internal_kwargs.get("loop")
 
     async def lock_async(self, timeout=3.0):
+        start = time.perf_counter()
         await asyncio.wait_for(self._async_lock.acquire(), timeout=timeout, **self._internal_kwargs)
+        self.metrics.record('lock_wait_ms', (time.perf_counter() - start) * 1000)
 
     def release_async(self):
         try:
@@ -138,7 +141,16 @@ class ConnectionAsync(connection.Connection):
                 _logger.debug("Connection unlocked but shutting down.")
                 return
             await asyncio.sleep(0, **self._internal_kwargs)
-            self._conn.do_work()
+            profiler = diagnostics.profiler
+            if profiler is not None:
+                profiler.enter('connection_dowork')
+            start = time.perf_counter()
+            try:
+                self._conn.do_work()
+            finally:
+                self.metrics.record('do_work_ms', (time.perf_counter() - start) * 1000)
+                if profiler is not None:
+                    profiler.exit('connection_dowork')
         except asyncio.TimeoutError:
             _logger.debug("Connection %r timed out while waiting for lock acquisition.", self.container_id)
         finally:
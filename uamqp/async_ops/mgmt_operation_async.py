@@ -5,9 +5,8 @@
 #--------------------------------------------------------------------------
 
 import logging
-import uuid
 
-from uamqp import Message, constants, errors
+from uamqp import errors
 #from uamqp.session import Session
 from uamqp.mgmt_operation import MgmtOperation
 from uamqp.async_ops.utils import get_dict_with_loop_if_needed
@@ -83,30 +82,28 @@ class MgmtOperationAsync(MgmtOperation):
         :type timeout: float
         :rtype: ~uamqp.message.Message
         """
-        start_time = self._counter.get_current_ms()
-        operation_id = str(uuid.uuid4())
-        self._responses[operation_id] = None
+        responses = await self.execute_many_async([(operation, op_type, message)], timeout=timeout)
+        return responses[0]
 
-        def on_complete(operation_result, status_code, description, wrapped_message):
-            result = constants.MgmtExecuteResult(operation_result)
-            if result != constants.MgmtExecuteResult.Ok:
-                _logger.error(
-                    "Failed to complete mgmt operation.\nStatus code: %r\nMessage: %r",
-                    status_code, description)
-            message = Message(message=wrapped_message) if wrapped_message else None
-            self._responses[operation_id] = (status_code, message, description)
+    async def execute_many_async(self, requests, timeout=0):
+        """Execute many requests at once and wait on all the responses asynchronously.
+        The requests are all sent before waiting, and the management link matches each
+        response to its request by message ID, so they complete in a single round trip.
 
-        self._mgmt_op.execute(operation, op_type, None, message.get_message(), on_complete)
-        while not self._responses[operation_id] and not self.mgmt_error:
-            if timeout > 0:
-                now = self._counter.get_current_ms()
-                if (now - start_time) >= timeout:
-                    raise TimeoutException("Failed to receive mgmt response in {}ms".format(timeout))
+        :param requests: A list of (operation, op_type, message) tuples, as passed to `execute_async`.
+        :type requests: list[tuple[bytes or str, bytes or str, ~uamqp.message.Message]]
+        :param timeout: Provide an optional timeout in milliseconds within which the responses
+         to all the management requests must be received.
+        :type timeout: float
+        :returns: The responses, in the same order as the requests.
+        :rtype: list[tuple[int, ~uamqp.message.Message, bytes]]
+        """
+        start_time = self._counter.get_current_ms()
+        operation_ids = [self._execute_request(*request) for request in requests]
+        while self._responses_pending(operation_ids):
+            self._check_timeout(start_time, timeout, operation_ids)
             await self.connection.work_async()
-        if self.mgmt_error:
-            raise self.mgmt_error
-        response = self._responses.pop(operation_id)
-        return response
+        return self._pop_responses(operation_ids)
 
     async def destroy_async(self):
         """Close the send/receive links for this node asynchronously."""
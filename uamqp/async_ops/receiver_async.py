@@ -147,6 +147,7 @@ class MessageReceiverAsync(receiver.MessageReceiver):
         await asyncio.sleep(0, **self._internal_kwargs)
         drain = kwargs.get("drain", False)
         self._link.reset_link_credit(link_credit, drain)
+        self.metrics.increment('credit_issued', link_credit)
 
     async def close_async(self):
         """Close the Receiver asynchronously, leaving the link intact."""
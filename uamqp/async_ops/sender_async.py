@@ -6,6 +6,8 @@
 
 import logging
 import asyncio
+import functools
+import time
 
 from uamqp import constants, errors, sender
 from uamqp.async_ops.utils import get_dict_with_loop_if_needed
@@ -159,13 +161,15 @@ class MessageSenderAsync(sender.MessageSender):
         except Exception as e:
             _logger.warning("%r", e)
             raise
-        c_message = message.get_message()
-        message._on_message_sent = callback
+        message._on_message_sent = functools.partial(self._message_sent, callback, time.perf_counter())
         try:
             await self._session._connection.lock_async(timeout=None)
-            return self._sender.send(c_message, timeout, message)
+            sent = self._send_message(message, timeout)
         finally:
             self._session._connection.release_async()
+        if sent:
+            self.metrics.increment('transfers')
+        return sent
 
     async def work_async(self):
         """Update the link status."""
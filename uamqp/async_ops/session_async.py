@@ -5,6 +5,7 @@
 #--------------------------------------------------------------------------
 
 import logging
+import time
 
 from uamqp import constants, errors, session
 from uamqp.async_ops.mgmt_operation_async import MgmtOperationAsync
@@ -95,28 +96,49 @@ class SessionAsync(session.Session):
         :param encoding: The encoding to use for parameters supplied as strings.
          Default is 'UTF-8'
         :type encoding: str
+        :param cache: A cache from which to return the response to an idempotent request,
+         such as a READ operation, if an identical request was made recently.
+        :type cache: ~uamqp.mgmt_operation.MgmtResponseCache
         :rtype: ~uamqp.message.Message
         """
         timeout = kwargs.pop('timeout', None) or 0
         parse_response = kwargs.pop('callback', None)
-        try:
-            mgmt_link = self._mgmt_links[node]
-        except KeyError:
-            kwargs.update(self._internal_kwargs)
-            mgmt_link = MgmtOperationAsync(self, target=node, **kwargs)
-            self._mgmt_links[node] = mgmt_link
+        cache = kwargs.pop('cache', None)
+        op_type = op_type or b'empty'
+
+        async def request():
+            mgmt_link = self.open_mgmt_link(node, **kwargs)
             while not mgmt_link.open and not mgmt_link.mgmt_error:
                 await self._connection.work_async()
-            if mgmt_link.mgmt_error:
-                raise mgmt_link.mgmt_error
-            if mgmt_link.open != constants.MgmtOpenStatus.Ok:
-                raise errors.AMQPConnectionError("Failed to open mgmt link: {}".format(mgmt_link.open))
-        op_type = op_type or b'empty'
-        status, response, description = await mgmt_link.execute_async(operation, op_type, message, timeout=timeout)
+            await self._check_mgmt_link_async(mgmt_link)
+            return await mgmt_link.execute_async(operation, op_type, message, timeout=timeout)
+
+        start = time.perf_counter()
+        key = cache.get_key(node, operation, op_type, message) if cache is not None else None
+        if key is not None:
+            status, response, description = await cache.execute_async(key, request, timeout=timeout)
+        else:
+            status, response, description = await request()
+        self.metrics.increment('mgmt_requests')
+        self.metrics.record('mgmt_request_ms', (time.perf_counter() - start) * 1000)
         if parse_response:
             return parse_response(status, response, description)
         return response
 
+    async def _check_mgmt_link_async(self, mgmt_link):
+        # A link that failed to open is dropped, so that the next request opens a new one.
+        if mgmt_link.mgmt_error or mgmt_link.open != constants.MgmtOpenStatus.Ok:
+            self._mgmt_links.pop(mgmt_link.target, None)
+            await mgmt_link.destroy_async()
+        if mgmt_link.mgmt_error:
+            raise mgmt_link.mgmt_error
+        if mgmt_link.open != constants.MgmtOpenStatus.Ok:
+            raise errors.AMQPConnectionError("Failed to open mgmt link: {}".format(mgmt_link.open))
+
+    def _create_mgmt_link(self, node, **kwargs):
+        kwargs.update(self._internal_kwargs)
+        return MgmtOperationAsync(self, target=node, **kwargs)
+
     async def destroy_async(self):
         """Asynchronously close any open management Links and close the Session.
         Cleans up and C objects for both mgmt Links and Session.
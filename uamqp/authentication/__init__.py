@@ -6,6 +6,7 @@
 
 from .common import AMQPAuth, SASLPlain, SASLAnonymous
 from .cbs_auth import TokenRetryPolicy, CBSAuthMixin, SASTokenAuth, JWTTokenAuth
+from .token_cache import TokenCache
 try:
     from .cbs_auth_async import CBSAsyncAuthMixin, SASTokenAsync, JWTTokenAsync
 except (ImportError, SyntaxError):
@@ -8,6 +8,7 @@
 
 import datetime
 import logging
+import threading
 import time
 
 from uamqp import Session, c_uamqp, compat, constants, errors, utils
@@ -39,10 +40,24 @@ class TokenRetryPolicy(object):
 class CBSAuthMixin(object):
     """Mixin to handle sending and refreshing CBS auth tokens."""
 
+    _refresh_in_background = False
+    _refresh_lead_time = 0
+    _token_refresh = None
+    _token_refresh_result = None
+    _retry_at = None
+    _token_cache = None
+
     def update_token(self):
-        """Update a token that is about to expire. This is specific
+        """Update a token that is about to expire."""
+        self._set_token(*self._get_new_token())
+
+    def _fetch_token(self):
+        """Fetch a new token without replacing the current one. This is specific
         to a particular token type, and therefore must be implemented
         in a child class.
+
+        :returns: The token and the time at which it expires, in seconds since epoch.
+        :rtype: tuple[bytes, float]
         """
         raise errors.TokenExpired(
             "Unable to refresh token - no refresh logic implemented.")
@@ -84,6 +99,9 @@ class CBSAuthMixin(object):
     def close_authenticator(self):
         """Close the CBS auth channel and session."""
         _logger.info("Shutting down CBS session on connection: %r.", self._connection.container_id)
+        # A token that is still being fetched is discarded, as the worker only writes to its own result.
+        self._token_refresh = None
+        self._token_refresh_result = None
         try:
             _logger.debug("Unlocked CBS to close on connection: %r.", self._connection.container_id)
             self._cbs_auth.destroy()
@@ -114,6 +132,12 @@ class CBSAuthMixin(object):
             self._connection.lock()
             if self._connection._closing or self._connection._error:
                 return timeout, in_progress
+            if self._retry_at is not None:
+                if time.time() < self._retry_at:
+                    return timeout, True
+                self._retry_at = None
+                self._cbs_auth.authenticate()
+                return timeout, True
             auth_status = self._cbs_auth.get_status()
             auth_status = constants.CBSAuthStatus(auth_status)
             if auth_status == constants.CBSAuthStatus.Error:
@@ -124,8 +148,11 @@ class CBSAuthMixin(object):
                 _logger.info("Authentication status: %r, description: %r", error_code, error_description)
                 _logger.info("Authentication Put-Token failed. Retrying.")
                 self.retries += 1  # pylint: disable=no-member
-                time.sleep(self._retry_policy.backoff)
-                self._cbs_auth.authenticate()
+                if self._refresh_in_background:
+                    self._retry_at = time.time() + self._retry_policy.backoff
+                else:
+                    time.sleep(self._retry_policy.backoff)
+                    self._cbs_auth.authenticate()
                 in_progress = True
             elif auth_status == constants.CBSAuthStatus.Failure:
                 raise errors.AuthenticationException("Failed to open CBS authentication link.")
@@ -136,9 +163,13 @@ class CBSAuthMixin(object):
             elif auth_status == constants.CBSAuthStatus.InProgress:
                 in_progress = True
             elif auth_status == constants.CBSAuthStatus.RefreshRequired:
-                _logger.info("Token on connection %r will expire soon - attempting to refresh.",
-                             self._connection.container_id)
-                self.update_token()
+                if self._refresh_in_background:
+                    if not self._background_token_ready():
+                        return timeout, in_progress
+                else:
+                    _logger.info("Token on connection %r will expire soon - attempting to refresh.",
+                                 self._connection.container_id)
+                    self.update_token()
                 if self.token != self._prev_token:
                     self._cbs_auth.refresh(self.token, int(self.expires_at))
                 else:
@@ -150,7 +181,10 @@ class CBSAuthMixin(object):
             elif auth_status == constants.CBSAuthStatus.Idle:
                 self._cbs_auth.authenticate()
                 in_progress = True
-            elif auth_status != constants.CBSAuthStatus.Ok:
+            elif auth_status == constants.CBSAuthStatus.Ok:
+                if self._refresh_in_background and self._token_refresh is None and self._refresh_due():
+                    self._background_token_ready()
+            else:
                 raise errors.AuthenticationException("Invalid auth state.")
         except compat.TimeoutException:
             _logger.debug("CBS auth timed out while waiting for lock acquisition.")
@@ -162,6 +196,104 @@ class CBSAuthMixin(object):
             self._connection.release()
         return timeout, in_progress
 
+    def authorize_many(self, tokens):
+        """Put a token for each of many audiences, such as one per partition or queue,
+        on the CBS link of this connection. All the put-token requests are sent at
+        once and then completed together, rather than one after another.
+
+        :param tokens: A list of (audience, token, expires_at) tuples, where expires_at is
+         the time at which the token expires, formatted as seconds since epoch.
+        :type tokens: list[tuple[str or bytes, str or bytes, float]]
+        :raises: ~uamqp.errors.TokenAuthFailure if any of the tokens are rejected.
+        :raises: ~uamqp.errors.AuthenticationException if any of the requests time out.
+        :rtype: list[~uamqp.c_uamqp.CBSPutTokenOperation]
+        """
+        tokens = [(self._encode(a), self._encode(t), int(e)) for a, t, e in tokens]
+        self._connection.lock()
+        try:
+            operations = self._cbs_auth.authorize_many(tokens)
+        except ValueError as e:
+            raise errors.AuthenticationException("Token authentication failed: {}".format(e))
+        finally:
+            self._connection.release()
+        while any(constants.CBSAuthStatus(o.get_status()) == constants.CBSAuthStatus.InProgress for o in operations):
+            self._connection.work()
+        self._check_put_token_operations(operations)
+        return operations
+
+    def _check_put_token_operations(self, operations):
+        for operation in operations:
+            status = constants.CBSAuthStatus(operation.state)
+            if status == constants.CBSAuthStatus.Timeout:
+                raise errors.AuthenticationException(
+                    "Put-Token request for audience {!r} timed out.".format(operation.audience))
+            if status != constants.CBSAuthStatus.Ok:
+                raise errors.TokenAuthFailure(operation.status_code, operation.status_description)
+
+    def _get_new_token(self):
+        """Get a token from the shared token cache, if it holds one that will not need
+        to be refreshed straight away, or else fetch a new one. Authentication objects
+        sharing the cache wait on a single fetch for the same audience and token type.
+
+        :returns: The token and the time at which it expires, in seconds since epoch.
+        :rtype: tuple[bytes, float]
+        """
+        if self._token_cache is None:
+            return self._fetch_token()
+        return self._token_cache.fetch(
+            self.audience, self.token_type, self._fetch_token, min_validity=self._min_token_validity())
+
+    def _min_token_validity(self):
+        return self._refresh_window or self.expires_in.total_seconds() * 0.1
+
+    def _set_token(self, token, expires_at):
+        self._prev_token = self.token
+        self.token, self.expires_at = token, expires_at
+
+    def _refresh_due(self):
+        """Whether the background fetch of a new token should start, which is the
+        lead time before the token enters its refresh window.
+
+        :rtype: bool
+        """
+        refresh_window = self._refresh_window or self.expires_in.total_seconds() * 0.1
+        return time.time() >= self.expires_at - refresh_window - self._refresh_lead_time
+
+    def _background_token_ready(self):
+        """Start fetching a new token on a worker thread if one is not already
+        being fetched. Returns True once the worker has finished and its token
+        has replaced the current token, on the calling thread.
+
+        :raises: The error raised while fetching the token on the worker thread, if any.
+        :rtype: bool
+        """
+        if self._token_refresh is None:
+            _logger.info("Token on connection %r will expire soon - refreshing in the background.",
+                         self._connection.container_id)
+            self._token_refresh_result = []
+            self._token_refresh = threading.Thread(
+                target=self._fetch_token_in_background, args=(self._token_refresh_result,))
+            self._token_refresh.daemon = True
+            self._token_refresh.start()
+            return False
+        if self._token_refresh.is_alive():
+            return False
+        self._token_refresh.join()
+        result, self._token_refresh_result = self._token_refresh_result, None
+        self._token_refresh = None
+        if isinstance(result[0], Exception):
+            raise result[0]
+        self._set_token(*result[0])
+        return True
+
+    def _fetch_token_in_background(self, result):
+        # The worker does not change the current token, so that the token and its
+        # expiry are never read half updated.
+        try:
+            result.append(self._get_new_token())
+        except Exception as e:  # pylint: disable=broad-except
+            result.append(e)
+
     def _set_expiry(self, expires_at, expires_in):
         if not expires_at and not expires_in:
             raise ValueError("Must specify either 'expires_at' or 'expires_in'.")
@@ -225,6 +357,14 @@ class SASTokenAuth(AMQPAuth, CBSAuthMixin):
     :keyword int refresh_window: The time in seconds before the token expiration
      time to start the process of token refresh.
      Default value is 10% of the remaining seconds until the token expires.
+    :keyword bool refresh_in_background: Whether to fetch the refreshed token on a worker thread,
+     so that the connection is not blocked while the new token is acquired. Default is `False`.
+    :keyword float refresh_lead_time: When refreshing in the background, the time in seconds before
+     the refresh window at which to start fetching the new token, so that it is ready when the
+     refresh is due. Default value is the `timeout`.
+    :keyword token_cache: A cache shared with other authentication objects, from which a refreshed
+     token is taken if one is held for the same audience and token type.
+    :paramtype token_cache: ~uamqp.authentication.TokenCache
     """
 
     def __init__(self, audience, uri, token,
@@ -244,6 +384,9 @@ class SASTokenAuth(AMQPAuth, CBSAuthMixin):
         self._retry_policy = retry_policy
         self._encoding = encoding
         self._refresh_window = kwargs.pop("refresh_window", 0)
+        self._refresh_in_background = kwargs.pop("refresh_in_background", False)
+        self._refresh_lead_time = kwargs.pop("refresh_lead_time", timeout)
+        self._token_cache = kwargs.pop("token_cache", None)
         self._prev_token = None
         self.uri = uri
         parsed = compat.urlparse(uri)  # pylint: disable=no-member
@@ -268,17 +411,15 @@ class SASTokenAuth(AMQPAuth, CBSAuthMixin):
         """If a username and password are present - attempt to use them to
         request a fresh SAS token.
         """
+        self._set_token(*self._get_new_token())
+
+    def _fetch_token(self):
         if not self.username or not self.password:
             raise errors.TokenExpired("Unable to refresh token - no username or password.")
         encoded_uri = compat.quote_plus(self.uri).encode(self._encoding)  # pylint: disable=no-member
         encoded_key = compat.quote_plus(self.username).encode(self._encoding)  # pylint: disable=no-member
-        self.expires_at = time.time() + self.expires_in.seconds
-        self._prev_token = self.token
-        self.token = utils.create_sas_token(
-            encoded_key,
-            self.password.encode(self._encoding),
-            encoded_uri,
-            self.expires_in)
+        token_factory = utils.SASTokenFactory.for_key(encoded_key, self.password.encode(self._encoding))
+        return token_factory.get_token(encoded_uri, self.expires_in)
 
     @classmethod
     def from_shared_access_key(
@@ -332,16 +473,17 @@ class SASTokenAuth(AMQPAuth, CBSAuthMixin):
         :keyword int refresh_window: The time in seconds before the token expiration
         time to start the process of token refresh.
         Default value is 10% of the remaining seconds until the token expires.
+        :keyword bool refresh_in_background: Whether to fetch the refreshed token on a worker thread,
+        so that the connection is not blocked while the new token is acquired. Default is `False`.
+        :keyword token_cache: A cache shared with other authentication objects, from which a refreshed
+        token is taken if one is held for the same audience and token type.
+        :paramtype token_cache: ~uamqp.authentication.TokenCache
         """
         expires_in = datetime.timedelta(seconds=expiry or constants.AUTH_EXPIRATION_SECS)
         encoded_uri = compat.quote_plus(uri).encode(encoding)  # pylint: disable=no-member
         encoded_key = compat.quote_plus(key_name).encode(encoding)  # pylint: disable=no-member
-        expires_at = time.time() + expires_in.seconds
-        token = utils.create_sas_token(
-            encoded_key,
-            shared_access_key.encode(encoding),
-            encoded_uri,
-            expires_in)
+        token_factory = utils.SASTokenFactory.for_key(encoded_key, shared_access_key.encode(encoding))
+        token, expires_at = token_factory.get_token(encoded_uri, expires_in)
         return cls(
             uri, uri, token,
             expires_in=expires_in,
@@ -355,6 +497,8 @@ class SASTokenAuth(AMQPAuth, CBSAuthMixin):
             http_proxy=http_proxy,
             transport_type=transport_type,
             encoding=encoding,
+            refresh_in_background=kwargs.pop("refresh_in_background", False),
+            token_cache=kwargs.pop("token_cache", None),
             custom_endpoint_hostname=kwargs.pop("custom_endpoint_hostname", None))
 
 
@@ -403,6 +547,14 @@ class JWTTokenAuth(AMQPAuth, CBSAuthMixin):
     :keyword int refresh_window: The time in seconds before the token expiration
      time to start the process of token refresh.
      Default value is 10% of the remaining seconds until the token expires.
+    :keyword bool refresh_in_background: Whether to fetch the refreshed token on a worker thread,
+     so that the connection is not blocked while the new token is acquired. Default is `False`.
+    :keyword float refresh_lead_time: When refreshing in the background, the time in seconds before
+     the refresh window at which to start fetching the new token, so that it is ready when the
+     refresh is due. Default value is the `timeout`.
+    :keyword token_cache: A cache shared with other authentication objects, from which a refreshed
+     token is taken if one is held for the same audience and token type.
+    :paramtype token_cache: ~uamqp.authentication.TokenCache
     """
 
     def __init__(self, audience, uri,
@@ -421,6 +573,9 @@ class JWTTokenAuth(AMQPAuth, CBSAuthMixin):
         self._retry_policy = retry_policy
         self._encoding = encoding
         self._refresh_window = kwargs.pop("refresh_window", 0)
+        self._refresh_in_background = kwargs.pop("refresh_in_background", False)
+        self._refresh_lead_time = kwargs.pop("refresh_lead_time", timeout)
+        self._token_cache = kwargs.pop("token_cache", None)
         self._prev_token = None
         self.uri = uri
         parsed = compat.urlparse(uri)  # pylint: disable=no-member
@@ -446,7 +601,8 @@ class JWTTokenAuth(AMQPAuth, CBSAuthMixin):
         return super(JWTTokenAuth, self).create_authenticator(connection, debug, **kwargs)
 
     def update_token(self):
+        self._set_token(*self._get_new_token())
+
+    def _fetch_token(self):
         access_token = self.get_token()
-        self.expires_at = access_token.expires_on
-        self._prev_token = self.token
-        self.token = self._encode(access_token.token)
+        return self._encode(access_token.token), access_token.expires_on
@@ -9,6 +9,7 @@
 import asyncio
 import datetime
 import logging
+import time
 
 from uamqp import c_uamqp, compat, constants, errors
 from uamqp.async_ops import SessionAsync
@@ -80,6 +81,9 @@ class CBSAsyncAuthMixin(CBSAuthMixin):
     async def close_authenticator_async(self):
         """Close the CBS auth channel and session asynchronously."""
         _logger.info("Shutting down CBS session on connection: %r.", self._connection.container_id)
+        if self._token_refresh is not None:
+            self._token_refresh.cancel()
+            self._token_refresh = None
         try:
             self._cbs_auth.destroy()
             _logger.info("Auth closed, destroying session on connection: %r.", self._connection.container_id)
@@ -109,6 +113,12 @@ class CBSAsyncAuthMixin(CBSAuthMixin):
             await self._connection.lock_async()
             if self._connection._closing or self._connection._error:
                 return timeout, in_progress
+            if self._retry_at is not None:
+                if time.time() < self._retry_at:
+                    return timeout, True
+                self._retry_at = None
+                self._cbs_auth.authenticate()
+                return timeout, True
             auth_status = self._cbs_auth.get_status()
             auth_status = constants.CBSAuthStatus(auth_status)
             if auth_status == constants.CBSAuthStatus.Error:
@@ -119,8 +129,11 @@ class CBSAsyncAuthMixin(CBSAuthMixin):
                 _logger.info("Authentication status: %r, description: %r", error_code, error_description)
                 _logger.info("Authentication Put-Token failed. Retrying.")
                 self.retries += 1  # pylint: disable=no-member
-                await asyncio.sleep(self._retry_policy.backoff, **self._internal_kwargs)
-                self._cbs_auth.authenticate()
+                if self._refresh_in_background:
+                    self._retry_at = time.time() + self._retry_policy.backoff
+                else:
+                    await asyncio.sleep(self._retry_policy.backoff, **self._internal_kwargs)
+                    self._cbs_auth.authenticate()
                 in_progress = True
             elif auth_status == constants.CBSAuthStatus.Failure:
                 raise errors.AuthenticationException("Failed to open CBS authentication link.")
@@ -131,9 +144,13 @@ class CBSAsyncAuthMixin(CBSAuthMixin):
             elif auth_status == constants.CBSAuthStatus.InProgress:
                 in_progress = True
             elif auth_status == constants.CBSAuthStatus.RefreshRequired:
-                _logger.info("Token on connection %r will expire soon - attempting to refresh.",
-                             self._connection.container_id)
-                await self.update_token()
+                if self._refresh_in_background:
+                    if not self._background_token_ready():
+                        return timeout, in_progress
+                else:
+                    _logger.info("Token on connection %r will expire soon - attempting to refresh.",
+                                 self._connection.container_id)
+                    await self.update_token()
                 if self.token != self._prev_token:
                     self._cbs_auth.refresh(self.token, int(self.expires_at))
                 else:
@@ -145,7 +162,10 @@ class CBSAsyncAuthMixin(CBSAuthMixin):
             elif auth_status == constants.CBSAuthStatus.Idle:
                 self._cbs_auth.authenticate()
                 in_progress = True
-            elif auth_status != constants.CBSAuthStatus.Ok:
+            elif auth_status == constants.CBSAuthStatus.Ok:
+                if self._refresh_in_background and self._token_refresh is None and self._refresh_due():
+                    self._background_token_ready()
+            else:
                 raise ValueError("Invalid auth state.")
         except asyncio.TimeoutError:
             _logger.debug("CBS auth timed out while waiting for lock acquisition.")
@@ -157,6 +177,68 @@ class CBSAsyncAuthMixin(CBSAuthMixin):
             self._connection.release_async()
         return timeout, in_progress
 
+    async def authorize_many_async(self, tokens):
+        """Put a token for each of many audiences, such as one per partition or queue,
+        on the CBS link of this connection asynchronously. All the put-token requests
+        are sent at once and then completed together, rather than one after another.
+
+        :param tokens: A list of (audience, token, expires_at) tuples, where expires_at is
+         the time at which the token expires, formatted as seconds since epoch.
+        :type tokens: list[tuple[str or bytes, str or bytes, float]]
+        :raises: ~uamqp.errors.TokenAuthFailure if any of the tokens are rejected.
+        :raises: ~uamqp.errors.AuthenticationException if any of the requests time out.
+        :rtype: list[~uamqp.c_uamqp.CBSPutTokenOperation]
+        """
+        tokens = [(self._encode(a), self._encode(t), int(e)) for a, t, e in tokens]
+        await self._connection.lock_async()
+        try:
+            operations = self._cbs_auth.authorize_many(tokens)
+        except ValueError as e:
+            raise errors.AuthenticationException("Token authentication failed: {}".format(e))
+        finally:
+            self._connection.release_async()
+        while any(constants.CBSAuthStatus(o.get_status()) == constants.CBSAuthStatus.InProgress for o in operations):
+            await self._connection.work_async()
+        self._check_put_token_operations(operations)
+        return operations
+
+    async def _fetch_token_async(self):
+        """Fetch a new token asynchronously without replacing the current one.
+
+        :rtype: tuple[bytes, float]
+        """
+        return self._fetch_token()
+
+    async def _get_new_token_async(self):
+        """Get a token from the shared token cache, if it holds one that will not need
+        to be refreshed straight away, or else fetch a new one asynchronously.
+
+        :rtype: tuple[bytes, float]
+        """
+        if self._token_cache is None:
+            return await self._fetch_token_async()
+        return await self._token_cache.fetch_async(
+            self.audience, self.token_type, self._fetch_token_async, min_validity=self._min_token_validity())
+
+    def _background_token_ready(self):
+        """Start fetching a new token in a separate task if one is not already
+        being fetched. Returns True once the task has finished and its token has
+        replaced the current token.
+
+        :raises: The error raised while fetching the token in the task, if any.
+        :rtype: bool
+        """
+        if self._token_refresh is None:
+            _logger.info("Token on connection %r will expire soon - refreshing in the background.",
+                         self._connection.container_id)
+            self._token_refresh = asyncio.ensure_future(self._get_new_token_async(), **self._internal_kwargs)
+            return False
+        if not self._token_refresh.done():
+            return False
+        token_refresh, self._token_refresh = self._token_refresh, None
+        self._set_token(*token_refresh.result())
+        return True
+
 
 class SASTokenAsync(SASTokenAuth, CBSAsyncAuthMixin):
     """Asynchronous CBS authentication using SAS tokens.
@@ -208,6 +290,14 @@ class SASTokenAsync(SASTokenAuth, CBSAsyncAuthMixin):
     :keyword int refresh_window: The time in seconds before the token expiration
      time to start the process of token refresh.
      Default value is 10% of the remaining seconds until the token expires.
+    :keyword bool refresh_in_background: Whether to fetch the refreshed token in a separate task,
+     so that the connection is not blocked while the new token is acquired. Default is `False`.
+    :keyword float refresh_lead_time: When refreshing in the background, the time in seconds before
+     the refresh window at which to start fetching the new token, so that it is ready when the
+     refresh is due. Default value is the `timeout`.
+    :keyword token_cache: A cache shared with other authentication objects, from which a refreshed
+     token is taken if one is held for the same audience and token type.
+    :paramtype token_cache: ~uamqp.authentication.TokenCache
     """
     async def update_token(self):  # pylint: disable=useless-super-delegation
         super(SASTokenAsync, self).update_token()
@@ -258,6 +348,14 @@ class JWTTokenAsync(JWTTokenAuth, CBSAsyncAuthMixin):
     :keyword int refresh_window: The time in seconds before the token expiration
      time to start the process of token refresh.
      Default value is 10% of the remaining seconds until the token expires.
+    :keyword bool refresh_in_background: Whether to fetch the refreshed token in a separate task,
+     so that the connection is not blocked while the new token is acquired. Default is `False`.
+    :keyword float refresh_lead_time: When refreshing in the background, the time in seconds before
+     the refresh window at which to start fetching the new token, so that it is ready when the
+     refresh is due. Default value is the `timeout`.
+    :keyword token_cache: A cache shared with other authentication objects, from which a refreshed
+     token is taken if one is held for the same audience and token type.
+    :paramtype token_cache: ~uamqp.authentication.TokenCache
     """
 
     def __init__(self, audience, uri,
@@ -276,6 +374,9 @@ class JWTTokenAsync(JWTTokenAuth, CBSAsyncAuthMixin):
         self._retry_policy = retry_policy
         self._encoding = encoding
         self._refresh_window = kwargs.pop("refresh_window", 0)
+        self._refresh_in_background = kwargs.pop("refresh_in_background", False)
+        self._refresh_lead_time = kwargs.pop("refresh_lead_time", timeout)
+        self._token_cache = kwargs.pop("token_cache", None)
         self._prev_token = None
         self.uri = uri
         parsed = compat.urlparse(uri)  # pylint: disable=no-member
@@ -300,7 +401,8 @@ class JWTTokenAsync(JWTTokenAuth, CBSAsyncAuthMixin):
         return await super(JWTTokenAsync, self).create_authenticator_async(connection, debug, **kwargs)
 
     async def update_token(self):
+        self._set_token(*await self._get_new_token_async())
+
+    async def _fetch_token_async(self):
         access_token = await self.get_token()
-        self.expires_at = access_token.expires_on
-        self._prev_token = self.token
-        self.token = self._encode(access_token.token)
+        return self._encode(access_token.token), access_token.expires_on
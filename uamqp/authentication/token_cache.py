@@ -0,0 +1,239 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import collections
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from uamqp import utils
+
+_logger = logging.getLogger(__name__)
+
+
+class TokenCache(object):
+    """A cache of CBS tokens that can be shared by many authentication objects,
+    so that a token is only fetched once for each audience and token type.
+    Authentication objects that need a token while another is fetching one for
+    the same audience and token type wait for that fetch rather than starting their own.
+
+    Tokens are held in an in-process LRU. When a directory is given, tokens are
+    also written to it, so that other processes using the same directory can
+    reuse them.
+
+    :param max_size: The maximum number of tokens held in memory. When the cache
+     is full, expired tokens are evicted first, then the least recently used.
+     The default is 256.
+    :type max_size: int
+    :param path: An optional directory in which to store tokens to share them
+     between processes. Token files are only readable by the current user.
+    :type path: str
+    """
+
+    def __init__(self, max_size=256, path=None):
+        if max_size < 1:
+            raise ValueError("The cache size must be at least 1.")
+        self.max_size = max_size
+        self.path = path
+        self._tokens = collections.OrderedDict()
+        self._in_flight = {}
+        self._in_flight_async = {}
+        self._lock = threading.Lock()
+        if self.path:
+            os.makedirs(self.path, mode=0o700, exist_ok=True)
+
+    def __len__(self):
+        return len(self._tokens)
+
+    def get(self, audience, token_type, min_validity=0):
+        """Get a cached token.
+
+        :param audience: The token audience.
+        :type audience: bytes
+        :param token_type: The token type.
+        :type token_type: bytes
+        :param min_validity: The minimum number of seconds for which the token
+         must still be valid. A token that expires sooner is not returned.
+        :type min_validity: float
+        :returns: The token and the time at which it expires, in seconds since epoch,
+         or None if there is no token that is valid for long enough.
+        :rtype: tuple[bytes, float]
+        """
+        key = (audience, token_type)
+        expires_after = time.time() + min_validity
+        with self._lock:
+            cached = self._tokens.get(key)
+            if cached is not None:
+                self._tokens.move_to_end(key)
+                if cached[1] > expires_after:
+                    return cached
+        if self.path:
+            cached = self._read(key)
+            if cached is not None and cached[1] > expires_after:
+                self._add(key, cached)
+                return cached
+        return None
+
+    def fetch(self, audience, token_type, fetch_token, min_validity=0):
+        """Get a cached token, or else fetch and cache a new one. If a token is
+        already being fetched for the same audience and token type, wait for that
+        fetch and use its token rather than fetching another.
+
+        :param audience: The token audience.
+        :type audience: bytes
+        :param token_type: The token type.
+        :type token_type: bytes
+        :param fetch_token: A function that returns a new token and the time at
+         which it expires, in seconds since epoch.
+        :type fetch_token: callable
+        :param min_validity: The minimum number of seconds for which a cached token
+         must still be valid.
+        :type min_validity: float
+        :rtype: tuple[bytes, float]
+        """
+        key = (audience, token_type)
+        while True:
+            cached = self.get(audience, token_type, min_validity=min_validity)
+            if cached is not None:
+                return cached
+            with self._lock:
+                pending = self._in_flight.get(key)
+                if pending is None:
+                    pending = self._in_flight[key] = threading.Event()
+                    break
+            # If the other fetch fails, the cache is still empty and this one fetches instead.
+            pending.wait()
+        try:
+            token, expires_at = fetch_token()
+            self.put(audience, token_type, token, expires_at)
+            return token, expires_at
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            pending.set()
+
+    async def fetch_async(self, audience, token_type, fetch_token, min_validity=0):
+        """Get a cached token, or else fetch and cache a new one asynchronously. If a
+        token is already being fetched on the same event loop for the same audience and
+        token type, wait for that fetch and use its token rather than fetching another.
+
+        :param audience: The token audience.
+        :type audience: bytes
+        :param token_type: The token type.
+        :type token_type: bytes
+        :param fetch_token: A coroutine function that returns a new token and the time
+         at which it expires, in seconds since epoch.
+        :type fetch_token: callable
+        :param min_validity: The minimum number of seconds for which a cached token
+         must still be valid.
+        :type min_validity: float
+        :rtype: tuple[bytes, float]
+        """
+        import asyncio  # pylint: disable=import-error
+        loop = utils.get_running_loop()
+        key = (audience, token_type, id(loop))
+        while True:
+            cached = self.get(audience, token_type, min_validity=min_validity)
+            if cached is not None:
+                return cached
+            pending = self._in_flight_async.get(key)
+            if pending is None:
+                pending = self._in_flight_async[key] = loop.create_future()
+                break
+            await asyncio.shield(pending)
+        try:
+            token, expires_at = await fetch_token()
+            self.put(audience, token_type, token, expires_at)
+            return token, expires_at
+        finally:
+            del self._in_flight_async[key]
+            pending.set_result(None)
+
+    def put(self, audience, token_type, token, expires_at):
+        """Add a token to the cache, replacing any token held for the same
+        audience and token type.
+
+        :param audience: The token audience.
+        :type audience: bytes
+        :param token_type: The token type.
+        :type token_type: bytes
+        :param token: The token.
+        :type token: bytes
+        :param expires_at: The time at which the token expires, in seconds since epoch.
+        :type expires_at: float
+        """
+        key = (audience, token_type)
+        self._add(key, (token, expires_at))
+        if self.path:
+            self._write(key, token, expires_at)
+
+    def remove(self, audience, token_type):
+        """Remove the token held for an audience and token type, for example
+        if it has been rejected by the service.
+
+        :param audience: The token audience.
+        :type audience: bytes
+        :param token_type: The token type.
+        :type token_type: bytes
+        """
+        key = (audience, token_type)
+        with self._lock:
+            self._tokens.pop(key, None)
+        if self.path:
+            try:
+                os.remove(self._filename(key))
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove all tokens held in memory."""
+        with self._lock:
+            self._tokens.clear()
+
+    def _add(self, key, cached):
+        with self._lock:
+            self._tokens[key] = cached
+            self._tokens.move_to_end(key)
+            if len(self._tokens) > self.max_size:
+                now = time.time()
+                for expired in [k for k, v in self._tokens.items() if v[1] <= now]:
+                    del self._tokens[expired]
+            while len(self._tokens) > self.max_size:
+                self._tokens.popitem(last=False)
+
+    def _filename(self, key):
+        digest = hashlib.sha256(b"\n".join(key)).hexdigest()
+        return os.path.join(self.path, digest + ".json")
+
+    def _read(self, key):
+        try:
+            with open(self._filename(key), "r") as token_file:
+                content = json.load(token_file)
+            return content["token"].encode("utf-8"), float(content["expires_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write(self, key, token, expires_at):
+        content = {"token": token.decode("utf-8"), "expires_at": expires_at}
+        try:
+            handle, temp_name = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        except OSError as e:
+            _logger.info("Unable to write token to cache directory %r: %r", self.path, e)
+            return
+        try:
+            with os.fdopen(handle, "w") as token_file:
+                json.dump(content, token_file)
+            os.replace(temp_name, self._filename(key))
+        except OSError as e:
+            _logger.info("Unable to write token to cache directory %r: %r", self.path, e)
+            try:
+                os.remove(temp_name)
+            except OSError:
+                pass
@@ -12,7 +12,7 @@ import time
 import uuid
 
 from uamqp import (Connection, Session, address, authentication, c_uamqp,
-                   compat, constants, errors, receiver, sender)
+                   compat, constants, diagnostics, errors, receiver, sender)
 from uamqp.constants import TransportType
 
 _logger = logging.getLogger(__name__)
@@ -82,6 +82,12 @@ class AMQPClient(object):
     :param encoding: The encoding to use for parameters supplied as strings.
      Default is 'UTF-8'
     :type encoding: str
+    :param mgmt_nodes: The request/response nodes, such as `b"$management"`, for which links
+     are opened as soon as the client has been authenticated, and kept open for `mgmt_request`.
+    :type mgmt_nodes: list[bytes]
+    :param mgmt_cache: A cache of the responses to idempotent management requests, such as
+     READ operations, shared by the management requests made with this client.
+    :type mgmt_cache: ~uamqp.mgmt_operation.MgmtResponseCache
     """
 
     def __init__(
@@ -133,6 +139,9 @@ class AMQPClient(object):
         self._incoming_window = kwargs.pop('incoming_window', None) or constants.MAX_FRAME_SIZE_BYTES
         self._handle_max = kwargs.pop('handle_max', None)
         self._on_attach = kwargs.pop('on_attach', None)
+        self._mgmt_nodes = kwargs.pop('mgmt_nodes', None) or []
+        self._mgmt_links_pending = False
+        self._mgmt_cache = kwargs.pop('mgmt_cache', None)
 
         # Link settings
         self._send_settle_mode = kwargs.pop('send_settle_mode', None) or constants.SenderSettleMode.Unsettled
@@ -258,6 +267,7 @@ class AMQPClient(object):
                 debug=self._debug_trace,
                 encoding=self._encoding)
             self._build_session()
+            self._mgmt_links_pending = bool(self._mgmt_nodes)
             if self._keep_alive_interval:
                 self._keep_alive_thread = threading.Thread(target=self._keep_alive)
                 self._keep_alive_thread.daemon = True
@@ -340,6 +350,8 @@ class AMQPClient(object):
         """
         while not self.auth_complete():
             time.sleep(0.05)
+        self._open_mgmt_links()
+        kwargs.setdefault('cache', self._mgmt_cache)
         response = self._session.mgmt_request(
             message,
             operation,
@@ -351,6 +363,41 @@ class AMQPClient(object):
             **kwargs)
         return response
 
+    def _open_mgmt_links(self):
+        """Start opening the links to the nodes in `mgmt_nodes`, once the
+        connection has been authenticated.
+        """
+        if self._mgmt_links_pending:
+            self._mgmt_links_pending = False
+            for node in self._mgmt_nodes:
+                self._session.open_mgmt_link(node, encoding=self._encoding, debug=self._debug_trace)
+
+    def get_mgmt_link_stats(self):
+        """Get the health and latency statistics of the open request/response links,
+        keyed by node.
+
+        :rtype: dict[bytes, dict]
+        """
+        if not self._session:
+            return {}
+        return self._session.get_mgmt_link_stats()
+
+    def get_metrics(self):
+        """Get a snapshot of the metrics collected by the Connection, Session and
+        Link used by the client, keyed by 'connection', 'session' and 'link'.
+        Only the objects that are currently open are included.
+
+        :rtype: dict[str, dict]
+        """
+        snapshot = {}
+        if self._connection:
+            snapshot['connection'] = self._connection.metrics.snapshot()
+        if self._session:
+            snapshot['session'] = self._session.metrics.snapshot()
+        if self.message_handler:
+            snapshot['link'] = self.message_handler.metrics.snapshot()
+        return snapshot
+
     def auth_complete(self):
         """Whether the authentication handshake is complete during
         connection initialization.
@@ -381,6 +428,7 @@ class AMQPClient(object):
         """
         if not self.auth_complete():
             return False
+        self._open_mgmt_links()
         if not self._client_ready():
             self._connection.work()
             return False
@@ -581,6 +629,7 @@ class SendClient(AMQPClient):
                         and message.retries < self._error_policy.max_retries:
                     if exception.action.increment_retries:
                         message.retries += 1
+                    self.message_handler.metrics.increment('retries')
                     self._backoff = exception.action.backoff
                     _logger.debug("Message error, retrying. Attempts: %r, Error: %r", message.retries, exception)
                     message.state = constants.MessageState.WaitingToBeSent
@@ -614,12 +663,29 @@ class SendClient(AMQPClient):
         return self._msg_timeout - elapsed_time if self._msg_timeout > 0 else 0
 
     def _transfer_message(self, message, timeout):
-        sent = self.message_handler.send(message, self._on_message_sent, timeout=timeout)
+        profiler = diagnostics.profiler
+        if profiler is not None:
+            profiler.enter('transfer_message')
+        try:
+            sent = self.message_handler.send(message, self._on_message_sent, timeout=timeout)
+        finally:
+            if profiler is not None:
+                profiler.exit('transfer_message')
         if not sent:
             _logger.info("Message not sent, raising RuntimeError.")
             raise RuntimeError("Message sender failed to add message data to outgoing queue.")
 
     def _filter_pending(self):
+        profiler = diagnostics.profiler
+        if profiler is None:
+            return self._filter_pending_messages()
+        profiler.enter('filter_pending')
+        try:
+            return self._filter_pending_messages()
+        finally:
+            profiler.exit('filter_pending')
+
+    def _filter_pending_messages(self):
         filtered = []
         for message in self._pending_messages:
             if message.state in constants.DONE_STATES:
@@ -706,7 +772,8 @@ class SendClient(AMQPClient):
             - `send_client.queue_message(*my_message_list)`
 
         :param messages: A message to send. This can either be a single instance
-         of `Message`, or multiple messages wrapped in an instance of `BatchMessage`.
+         of `Message`, a pre-encoded `EncodedMessage`, or multiple messages wrapped in
+         an instance of `BatchMessage`.
         :type message: ~uamqp.message.Message
         """
         for message in messages:
@@ -1100,6 +1167,76 @@ class ReceiveClient(AMQPClient):
                 self._received_messages.task_done()
         return batch
 
+    def receive_columnar_batch(self, max_batch_size=None, fields=None, timeout=0, accept=None):
+        """Receive a batch of messages as columns rather than as Message objects. The message
+        bodies are stored in a single contiguous buffer and the selected message annotations
+        are read into arrays, without creating a Python object per message. Like
+        `receive_message_batch`, this method will return as soon as some messages are available.
+
+        Messages in a columnar batch cannot be settled individually, so in PeekLock mode they
+        are accepted on receipt. This requires `auto_complete` to be set, or `accept=True` to
+        be passed. Messages that were already received as Message objects are added to the
+        batch first.
+
+        :param max_batch_size: The maximum number of messages that can be returned in
+         one call. This value cannot be larger than the prefetch value, and if not specified,
+         the prefetch value will be used.
+        :type max_batch_size: int
+        :param fields: The message annotations to read into columns, as tuples of the column
+         name, the annotation key and the column type, either 'int' or 'bytes'. The default is
+         the Event Hubs sequence number, offset, enqueued time and partition key.
+        :type fields: list[tuple[str, bytes, str]]
+        :param timeout: The timeout in milliseconds for which to wait to receive any messages.
+         If no messages are received in this time, an empty batch will be returned. If set to
+         0, the client will continue to wait until at least one message is received. The
+         default is 0.
+        :type timeout: float
+        :param accept: Whether to accept the messages read into the batch in PeekLock mode.
+         The default is the `auto_complete` setting of the client.
+        :type accept: bool
+        :rtype: ~uamqp.c_uamqp.ColumnarBatch
+        """
+        # pylint: disable=protected-access
+        accept = self.auto_complete if accept is None else accept
+        if not accept and self._receive_settle_mode == constants.ReceiverSettleMode.PeekLock:
+            raise ValueError(
+                'Messages in a columnar batch are accepted on receipt. Set auto_complete '
+                'or pass accept=True to receive a columnar batch in PeekLock mode.')
+        max_batch_size = max_batch_size or self._prefetch
+        if max_batch_size > self._prefetch:
+            raise ValueError(
+                'Maximum batch size cannot be greater than the '
+                'connection link credit: {}'.format(self._prefetch))
+        timeout = self._counter.get_current_ms() + timeout if timeout else 0
+        self.open()
+        batch = c_uamqp.ColumnarBatch(max_batch_size, fields or constants.COLUMNAR_BATCH_FIELDS)
+        while not self._received_messages.empty() and len(batch) < max_batch_size:
+            message = self._received_messages.get()
+            message.accept()
+            batch.append(message._message)
+            self._received_messages.task_done()
+        if len(batch) >= max_batch_size:
+            return batch
+
+        self._timeout_reached = False
+        self._last_activity_timestamp = None
+        receiving = True
+        try:
+            while receiving and len(batch) < max_batch_size and not self._timeout_reached:
+                if timeout and self._counter.get_current_ms() > timeout:
+                    break
+                if self.message_handler:
+                    self.message_handler._columnar_batch = batch
+                before = len(batch)
+                receiving = self.do_work()
+                if len(batch) > 0 and len(batch) == before:
+                    # No new messages arrived, but we have some - so return what we have.
+                    break
+        finally:
+            if self.message_handler:
+                self.message_handler._columnar_batch = None
+        return batch
+
     def receive_messages(self, on_message_received):
         """Receive messages. This function will run indefinitely, until the client
         closes either via timeout, error or forced interruption (e.g. keyboard interrupt).
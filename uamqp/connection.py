@@ -10,7 +10,7 @@ import time
 import uuid
 
 import uamqp
-from uamqp import c_uamqp, compat, errors, utils
+from uamqp import c_uamqp, compat, diagnostics, errors, metrics, utils
 
 _logger = logging.getLogger(__name__)
 
@@ -86,6 +86,7 @@ class Connection(object):
         self._settings = {}
         self._error = None
         self._closing = False
+        self.metrics = metrics.Metrics('connection', container_id=self.container_id)
 
         if max_frame_size:
             self._settings['max_frame_size'] = max_frame_size
@@ -152,6 +153,7 @@ class Connection(object):
             info = None
         _logger.info("Received Connection close event: %r\nConnection: %r\nDescription: %r\nDetails: %r",
                      condition, self.container_id, description, info)
+        c_uamqp.dump_trace_buffer()
         self._error = errors._process_connection_error(self.error_policy, condition, description, info)  # pylint: disable=protected-access
 
     def _state_changed(self, previous_state, new_state):
@@ -179,6 +181,7 @@ class Connection(object):
                 if not self._closing and not self._error:
                     _logger.info("Connection with ID %r unexpectedly in an error state. Closing: %r, Error: %r",
                                  self.container_id, self._closing, self._error)
+                    c_uamqp.dump_trace_buffer()
                     condition = b"amqp:unknown-error"
                     description = b"Connection in an unexpected error state."
                     self._error = errors._process_connection_error(self.error_policy, condition, description, None)  # pylint: disable=protected-access
@@ -188,11 +191,13 @@ class Connection(object):
             self._error = errors.AMQPClientShutdown()
 
     def lock(self, timeout=3.0):
+        start = time.perf_counter()
         try:
             if not self._lock.acquire(timeout=timeout):  # pylint: disable=unexpected-keyword-arg
                 raise compat.TimeoutException("Failed to acquire connection lock.")
         except TypeError:  # Timeout isn't supported in Py2.7
             self._lock.acquire()
+        self.metrics.record('lock_wait_ms', (time.perf_counter() - start) * 1000)
 
     def release(self):
         try:
@@ -256,7 +261,16 @@ class Connection(object):
             raise
         try:
             self.lock()
-            self._conn.do_work()
+            profiler = diagnostics.profiler
+            if profiler is not None:
+                profiler.enter('connection_dowork')
+            start = time.perf_counter()
+            try:
+                self._conn.do_work()
+            finally:
+                self.metrics.record('do_work_ms', (time.perf_counter() - start) * 1000)
+                if profiler is not None:
+                    profiler.exit('connection_dowork')
         except compat.TimeoutException:
             _logger.debug("Connection %r timed out while waiting for lock acquisition.", self.container_id)
         finally:
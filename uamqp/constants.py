@@ -19,6 +19,14 @@ STRING_FILTER = b"apache.org:selector-filter:string"
 OPERATION = b"operation"
 READ_OPERATION = b"READ"
 MGMT_TARGET = b"$management"
+# The message annotations read into columns by default by `ReceiveClient.receive_columnar_batch`,
+# as the column name, the annotation key and the column type.
+COLUMNAR_BATCH_FIELDS = (
+    ("sequence_number", b"x-opt-sequence-number", "int"),
+    ("offset", b"x-opt-offset", "bytes"),
+    ("enqueued_time", b"x-opt-enqueued-time", "int"),
+    ("partition_key", b"x-opt-partition-key", "bytes"),
+)
 
 # Deprecated - will be removed in future versions
 MESSAGE_SEND_RETRIES = 3
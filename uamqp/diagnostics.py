@@ -0,0 +1,181 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import contextvars
+import threading
+import time
+
+#: The active profiler. Instrumented code calls `profiler.enter(name)` and
+#: `profiler.exit(name)` around each span while this is set.
+profiler = None
+
+
+def set_profiler(new_profiler):
+    """Set the profiler that receives the enter and exit events of the
+    instrumented spans. The profiler must have `enter(name)` and `exit(name)`
+    methods, which are run on the thread doing the work and should return quickly.
+
+    The instrumented spans are:
+
+        - `connection_dowork`: A single `do_work` call of the C connection. This covers
+          the socket IO, TLS and frame encoding and decoding, as well as the callbacks
+          below that are run while processing incoming frames.
+        - `message_construction`: Wrapping a received C message in a `uamqp.Message`.
+        - `on_message_received`: The `on_message_received` callback of a `MessageReceiver`.
+        - `filter_pending`: Processing the pending messages of a `SendClient`.
+        - `transfer_message`: Adding a message to the outgoing queue of the C sender.
+
+    :param new_profiler: The profiler, or None to disable profiling.
+    :type new_profiler: ~uamqp.diagnostics.Profiler
+    :returns: The previous profiler.
+    """
+    global profiler  # pylint: disable=global-statement
+    previous = profiler
+    profiler = new_profiler
+    return previous
+
+
+class Profiler(object):
+    """Collects the total and exclusive time spent in each instrumented span.
+    The exclusive time of a span excludes the time spent in the spans nested within it,
+    so that, for example, the time taken by the `on_message_received` callback is not
+    counted as `connection_dowork` time.
+
+    Spans are tracked per thread and per asyncio task. An async span that awaits
+    includes any time spent running other tasks.
+    """
+
+    def __init__(self):
+        self._current = contextvars.ContextVar('uamqp_profiler_span', default=None)
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def enter(self, name):
+        # A span is a list of [name, start_ns, child_ns, parent].
+        self._current.set([name, time.perf_counter_ns(), 0, self._current.get()])
+
+    def exit(self, name):
+        end = time.perf_counter_ns()
+        span = self._current.get()
+        # Spans left open by an exception are discarded.
+        while span is not None and span[0] != name:
+            span = span[3]
+        if span is None:
+            return
+        duration = end - span[1]
+        parent = span[3]
+        self._current.set(parent)
+        if parent is not None:
+            parent[2] += duration
+        with self._lock:
+            try:
+                stats = self._stats[name]
+            except KeyError:
+                stats = self._stats[name] = [0, 0, 0]
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] += duration - span[2]
+
+    def reset(self):
+        """Discard the collected timings."""
+        with self._lock:
+            self._stats = {}
+
+    def report(self, total_ns=None):
+        """Get the collected timings of each span, ordered by exclusive time.
+
+        :param total_ns: The duration against which to calculate the percentage of time
+         spent in each span. The default is the sum of the exclusive times of all spans.
+        :type total_ns: int
+        :rtype: dict[str, dict]
+        """
+        with self._lock:
+            stats = {name: list(values) for name, values in self._stats.items()}
+        if total_ns is None:
+            total_ns = sum(values[2] for values in stats.values())
+        report = {}
+        for name, (count, span_ns, self_ns) in sorted(stats.items(), key=lambda s: s[1][2], reverse=True):
+            report[name] = {
+                'count': count,
+                'total_ms': span_ns / 1e6,
+                'self_ms': self_ns / 1e6,
+                'average_ms': span_ns / count / 1e6,
+                'percent': 100.0 * self_ns / total_ns if total_ns else 0.0
+            }
+        return report
+
+
+def _profile_report(profile_profiler, cycles, elapsed_ns):
+    return {
+        'cycles': cycles,
+        'elapsed_ms': elapsed_ns / 1e6,
+        'spans': profile_profiler.report(total_ns=elapsed_ns)
+    }
+
+
+def profile(client, seconds):
+    """Run `do_work` on an open client for a number of seconds, and report where
+    the time of each cycle was spent.
+
+    The time spent in the client outside of the instrumented spans is reported as
+    the exclusive time of the `do_work` span.
+
+    :param client: The client to run.
+    :type client: ~uamqp.client.AMQPClient
+    :param seconds: The number of seconds for which to run the client. Profiling will
+     stop sooner if the client shuts down.
+    :type seconds: float
+    :returns: The number of do_work cycles, the elapsed time and the timings of each span.
+    :rtype: dict
+    """
+    cycle_profiler = Profiler()
+    previous = set_profiler(cycle_profiler)
+    cycles = 0
+    start = time.perf_counter_ns()
+    deadline = start + int(seconds * 1e9)
+    try:
+        running = True
+        while running and time.perf_counter_ns() < deadline:
+            cycle_profiler.enter('do_work')
+            try:
+                running = client.do_work()
+            finally:
+                cycle_profiler.exit('do_work')
+            cycles += 1
+    finally:
+        set_profiler(previous)
+    return _profile_report(cycle_profiler, cycles, time.perf_counter_ns() - start)
+
+
+async def profile_async(client, seconds):
+    """Run `do_work_async` on an open async client for a number of seconds, and report
+    where the time of each cycle was spent.
+
+    :param client: The client to run.
+    :type client: ~uamqp.async_ops.client_async.AMQPClientAsync
+    :param seconds: The number of seconds for which to run the client. Profiling will
+     stop sooner if the client shuts down.
+    :type seconds: float
+    :returns: The number of do_work cycles, the elapsed time and the timings of each span.
+    :rtype: dict
+    """
+    cycle_profiler = Profiler()
+    previous = set_profiler(cycle_profiler)
+    cycles = 0
+    start = time.perf_counter_ns()
+    deadline = start + int(seconds * 1e9)
+    try:
+        running = True
+        while running and time.perf_counter_ns() < deadline:
+            cycle_profiler.enter('do_work')
+            try:
+                running = await client.do_work_async()
+            finally:
+                cycle_profiler.exit('do_work')
+            cycles += 1
+    finally:
+        set_profiler(previous)
+    return _profile_report(cycle_profiler, cycles, time.perf_counter_ns() - start)
@@ -7,20 +7,74 @@
 # pylint: disable=too-many-lines
 
 import logging
+import mmap
 
-from uamqp import c_uamqp, constants, errors, utils
+from uamqp import c_uamqp, constants, errors, types, utils
 
 _logger = logging.getLogger(__name__)
 
+# Body sections that are referenced by a DataBody rather than copied into the C message.
+_BUFFER_TYPES = (bytearray, memoryview, mmap.mmap)
+_DATA_TYPES = (str, bytes) + _BUFFER_TYPES
+
+_MESSAGE_SECTIONS = frozenset((
+    "_properties",
+    "_header",
+    "_footer",
+    "_application_properties",
+    "_annotations",
+    "_delivery_annotations"
+))
+
+# Message states indexed by value, so that a received message can hold its state as an int.
+_MESSAGE_STATES = tuple(sorted(constants.MessageState, key=lambda state: state.value))
+_RECEIVED_UNSETTLED = constants.MessageState.ReceivedUnsettled.value
+_RECEIVED_SETTLED = constants.MessageState.ReceivedSettled.value
+# Responses without parameters are shared by all received messages.
+_ALREADY_SETTLED = errors.MessageAlreadySettled()
+_ACCEPTED = errors.MessageAccepted()
+_RELEASED = errors.MessageReleased()
+_UNPICKLED_SLOTS = ("_settler", "_receiver", "_message", "_body")
+
+
+def _normalize_section_key(key):
+    """Get the bytes name of a message annotation or application property key.
+
+    :param key: The key, as given by the caller or set on the message.
+    :type key: bytes or str or ~uamqp.types.AMQPType
+    """
+    if isinstance(key, str):
+        return key.encode('UTF-8')
+    if isinstance(key, types.AMQPType):
+        return key.value
+    return key
+
+
+def _wrap_message_body(message):
+    """Wrap the body of a received C message in the MessageBody for its type.
+
+    :param message: The received C message.
+    :type message: uamqp.c_uamqp.cMessage
+    :rtype: ~uamqp.message.MessageBody
+    """
+    body_type = message.body_type
+    if body_type == c_uamqp.MessageBodyType.NoneType:
+        return None
+    if body_type == c_uamqp.MessageBodyType.DataType:
+        return DataBody(message)
+    if body_type == c_uamqp.MessageBodyType.SequenceType:
+        return SequenceBody(message)
+    return ValueBody(message)
+
 
 class Message(object):
     """An AMQP message.
 
     When sending, if body type information is not provided,
     then depending on the nature of the data,
-    different body encoding will be used. If the data is str or bytes,
-    a single part DataBody will be sent. If the data is a list of str/bytes,
-    a multipart DataBody will be sent. Any other type of list or any other
+    different body encoding will be used. If the data is str, bytes, bytearray,
+    memoryview or mmap, a single part DataBody will be sent. If the data is a list
+    of these, a multipart DataBody will be sent. Any other type of list or any other
     type of data will be sent as a ValueBody.
     An empty payload will also be sent as a ValueBody.
     If body type information is provided, then the Message will use the given
@@ -136,6 +190,7 @@ class Message(object):
             self._footer = footer
 
     def __getstate__(self):
+        self._parse_message_properties()
         state = self.__dict__.copy()
         state["state"] = self.state.value
         state["_message"] = None
@@ -163,31 +218,33 @@ class Message(object):
     @property
     def properties(self):
         if self._need_further_parse:
-            self._parse_message_properties()
+            self._parse_message_section("_properties")
         return self._properties
 
     @properties.setter
     def properties(self, value):
         if value and not isinstance(value, MessageProperties):
             raise TypeError("Properties must be a MessageProperties.")
+        self._discard_message_section("_properties")
         self._properties = value
 
     @property
     def header(self):
         if self._need_further_parse:
-            self._parse_message_properties()
+            self._parse_message_section("_header")
         return self._header
 
     @header.setter
     def header(self, value):
         if value and not isinstance(value, MessageHeader):
             raise TypeError("Header must be a MessageHeader.")
+        self._discard_message_section("_header")
         self._header = value
 
     @property
     def footer(self):
         if self._need_further_parse:
-            self._parse_message_properties()
+            self._parse_message_section("_footer")
         return self._footer
 
     @footer.setter
@@ -198,30 +255,33 @@ class Message(object):
             utils.data_factory(value, encoding=self._encoding)
         )
         self._message.footer = footer_props
+        self._discard_message_section("_footer")
         self._footer = value
 
     @property
     def application_properties(self):
         if self._need_further_parse:
-            self._parse_message_properties()
+            self._parse_message_section("_application_properties")
         return self._application_properties
 
     @application_properties.setter
     def application_properties(self, value):
         if value and not isinstance(value, dict):
             raise TypeError("Application properties must be a dictionary.")
+        self._discard_message_section("_application_properties")
         self._application_properties = value
 
     @property
     def annotations(self):
         if self._need_further_parse:
-            self._parse_message_properties()
+            self._parse_message_section("_annotations")
         return self._annotations
 
     @annotations.setter
     def annotations(self, value):
         if value and not isinstance(value, dict):
             raise TypeError("Message annotations must be a dictionary.")
+        self._discard_message_section("_annotations")
         self._annotations = value
 
     @property
@@ -231,11 +291,12 @@ class Message(object):
     @property
     def delivery_annotations(self):
         if self._need_further_parse:
-            self._parse_message_properties()
+            self._parse_message_section("_delivery_annotations")
         return self._delivery_annotations
 
     @delivery_annotations.setter
     def delivery_annotations(self, value):
+        self._discard_message_section("_delivery_annotations")
         self._delivery_annotations = value
 
     @property
@@ -289,7 +350,33 @@ class Message(object):
         return str(self._body)
 
     def _parse_message_properties(self):
-        if self._need_further_parse:
+        """Parse all the remaining sections of a message received from an AMQP service."""
+        while self._need_further_parse:
+            self._parse_message_section(next(iter(self._unparsed_sections)))
+
+    def _discard_message_section(self, section):
+        """Mark a section of a received message as set so that it will no longer
+        be parsed from the received message.
+
+        :param section: The name of the section attribute.
+        :type section: str
+        """
+        if self._need_further_parse and section in self._unparsed_sections:
+            # The sections start as the shared frozenset, so a new set is built on change.
+            self._unparsed_sections = self._unparsed_sections.difference((section,))
+            self._need_further_parse = bool(self._unparsed_sections)
+
+    def _parse_message_section(self, section):
+        """Parse a single section of a message received from an AMQP service
+        the first time it is accessed.
+
+        :param section: The name of the section attribute.
+        :type section: str
+        """
+        if section not in self._unparsed_sections:
+            return
+        self._discard_message_section(section)
+        if section == "_properties":
             _props = self._message.properties
             if _props:
                 _logger.debug(
@@ -298,14 +385,17 @@ class Message(object):
                 self._properties = MessageProperties(
                     properties=_props, encoding=self._encoding
                 )
+        elif section == "_header":
             _header = self._message.header
             if _header:
                 _logger.debug("Parsing received message header %r.", self.delivery_no)
                 self._header = MessageHeader(header=_header)
+        elif section == "_footer":
             _footer = self._message.footer
             if _footer:
                 _logger.debug("Parsing received message footer %r.", self.delivery_no)
                 self._footer = _footer.map
+        elif section == "_application_properties":
             _app_props = self._message.application_properties
             if _app_props:
                 _logger.debug(
@@ -313,12 +403,14 @@ class Message(object):
                     self.delivery_no,
                 )
                 self._application_properties = _app_props.map
+        elif section == "_annotations":
             _ann = self._message.message_annotations
             if _ann:
                 _logger.debug(
                     "Parsing received message annotations %r.", self.delivery_no
                 )
                 self._annotations = _ann.map
+        elif section == "_delivery_annotations":
             _delivery_ann = self._message.delivery_annotations
             if _delivery_ann:
                 _logger.debug(
@@ -326,7 +418,26 @@ class Message(object):
                     self.delivery_no,
                 )
                 self._delivery_annotations = _delivery_ann.map
-            self._need_further_parse = False
+
+    def _get_section_value(self, section, c_section, key, default):
+        normalized_key = _normalize_section_key(key)
+        if self._need_further_parse and section in self._unparsed_sections:
+            # Look up the single key in the received C map without parsing the section.
+            _c_section = getattr(self._message, c_section)
+            if not _c_section:
+                return default
+            return _c_section.get(normalized_key, default)
+        values = getattr(self, section) or {}
+        for lookup_key in (key, normalized_key):
+            try:
+                return values[lookup_key]
+            except (KeyError, TypeError):
+                pass
+        # Locally set sections may be keyed by a str or an AMQPType rather than bytes.
+        for value_key, value in values.items():
+            if _normalize_section_key(value_key) == normalized_key:
+                return value
+        return default
 
     def _parse_message_body(self, message):
         """Parse a message received from an AMQP service.
@@ -340,17 +451,34 @@ class Message(object):
         delivery_tag = self._message.delivery_tag
         if delivery_tag:
             self.delivery_tag = delivery_tag.value
-        body_type = message.body_type
-        if body_type == c_uamqp.MessageBodyType.NoneType:
-            self._body = None
-        elif body_type == c_uamqp.MessageBodyType.DataType:
-            self._body = DataBody(self._message)
-        elif body_type == c_uamqp.MessageBodyType.SequenceType:
-            self._body = SequenceBody(self._message)
-        else:
-            self._body = ValueBody(self._message)
+        self._body = _wrap_message_body(message)
+        self._unparsed_sections = _MESSAGE_SECTIONS
         self._need_further_parse = True
 
+    def get_annotation(self, key, default=None):
+        """Get the value of a single message annotation. On a received message
+        this will look up the key directly in the received data, without parsing
+        all of the message annotations.
+
+        :param key: The annotation key, for example `b"x-opt-sequence-number"`.
+        :type key: bytes or str or ~uamqp.types.AMQPType
+        :param default: The value to return if the annotation is not present.
+        :rtype: Any
+        """
+        return self._get_section_value("_annotations", "message_annotations", key, default)
+
+    def get_application_property(self, key, default=None):
+        """Get the value of a single application property. On a received message
+        this will look up the key directly in the received data, without parsing
+        all of the application properties.
+
+        :param key: The application property key.
+        :type key: bytes or str or ~uamqp.types.AMQPType
+        :param default: The value to return if the application property is not present.
+        :rtype: Any
+        """
+        return self._get_section_value("_application_properties", "application_properties", key, default)
+
     def _can_settle_message(self):
         if self.state not in constants.RECEIVE_STATES:
             raise TypeError("Only received messages can be settled.")
@@ -358,16 +486,26 @@ class Message(object):
             return False
         return True
 
+    def _settle(self, response):
+        """Send a disposition for a received message and mark it as settled.
+
+        :param response: The disposition to send.
+        :type response: ~uamqp.errors.MessageResponse
+        """
+        self._response = response
+        self._settler(response)
+        self.state = constants.MessageState.ReceivedSettled
+
     def _auto_set_body(self, body):
         """
         Automatically detect the MessageBodyType and set data when no body type information is provided.
         We categorize object of type list/list of lists into ValueType (not into SequenceType) due to
         compatibility with old uamqp version.
         """
-        if isinstance(body, (str, bytes)):
+        if isinstance(body, _DATA_TYPES):
             self._body = DataBody(self._message)
             self._body.append(body)
-        elif isinstance(body, list) and all([isinstance(b, (str, bytes)) for b in body]):
+        elif isinstance(body, list) and all([isinstance(b, _DATA_TYPES) for b in body]):
             self._body = DataBody(self._message)
             for value in body:
                 self._body.append(value)
@@ -378,15 +516,15 @@ class Message(object):
     def _set_body_by_body_type(self, body, body_type):
         if body_type == constants.MessageBodyType.Data:
             self._body = DataBody(self._message)
-            if isinstance(body, (str, bytes)):
+            if isinstance(body, _DATA_TYPES):
                 self._body.append(body)
-            elif isinstance(body, list) and all([isinstance(b, (str, bytes)) for b in body]):
+            elif isinstance(body, list) and all([isinstance(b, _DATA_TYPES) for b in body]):
                 for value in body:
                     self._body.append(value)
             else:
                 raise TypeError(
-                    "For MessageBodyType.Data, the body"
-                    " must be str or bytes or list of str or bytes.")
+                    "For MessageBodyType.Data, the body must be str, bytes, bytearray,"
+                    " memoryview or mmap, or a list of these.")
         elif body_type == constants.MessageBodyType.Sequence:
             self._body = SequenceBody(self._message)
             if isinstance(body, list) and all([isinstance(b, list) for b in body]):
@@ -438,6 +576,37 @@ class Message(object):
             )
             c_message.footer = footer
 
+    def _encode_message_sections(self, encoder):
+        """Encode the message sections straight into the wire format, in the order
+        defined by the AMQP specification, without building a C AMQP value for
+        each section.
+
+        :param encoder: The encoder to write the message to.
+        :type encoder: ~uamqp.c_uamqp.WireEncoder
+        """
+        if self.header:
+            self.header._encode_section(encoder)  # pylint: disable=protected-access
+        if self.delivery_annotations:
+            if not isinstance(self.delivery_annotations, dict):
+                raise TypeError("Delivery annotations must be a dictionary.")
+            encoder.encode_delivery_annotations(self.delivery_annotations)
+        if self.annotations:
+            if not isinstance(self.annotations, dict):
+                raise TypeError("Message annotations must be a dictionary.")
+            encoder.encode_message_annotations(self.annotations)
+        if self.properties:
+            self.properties._encode_section(encoder)  # pylint: disable=protected-access
+        if self.application_properties:
+            if not isinstance(self.application_properties, dict):
+                raise TypeError("Application properties must be a dictionary.")
+            encoder.encode_application_properties(self.application_properties)
+        if self._body is not None:
+            self._body._encode(encoder)  # pylint: disable=protected-access
+        if self.footer:
+            if not isinstance(self.footer, dict):
+                raise TypeError("Footer must be a dictionary.")
+            encoder.encode_footer(self.footer)
+
     @property
     def settled(self):
         """Whether the message transaction for this message has been completed.
@@ -463,10 +632,18 @@ class Message(object):
         """
         if not self._message:
             raise ValueError("No message data to encode.")
-        cloned_data = self._message.clone()
-        self._populate_message_attributes(cloned_data)
-        encoded_data = []
-        return c_uamqp.get_encoded_message_size(cloned_data, encoded_data)
+        deferred_size = 0
+        if self._body is not None:
+            deferred_size = self._body._get_deferred_encoded_size()  # pylint: disable=protected-access
+        # The sections are sized on a pooled message, so that the body is not copied.
+        sections = c_uamqp.acquire_message()
+        try:
+            self._populate_message_attributes(sections)
+            encoded_data = []
+            section_size = c_uamqp.get_encoded_message_size(sections, encoded_data)
+        finally:
+            c_uamqp.release_message(sections)
+        return section_size + c_uamqp.get_encoded_body_size(self._message) + deferred_size
 
     def encode_message(self):
         """Encode message to AMQP wire-encoded bytearray.
@@ -475,11 +652,9 @@ class Message(object):
         """
         if not self._message:
             raise ValueError("No message data to encode.")
-        cloned_data = self._message.clone()
-        self._populate_message_attributes(cloned_data)
-        encoded_data = []
-        c_uamqp.get_encoded_message_size(cloned_data, encoded_data)
-        return b"".join(encoded_data)
+        encoder = c_uamqp.WireEncoder(encoding=self._encoding)
+        self._encode_message_sections(encoder)
+        return encoder.getvalue()
 
     def get_data(self):
         """Get the body data of the message. The format may vary depending
@@ -491,6 +666,22 @@ class Message(object):
             return None
         return self._body.data
 
+    def get_data_chunks(self, chunk_size=None):
+        """Get the Data body of the message as an iterator of chunks of at most
+        `chunk_size` bytes, so that a large payload can be written to a file or
+        passed to a parser without building it into a single byte string.
+
+        :param chunk_size: The maximum number of bytes in each chunk. The default
+         is ~uamqp.constants.MAX_FRAME_SIZE_BYTES.
+        :type chunk_size: int
+        :rtype: generator
+        """
+        if not self._message or not self._body:
+            return None
+        if self._body.type != c_uamqp.MessageBodyType.DataType:
+            raise TypeError("Only a message with a Data body can be read in chunks.")
+        return self._body.iter_chunks(chunk_size)
+
     def gather(self):
         """Return all the messages represented by this object.
         This will always be a list of a single message.
@@ -514,6 +705,8 @@ class Message(object):
         """
         if not self._message:
             return None
+        if self._body is not None:
+            self._body._flush()  # pylint: disable=protected-access
         self._populate_message_attributes(self._message)
         return self._message
 
@@ -528,9 +721,7 @@ class Message(object):
         :raises: TypeError if the message is being sent rather than received.
         """
         if self._can_settle_message():
-            self._response = errors.MessageAccepted()
-            self._settler(self._response)
-            self.state = constants.MessageState.ReceivedSettled
+            self._settle(_ACCEPTED)
             return True
         return False
 
@@ -552,14 +743,12 @@ class Message(object):
         :raises: TypeError if the message is being sent rather than received.
         """
         if self._can_settle_message():
-            self._response = errors.MessageRejected(
+            self._settle(errors.MessageRejected(
                 condition=condition,
                 description=description,
                 info=info,
                 encoding=self._encoding,
-            )
-            self._settler(self._response)
-            self.state = constants.MessageState.ReceivedSettled
+            ))
             return True
         return False
 
@@ -575,9 +764,7 @@ class Message(object):
         :raises: TypeError if the message is being sent rather than received.
         """
         if self._can_settle_message():
-            self._response = errors.MessageReleased()
-            self._settler(self._response)
-            self.state = constants.MessageState.ReceivedSettled
+            self._settle(_RELEASED)
             return True
         return False
 
@@ -600,15 +787,158 @@ class Message(object):
         :raises: TypeError if the message is being sent rather than received.
         """
         if self._can_settle_message():
-            self._response = errors.MessageModified(
+            self._settle(errors.MessageModified(
                 failed, deliverable, annotations=annotations, encoding=self._encoding
-            )
-            self._settler(self._response)
-            self.state = constants.MessageState.ReceivedSettled
+            ))
             return True
         return False
 
 
+class ReceivedMessage(Message):
+    """A compact AMQP message received from a service.
+
+    The attributes of a received message are held in slots rather than an instance
+    dictionary. The body, delivery tag and message sections are read from the C message
+    the first time they are accessed, and the attributes that are only used by messages
+    being sent are not set at all. A received message otherwise behaves as a `Message`,
+    and is returned by `MessageReceiver` and the receive clients.
+
+    :param message: The received C message.
+    :type message: uamqp.c_uamqp.cMessage
+    :param settler: The callable used to settle the message. If neither this nor
+     `receiver` is provided, the message is already settled.
+    :type settler: callable[~uamqp.errors.MessageResponse]
+    :param delivery_no: The client delivery number of the message.
+    :type delivery_no: int
+    :param encoding: The encoding to use for parameters supplied as strings.
+     Default is 'UTF-8'
+    :type encoding: str
+    :param receiver: Internal only. The MessageReceiver that received the message, which is
+     used to settle it by delivery number without creating a settler for every message.
+    :type receiver: ~uamqp.receiver.MessageReceiver
+    """
+
+    # Attributes that are only used when sending, such as `retries`, are not slotted
+    # and are stored in the instance dictionary if they are ever set.
+    __slots__ = (
+        "_state",
+        "_response",
+        "_settler",
+        "_receiver",
+        "_encoding",
+        "delivery_no",
+        "delivery_tag",
+        "_properties",
+        "_application_properties",
+        "_annotations",
+        "_header",
+        "_footer",
+        "_delivery_annotations",
+        "_need_further_parse",
+        "_unparsed_sections",
+        "_message",
+        "_body"
+    )
+
+    # The values of the attributes that have not been set.
+    _defaults = {
+        "idle_time": 0,
+        "retries": 0,
+        "_response": None,
+        "_settler": None,
+        "_receiver": None,
+        "on_send_complete": None,
+        "_properties": None,
+        "_application_properties": None,
+        "_annotations": None,
+        "_header": None,
+        "_footer": None,
+        "_delivery_annotations": None
+    }
+
+    def __init__(  # pylint: disable=super-init-not-called
+            self, message, settler=None, delivery_no=None, encoding='UTF-8', receiver=None):
+        self._encoding = encoding
+        self.delivery_no = delivery_no
+        if receiver is not None:
+            self._receiver = receiver
+            self._state = _RECEIVED_UNSETTLED
+        elif settler:
+            self._settler = settler
+            self._state = _RECEIVED_UNSETTLED
+        else:
+            self._state = _RECEIVED_SETTLED
+            self._response = _ALREADY_SETTLED
+        self._message = message
+        self._unparsed_sections = _MESSAGE_SECTIONS
+        self._need_further_parse = True
+
+    def __getattr__(self, name):
+        # Only called for attributes that have not been set.
+        if name == "_body":
+            self._body = _wrap_message_body(self._message)
+            return self._body
+        if name == "delivery_tag":
+            delivery_tag = self._message.delivery_tag
+            self.delivery_tag = delivery_tag.value if delivery_tag else None
+            return self.delivery_tag
+        try:
+            return self._defaults[name]
+        except KeyError:
+            raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, name))
+
+    def __getstate__(self):
+        self._parse_message_properties()
+        state = {name: getattr(self, name) for name in self.__slots__ if name not in _UNPICKLED_SLOTS}
+        state.update(self.__dict__)
+        # The settler cannot be pickled, so the copy is treated as already settled.
+        state["_state"] = _RECEIVED_SETTLED
+        state["_response"] = self._response or _ALREADY_SETTLED
+        state["_body_type"] = self._body.type.value if self._body else None
+        if isinstance(self._body, (DataBody, SequenceBody)):
+            state["_body"] = list(self._body.data)
+        elif isinstance(self._body, ValueBody):
+            state["_body"] = self._body.data
+        else:
+            state["_body"] = None
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        body = state.pop("_body")
+        body_type = constants.BODY_TYPE_C_PYTHON_MAP.get(state.pop("_body_type"))
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._message = c_uamqp.create_message()
+        self._body = None
+        if body:
+            if not body_type:
+                self._auto_set_body(body)
+            else:
+                self._set_body_by_body_type(body, body_type)
+
+    @property
+    def state(self):
+        return _MESSAGE_STATES[self._state]
+
+    @state.setter
+    def state(self, value):
+        self._state = constants.MessageState(value).value
+
+    def _can_settle_message(self):
+        if self._state != _RECEIVED_UNSETTLED and self._state != _RECEIVED_SETTLED:
+            raise TypeError("Only received messages can be settled.")
+        return self._response is None
+
+    def _settle(self, response):
+        self._response = response
+        if self._receiver is not None:
+            self._receiver._settle_message(self.delivery_no, response)  # pylint: disable=protected-access
+        else:
+            self._settler(response)
+        self._state = _RECEIVED_SETTLED
+
+
 class BatchMessage(Message):
     """A Batched AMQP message.
 
@@ -704,6 +1034,38 @@ class BatchMessage(Message):
             encoding=self._encoding,
         )
 
+    def _encode_batch_data(self, data):
+        """Encode a single value supplied by the data generator into the
+        AMQP wire-encoded bytes of a message in the batch. Pre-encoded messages
+        are added as-is.
+
+        :rtype: bytes
+        """
+        try:
+            # try to get the internal uamqp Message
+            internal_uamqp_message = data.message
+        except AttributeError:
+            # no inernal message, data could be uamqp Message or raw data
+            internal_uamqp_message = data
+        if isinstance(internal_uamqp_message, EncodedMessage):
+            return internal_uamqp_message.encode_message()
+        try:
+            # uamqp Message
+            if (
+                    not internal_uamqp_message.application_properties
+                    and self.application_properties
+            ):
+                internal_uamqp_message.application_properties = (
+                    self.application_properties
+                )
+            return internal_uamqp_message.encode_message()
+        except AttributeError:  # raw data
+            wrap_message = Message(
+                body=internal_uamqp_message,
+                application_properties=self.application_properties,
+            )
+            return wrap_message.encode_message()
+
     def _multi_message_generator(self):
         """Generate multiple ~uamqp.message.Message objects from a single data
         stream that in total may exceed the maximum individual message size.
@@ -725,29 +1087,7 @@ class BatchMessage(Message):
                 body_size += len(unappended_message_bytes)
             try:
                 for data in self._body_gen:
-                    message_bytes = None
-                    try:
-                        # try to get the internal uamqp Message
-                        internal_uamqp_message = data.message
-                    except AttributeError:
-                        # no inernal message, data could be uamqp Message or raw data
-                        internal_uamqp_message = data
-                    try:
-                        # uamqp Message
-                        if (
-                                not internal_uamqp_message.application_properties
-                                and self.application_properties
-                        ):
-                            internal_uamqp_message.application_properties = (
-                                self.application_properties
-                            )
-                        message_bytes = internal_uamqp_message.encode_message()
-                    except AttributeError:  # raw data
-                        wrap_message = Message(
-                            body=internal_uamqp_message,
-                            application_properties=self.application_properties,
-                        )
-                        message_bytes = wrap_message.encode_message()
+                    message_bytes = self._encode_batch_data(data)
                     body_size += len(message_bytes)
                     if (body_size + message_size) > self.max_message_length:
                         new_message.on_send_complete = self.on_send_complete
@@ -789,29 +1129,7 @@ class BatchMessage(Message):
         body_size = 0
 
         for data in self._body_gen:
-            message_bytes = None
-            try:
-                # try to get the internal uamqp Message
-                internal_uamqp_message = data.message
-            except AttributeError:
-                # no inernal message, data could be uamqp Message or raw data
-                internal_uamqp_message = data
-            try:
-                # uamqp Message
-                if (
-                        not internal_uamqp_message.application_properties
-                        and self.application_properties
-                ):
-                    internal_uamqp_message.application_properties = (
-                        self.application_properties
-                    )
-                message_bytes = internal_uamqp_message.encode_message()
-            except AttributeError:  # raw data
-                wrap_message = Message(
-                    body=internal_uamqp_message,
-                    application_properties=self.application_properties,
-                )
-                message_bytes = wrap_message.encode_message()
+            message_bytes = self._encode_batch_data(data)
             body_size += len(message_bytes)
             if (body_size + message_size) > self.max_message_length:
                 raise errors.MessageContentTooLarge()
@@ -820,6 +1138,238 @@ class BatchMessage(Message):
         return [new_message]
 
 
+class EncodedMessage(object):
+    """An immutable, pre-encoded AMQP message.
+
+    The message is serialized once on creation, and the encoded bytes are transferred
+    as-is for every subsequent send. The C message built from them is only used when
+    a send has to be queued until the link has credit, and is never modified. This
+    makes it suitable for fanning the same payload out to many targets: a single
+    instance can be queued on any number of clients, links or threads, with each
+    queued send being tracked by its own lightweight message returned from `gather()`.
+
+    :ivar on_send_complete: A custom callback to be run on completion of
+     the send operation of each send of this message. The callback must take two parameters,
+     a result (of type ~uamqp.constants.MessageSendResult) and an error (of type
+     Exception). The error parameter may be None if no error ocurred or the error
+     information was undetermined.
+    :vartype on_send_complete: callable[~uamqp.constants.MessageSendResult, Exception]
+
+    :param data: The AMQP wire-encoded message.
+    :type data: bytes or bytearray
+    :param msg_format: A custom message format. Default is 0.
+    :type msg_format: int
+    :param encoding: The encoding to use for parameters supplied as strings.
+     Default is 'UTF-8'
+    :type encoding: str
+    """
+
+    def __init__(self, data, msg_format=None, encoding="UTF-8"):
+        self._encoded_data = bytes(data)
+        self._encoded_size = len(self._encoded_data)
+        self._encoding = encoding
+        self._message = c_uamqp.decode_message(self._encoded_size, self._encoded_data)
+        if msg_format:
+            self._message.message_format = msg_format
+        self._decoded_message = None
+        self.on_send_complete = None
+
+    def __getstate__(self):
+        return {
+            "_encoded_data": self._encoded_data,
+            "_encoding": self._encoding,
+            "_msg_format": self.message_format,
+            "on_send_complete": self.on_send_complete
+        }
+
+    def __setstate__(self, state):
+        self.__init__(state["_encoded_data"], msg_format=state["_msg_format"], encoding=state["_encoding"])
+        self.on_send_complete = state["on_send_complete"]
+
+    def __len__(self):
+        return self._encoded_size
+
+    def __bytes__(self):
+        return self._encoded_data
+
+    @classmethod
+    def from_message(cls, message):
+        """Encode an existing message into an immutable pre-encoded message.
+        Any further changes made to the original message will not be reflected
+        in the encoded message.
+
+        :param message: The message to encode.
+        :type message: ~uamqp.message.Message
+        :rtype: ~uamqp.message.EncodedMessage
+        """
+        # pylint: disable=protected-access
+        return cls(
+            message.encode_message(),
+            msg_format=message._message.message_format,
+            encoding=message._encoding)
+
+    @property
+    def message_format(self):
+        return self._message.message_format
+
+    def get_message_encoded_size(self):
+        """Get the size of the message once it has been encoded to go over
+        the wire. This value is calculated once on creation.
+
+        :rtype: int
+        """
+        return self._encoded_size
+
+    def encode_message(self):
+        """Get the AMQP wire-encoded message.
+
+        :rtype: bytes
+        """
+        return self._encoded_data
+
+    def decode(self):
+        """Decode a new, independent ~uamqp.message.Message from the encoded data.
+
+        :rtype: ~uamqp.message.Message
+        """
+        return Message.decode_from_bytes(self._encoded_data)
+
+    def _get_decoded_message(self):
+        # The message decoded for reading the data of a send is shared by every send.
+        if self._decoded_message is None:
+            self._decoded_message = self.decode()
+        return self._decoded_message
+
+    def get_message(self):
+        """Get the underlying C message from this object. This message
+        is shared by every send and must not be modified.
+
+        :rtype: uamqp.c_uamqp.cMessage
+        """
+        return self._message
+
+    def gather(self):
+        """Return all the messages represented by this object.
+        This will always be a list of a single message that tracks
+        the state of a single send of the encoded data.
+
+        :rtype: list[~uamqp.message.Message]
+        """
+        return [_EncodedMessageSend(self)]
+
+
+class _EncodedMessageSend(Message):
+    """Tracks the state of a single send of an ~uamqp.message.EncodedMessage.
+    The encoded bytes and the underlying C message are shared with the
+    EncodedMessage and are sent without populating any attributes.
+
+    :param encoded_message: The pre-encoded message to send.
+    :type encoded_message: ~uamqp.message.EncodedMessage
+    """
+
+    def __init__(self, encoded_message):  # pylint: disable=super-init-not-called
+        self.state = constants.MessageState.WaitingToBeSent
+        self.idle_time = 0
+        self.retries = 0
+        self._response = None
+        self._settler = None
+        self._encoding = encoded_message._encoding  # pylint: disable=protected-access
+        self.delivery_no = None
+        self.delivery_tag = None
+        self.on_send_complete = encoded_message.on_send_complete
+        self._properties = None
+        self._application_properties = None
+        self._annotations = None
+        self._header = None
+        self._footer = None
+        self._delivery_annotations = None
+        self._need_further_parse = False
+        self._encoded_message = encoded_message
+        self._message = encoded_message.get_message()
+        self._body = None
+
+    def __getstate__(self):
+        raise TypeError("A send of an EncodedMessage cannot be pickled, pickle the EncodedMessage instead.")
+
+    def get_message_encoded_size(self):
+        return self._encoded_message.get_message_encoded_size()
+
+    def encode_message(self):
+        return self._encoded_message.encode_message()
+
+    def get_data(self):
+        return self._encoded_message._get_decoded_message().get_data()  # pylint: disable=protected-access
+
+    def get_message(self):
+        return self._message
+
+    def __str__(self):
+        return str(self._encoded_message._get_decoded_message())  # pylint: disable=protected-access
+
+
+class DeferredMessage(Message):
+    """An AMQP message with a Data body that is read from an iterator or a file
+    object when the message is sent, rather than when it is created.
+
+    The whole source is read into a single Data section the first time the body data
+    is needed, such as when the encoded size is computed or the message is sent, so
+    the memory used is that of the full body. The source can only be consumed once.
+
+    :param source: The body data. Either a file object opened for reading, which will
+     be read in chunks of `chunk_size`, or an iterable of str, bytes, bytearray,
+     memoryview or mmap chunks, which are joined into the Data section.
+    :type source: file or iterable[bytes]
+    :param chunk_size: The number of bytes to read from a file object at a time.
+     The default is ~uamqp.constants.MAX_FRAME_SIZE_BYTES.
+    :type chunk_size: int
+    :param properties: Properties to add to the message.
+    :type properties: ~uamqp.message.MessageProperties
+    :param application_properties: Service specific application properties.
+    :type application_properties: dict
+    :param annotations: Service specific message annotations. Keys in the dictionary
+     must be `types.AMQPSymbol` or `types.AMQPuLong`.
+    :type annotations: dict
+    :param header: The message header.
+    :type header: ~uamqp.message.MessageHeader
+    :param msg_format: A custom message format. Default is 0.
+    :type msg_format: int
+    :param encoding: The encoding to use for parameters supplied as strings.
+     Default is 'UTF-8'
+    :type encoding: str
+    :param footer: The message footer.
+    :type footer: dict
+    :param delivery_annotations: Service specific delivery annotations.
+    :type delivery_annotations: dict
+    """
+
+    def __init__(
+            self,
+            source,
+            chunk_size=None,
+            properties=None,
+            application_properties=None,
+            annotations=None,
+            header=None,
+            msg_format=None,
+            encoding='UTF-8',
+            footer=None,
+            delivery_annotations=None
+    ):
+        super(DeferredMessage, self).__init__(
+            body=[],
+            properties=properties,
+            application_properties=application_properties,
+            annotations=annotations,
+            header=header,
+            msg_format=msg_format,
+            encoding=encoding,
+            body_type=constants.MessageBodyType.Data,
+            footer=footer,
+            delivery_annotations=delivery_annotations)
+        self._body = DeferredDataBody(
+            self._message, source, chunk_size=chunk_size, encoding=encoding)
+
+
 class MessageProperties(object):
     """Message properties.
     The properties that are actually used will depend on the service implementation.
@@ -1107,6 +1657,23 @@ class MessageProperties(object):
         if attr_value is not None:
             setattr(properties, attr, attr_value)
 
+    def _encode_section(self, encoder):
+        encoder.encode_properties(
+            self._message_id,
+            self._user_id,
+            self._to,
+            self._subject,
+            self._reply_to,
+            self._correlation_id,
+            self._content_type,
+            self._content_encoding,
+            self._absolute_expiry_time,
+            self._creation_time,
+            self._group_id,
+            self._group_sequence,
+            self._reply_to_group_id,
+        )
+
     def _get_properties_dict(self):
         return {
             "message_id": self.message_id,
@@ -1163,11 +1730,24 @@ class MessageBody(object):
     def data(self):
         raise NotImplementedError("Only MessageBody subclasses have data.")
 
+    def _flush(self):
+        """Add any sections that are only referenced by this body to the C message."""
+
+    def _get_deferred_encoded_size(self):
+        return 0
+
+    def _encode(self, encoder):
+        encoder.encode_body(self._message)
+
 
 class DataBody(MessageBody):
     """An AMQP message body of type Data. This represents
     a list of bytes sections.
 
+    Sections supplied as a bytearray, memoryview or mmap are referenced rather
+    than copied. They are only copied into the C message when the message is
+    sent, so the buffer must not be modified or closed before then.
+
     :ivar type: The body type. This should always be `DataType`.
     :vartype type: uamqp.c_uamqp.MessageBodyType
     :ivar data: The data contained in the message body. This returns
@@ -1176,6 +1756,10 @@ class DataBody(MessageBody):
     :vartype data: Generator[bytes]
     """
 
+    def __init__(self, c_message, encoding="UTF-8"):
+        super(DataBody, self).__init__(c_message, encoding=encoding)
+        self._deferred = []
+
     def __str__(self):
         return "".join(d.decode(self._encoding) for d in self.data)
 
@@ -1186,29 +1770,146 @@ class DataBody(MessageBody):
         return b"".join(self.data)
 
     def __len__(self):
-        return self._message.count_body_data()
+        return self._count_body_data() + len(self._deferred)
 
     def __getitem__(self, index):
-        if index >= len(self):
+        length = len(self)
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
             raise IndexError("Index is out of range.")
-        data = self._message.get_body_data(index)
-        return data.value
+        count = self._count_body_data()
+        if index < count:
+            return self._message.get_body_data(index)
+        return bytes(self._deferred[index - count])
+
+    @property
+    def type(self):
+        return c_uamqp.MessageBodyType.DataType
 
     def append(self, data):
         """Append a section to the body.
 
         :param data: The data to append.
-        :type data: str or bytes
+        :type data: str or bytes or bytearray or memoryview or mmap.mmap
         """
         if isinstance(data, str):
-            self._message.add_body_data(data.encode(self._encoding))
+            data = data.encode(self._encoding)
+        elif isinstance(data, memoryview) and not data.c_contiguous:
+            # The C message needs contiguous data, so a strided view is copied now.
+            data = data.tobytes()
+        if isinstance(data, _BUFFER_TYPES) or self._deferred:
+            # Keep the sections in order once any of them is deferred.
+            self._deferred.append(data)
         elif isinstance(data, bytes):
             self._message.add_body_data(data)
 
     @property
     def data(self):
-        for i in range(len(self)):
+        for i in range(self._count_body_data()):
             yield self._message.get_body_data(i)
+        for section in self._deferred:
+            yield bytes(section)
+
+    def iter_chunks(self, chunk_size=None):
+        """Iterate over the body data in chunks of at most `chunk_size` bytes.
+        Each chunk is copied out of the C message as it is requested, so a large
+        section is never held as a single byte string.
+
+        :param chunk_size: The maximum number of bytes in each chunk. The default
+         is ~uamqp.constants.MAX_FRAME_SIZE_BYTES.
+        :type chunk_size: int
+        :rtype: Generator[bytes]
+        """
+        chunk_size = chunk_size or constants.MAX_FRAME_SIZE_BYTES
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be a positive integer.")
+        for i in range(self._count_body_data()):
+            length = self._message.get_body_data_length(i)
+            for offset in range(0, length, chunk_size):
+                yield self._message.read_body_data(i, offset, chunk_size)
+        for section in self._deferred:
+            view = memoryview(section).cast("B")
+            for offset in range(0, len(view), chunk_size):
+                yield bytes(view[offset:offset + chunk_size])
+
+    def _count_body_data(self):
+        if self._message.body_type != c_uamqp.MessageBodyType.DataType:
+            # Only deferred sections have been added so far.
+            return 0
+        return self._message.count_body_data()
+
+    def _flush(self):
+        for section in self._deferred:
+            self._message.add_body_data(section)
+        self._deferred = []
+
+    def _get_deferred_encoded_size(self):
+        # Each section is a described binary: descriptor, constructor and length.
+        size = 0
+        for section in self._deferred:
+            length = memoryview(section).nbytes
+            size += length + (5 if length <= 255 else 8)
+        return size
+
+    def _encode(self, encoder):
+        encoder.encode_body(self._message)
+        for section in self._deferred:
+            encoder.encode_data(section)
+
+
+class DeferredDataBody(DataBody):
+    """An AMQP message body of type Data that is read from an iterator
+    or file object into a single section the first time the body data is needed.
+
+    :param source: A file object or an iterable of data chunks.
+    :type source: file or iterable[bytes]
+    :param chunk_size: The number of bytes to read from a file object at a time.
+    :type chunk_size: int
+    """
+
+    def __init__(self, c_message, source, chunk_size=None, encoding="UTF-8"):
+        super(DeferredDataBody, self).__init__(c_message, encoding=encoding)
+        chunk_size = chunk_size or constants.MAX_FRAME_SIZE_BYTES
+        if hasattr(source, "read"):
+            self._source = iter(lambda: source.read(chunk_size), source.read(0))
+        else:
+            self._source = iter(source)
+
+    def __len__(self):
+        self._flush()
+        return super(DeferredDataBody, self).__len__()
+
+    @property
+    def data(self):
+        self._flush()
+        return super(DeferredDataBody, self).data
+
+    def iter_chunks(self, chunk_size=None):
+        self._flush()
+        return super(DeferredDataBody, self).iter_chunks(chunk_size)
+
+    def _flush(self):
+        if self._source is not None:
+            source, self._source = self._source, None
+            section = bytearray()
+            for chunk in source:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode(self._encoding)
+                elif isinstance(chunk, memoryview) and not chunk.c_contiguous:
+                    chunk = chunk.tobytes()
+                section += chunk
+            if section:
+                self._message.add_body_data(section)
+        super(DeferredDataBody, self)._flush()
+
+    def _get_deferred_encoded_size(self):
+        self._flush()
+        return super(DeferredDataBody, self)._get_deferred_encoded_size()
+
+    def _encode(self, encoder):
+        self._flush()
+        super(DeferredDataBody, self)._encode(encoder)
 
 
 class ValueBody(MessageBody):
@@ -1415,3 +2116,12 @@ class MessageHeader(object):
         if self.priority is not None:
             header.priority = self.priority
         return header
+
+    def _encode_section(self, encoder):
+        encoder.encode_header(
+            self.durable,
+            self.priority,
+            self.time_to_live,
+            self.first_acquirer,
+            self.delivery_count,
+        )
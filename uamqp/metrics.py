@@ -0,0 +1,153 @@
+#-------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+#--------------------------------------------------------------------------
+
+import bisect
+import collections
+import logging
+
+_logger = logging.getLogger(__name__)
+
+#: The default histogram bucket boundaries, in milliseconds.
+DEFAULT_LATENCY_BOUNDARIES = (0.1, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_metrics_callback = None
+
+
+def set_metrics_callback(callback):
+    """Set a callback to be run for every measurement recorded by any Connection,
+    Session, MessageSender or MessageReceiver. This can be used to forward
+    measurements to a metrics library such as OpenTelemetry, by adding counter
+    values to a Counter and histogram values to a Histogram instrument.
+
+    The callback must take four arguments: the kind of measurement (either
+    "counter" or "histogram"), the metric name, the value and a dict of attributes
+    identifying the source of the measurement. It is run on the thread doing the work,
+    so it should return quickly. Any error raised by the callback is logged and ignored.
+
+    :param callback: The callback, or None to remove the current callback.
+    :type callback: callable[str, str, float, dict]
+    """
+    global _metrics_callback  # pylint: disable=global-statement
+    _metrics_callback = callback
+
+
+class Histogram(object):
+    """A histogram with fixed bucket boundaries. A value is counted in the
+    first bucket whose boundary is greater than or equal to it, and values larger
+    than the last boundary are counted in an additional overflow bucket.
+
+    :param boundaries: The ascending bucket boundaries.
+    :type boundaries: tuple[float]
+    """
+
+    __slots__ = ('boundaries', 'counts', 'count', 'sum', 'min', 'max')
+
+    def __init__(self, boundaries=DEFAULT_LATENCY_BOUNDARIES):
+        self.boundaries = boundaries
+        self.counts = [0] * (len(boundaries) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        self.counts[bisect.bisect_left(self.boundaries, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def snapshot(self):
+        """Get the current state of the histogram. The bucket counts and boundaries
+        follow the explicit bucket layout used by OpenTelemetry, with one more count
+        than there are boundaries.
+
+        :rtype: dict
+        """
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min,
+            'max': self.max,
+            'boundaries': list(self.boundaries),
+            'counts': list(self.counts)
+        }
+
+
+class Metrics(object):
+    """A set of counters and latency histograms for a single Connection, Session,
+    MessageSender or MessageReceiver.
+
+    Recording a measurement is a dictionary update, so metrics are always collected.
+    Updates are not synchronized, so a snapshot taken while another thread is
+    working may be slightly behind.
+
+    :param source: The type of the object being measured, e.g. "connection".
+    :type source: str
+    :param attributes: Attributes identifying the object being measured. These are
+     passed to the metrics callback with every measurement.
+    :type attributes: dict
+    """
+
+    def __init__(self, source, **attributes):
+        self.source = source
+        self.attributes = attributes
+        self.attributes['source'] = source
+        self._counters = collections.defaultdict(int)
+        self._histograms = {}
+
+    def increment(self, name, value=1):
+        """Add to a counter.
+
+        :param name: The name of the counter.
+        :type name: str
+        :param value: The amount to add. The default is 1.
+        :type value: int
+        """
+        self._counters[name] += value
+        if _metrics_callback is not None:
+            self._export('counter', name, value)
+
+    def record(self, name, value):
+        """Record a value in a histogram.
+
+        :param name: The name of the histogram.
+        :type name: str
+        :param value: The value to record, usually a duration in milliseconds.
+        :type value: float
+        """
+        try:
+            self._histograms[name].record(value)
+        except KeyError:
+            histogram = Histogram()
+            histogram.record(value)
+            self._histograms[name] = histogram
+        if _metrics_callback is not None:
+            self._export('histogram', name, value)
+
+    def snapshot(self):
+        """Get the current value of all counters and histograms.
+
+        :rtype: dict
+        """
+        return {
+            'source': self.source,
+            'counters': dict(self._counters),
+            'histograms': {name: h.snapshot() for name, h in self._histograms.items()}
+        }
+
+    def reset(self):
+        """Reset all counters and histograms."""
+        self._counters = collections.defaultdict(int)
+        self._histograms = {}
+
+    def _export(self, kind, name, value):
+        try:
+            _metrics_callback(kind, name, value, self.attributes)
+        except Exception as e:  # pylint: disable=broad-except
+            _logger.debug("Metrics callback failed for %r: %r", name, e)
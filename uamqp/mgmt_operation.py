@@ -4,11 +4,14 @@
 # license information.
 #--------------------------------------------------------------------------
 
+import collections
 import logging
+import threading
+import time
 import uuid
 
 # from uamqp.session import Session
-from uamqp import Message, c_uamqp, compat, constants, errors
+from uamqp import Message, c_uamqp, compat, constants, errors, utils
 
 _logger = logging.getLogger(__name__)
 
@@ -54,6 +57,11 @@ class MgmtOperation(object):
         status_code_field = self._encode(status_code_field)
         description_fields = self._encode(description_fields)
         self._responses = {}
+        self._callbacks = {}
+        self._request_count = 0
+        self._timeout_count = 0
+        self._total_latency = 0
+        self._last_latency = None
 
         self._counter = c_uamqp.TickCounter()
         self._mgmt_op = c_uamqp.create_management_operation(session._session, self.target)  # pylint: disable=protected-access
@@ -85,6 +93,56 @@ class MgmtOperation(object):
         """Callback run if an error occurs in the send/receive links."""
         self.mgmt_error = ValueError("Management Operation error ocurred.")
 
+    def _execute_request(self, operation, op_type, message):
+        """Send a request without waiting for the response. The response will be
+        stored in `self._responses` under the returned operation ID.
+
+        :rtype: str
+        """
+        operation_id = str(uuid.uuid4())
+        self._responses[operation_id] = None
+        sent_at = self._counter.get_current_ms()
+
+        def on_complete(operation_result, status_code, description, wrapped_message):
+            self._callbacks.pop(operation_id, None)
+            self._record_latency(self._counter.get_current_ms() - sent_at)
+            result = constants.MgmtExecuteResult(operation_result)
+            if result != constants.MgmtExecuteResult.Ok:
+                _logger.error(
+                    "Failed to complete mgmt operation.\nStatus code: %r\nMessage: %r",
+                    status_code, description)
+            message = Message(message=wrapped_message) if wrapped_message else None
+            if operation_id in self._responses:
+                self._responses[operation_id] = (status_code, message, description)
+
+        # The callback is the C context of the request, so it is kept until it has been called.
+        self._callbacks[operation_id] = on_complete
+        try:
+            self._mgmt_op.execute(
+                self._encode(operation), self._encode(op_type), None, message.get_message(), on_complete)
+        except ValueError:
+            self._callbacks.pop(operation_id)
+            self._responses.pop(operation_id)
+            raise
+        return operation_id
+
+    def _responses_pending(self, operation_ids):
+        return not self.mgmt_error and not all(self._responses[o] for o in operation_ids)
+
+    def _check_timeout(self, start_time, timeout, operation_ids):
+        if timeout > 0:
+            now = self._counter.get_current_ms()
+            if (now - start_time) >= timeout:
+                for operation_id in operation_ids:
+                    if self._responses.pop(operation_id, None) is None:
+                        self._timeout_count += 1
+                raise compat.TimeoutException("Failed to receive mgmt response in {}ms".format(timeout))
+
+    def _pop_responses(self, operation_ids):
+        if self.mgmt_error:
+            raise self.mgmt_error
+        return [self._responses.pop(o) for o in operation_ids]
+
     def execute(self, operation, op_type, message, timeout=0):
         """Execute a request and wait on a response.
 
@@ -103,33 +161,224 @@ class MgmtOperation(object):
         :type timeout: float
         :rtype: ~uamqp.message.Message
         """
-        start_time = self._counter.get_current_ms()
-        operation_id = str(uuid.uuid4())
-        self._responses[operation_id] = None
-        operation = self._encode(operation)
-        op_type = self._encode(op_type)
+        return self.execute_many([(operation, op_type, message)], timeout=timeout)[0]
 
-        def on_complete(operation_result, status_code, description, wrapped_message):
-            result = constants.MgmtExecuteResult(operation_result)
-            if result != constants.MgmtExecuteResult.Ok:
-                _logger.error(
-                    "Failed to complete mgmt operation.\nStatus code: %r\nMessage: %r",
-                    status_code, description)
-            message = Message(message=wrapped_message) if wrapped_message else None
-            self._responses[operation_id] = (status_code, message, description)
-
-        self._mgmt_op.execute(operation, op_type, None, message.get_message(), on_complete)
-        while not self._responses[operation_id] and not self.mgmt_error:
-            if timeout > 0:
-                now = self._counter.get_current_ms()
-                if (now - start_time) >= timeout:
-                    raise compat.TimeoutException("Failed to receive mgmt response in {}ms".format(timeout))
+    def execute_many(self, requests, timeout=0):
+        """Execute many requests at once and wait on all the responses. The requests
+        are all sent before waiting, and the management link matches each response
+        to its request by message ID, so they complete in a single round trip.
+
+        :param requests: A list of (operation, op_type, message) tuples, as passed to `execute`.
+        :type requests: list[tuple[bytes or str, bytes or str, ~uamqp.message.Message]]
+        :param timeout: Provide an optional timeout in milliseconds within which the responses
+         to all the management requests must be received.
+        :type timeout: float
+        :returns: The responses, in the same order as the requests.
+        :rtype: list[tuple[int, ~uamqp.message.Message, bytes]]
+        """
+        start_time = self._counter.get_current_ms()
+        operation_ids = [self._execute_request(*request) for request in requests]
+        while self._responses_pending(operation_ids):
+            self._check_timeout(start_time, timeout, operation_ids)
             self.connection.work()
-        if self.mgmt_error:
-            raise self.mgmt_error
-        response = self._responses.pop(operation_id)
-        return response
+        return self._pop_responses(operation_ids)
+
+    def _record_latency(self, latency):
+        self._request_count += 1
+        self._total_latency += latency
+        self._last_latency = latency
+
+    def get_stats(self):
+        """Get the health and latency statistics of the links for this node.
+
+        :returns: A dictionary with the keys `open` (whether the links are open),
+         `error` (the error that occurred on the links, if any), `pending` (the number of
+         requests awaiting a response), `requests` (the number of responses received),
+         `timeouts` (the number of requests that timed out), `last_latency_ms` and
+         `average_latency_ms`.
+        :rtype: dict
+        """
+        return {
+            'open': self.open == constants.MgmtOpenStatus.Ok,
+            'error': self.mgmt_error,
+            'pending': len(self._callbacks),
+            'requests': self._request_count,
+            'timeouts': self._timeout_count,
+            'last_latency_ms': self._last_latency,
+            'average_latency_ms': self._total_latency / self._request_count if self._request_count else None,
+        }
 
     def destroy(self):
         """Close the send/receive links for this node."""
         self._mgmt_op.destroy()
+
+
+class MgmtResponseCache(object):
+    """A cache of the responses to idempotent management requests, such as READ
+    operations, that can be passed to `mgmt_request` as `cache`.
+
+    Responses are cached by node, operation, type and the encoded request message,
+    and expire after `ttl` seconds. Identical requests made while a request is in
+    flight wait for its response rather than sending another request. Only
+    responses with a 2xx status code are cached. A cached response message is
+    shared by all the requests it is returned to, so it should not be modified.
+
+    :param ttl: The number of seconds for which a response is reused. Default is 1 second.
+    :type ttl: float
+    :param max_size: The maximum number of responses held. When the cache is full,
+     the least recently used response is evicted. Default is 1024.
+    :type max_size: int
+    :param operations: The operations whose responses are cached. Default is `[b"READ"]`.
+    :type operations: list[bytes]
+    :param encoding: The encoding to use for parameters supplied as strings.
+     Default is 'UTF-8'
+    :type encoding: str
+    """
+
+    def __init__(self, ttl=1.0, max_size=1024, operations=None, encoding='UTF-8'):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._encoding = encoding
+        self.operations = set(self._encode(o) for o in (operations or [b"READ"]))
+        self._responses = collections.OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._responses)
+
+    def _encode(self, value):
+        return value.encode(self._encoding) if isinstance(value, str) else value
+
+    def get_key(self, node, operation, op_type, message):
+        """Get the cache key of a request, or None if the response to the
+        operation should not be cached.
+
+        :rtype: tuple or None
+        """
+        operation = self._encode(operation)
+        if operation not in self.operations:
+            return None
+        node = self._encode(node or constants.MGMT_TARGET)
+        return (node, operation, self._encode(op_type), message.encode_message())
+
+    def get(self, key):
+        """Get a cached response, if it has not expired.
+
+        :rtype: tuple[int, ~uamqp.message.Message, bytes] or None
+        """
+        with self._lock:
+            cached = self._responses.get(key)
+            if cached is None:
+                return None
+            if cached[0] <= time.monotonic():
+                del self._responses[key]
+                return None
+            self._responses.move_to_end(key)
+            return cached[1]
+
+    def put(self, key, response):
+        """Cache a response, if its status code shows that the request succeeded.
+
+        :param response: The status code, response message and description.
+        :type response: tuple[int, ~uamqp.message.Message, bytes]
+        """
+        if not 200 <= response[0] < 300:
+            return
+        with self._lock:
+            self._responses[key] = (time.monotonic() + self.ttl, response)
+            self._responses.move_to_end(key)
+            while len(self._responses) > self.max_size:
+                self._responses.popitem(last=False)
+
+    def invalidate(self, node=None, operation=None, op_type=None):
+        """Remove the cached responses for a node, operation or type. Any argument
+        that is not given matches all responses, so calling this without arguments
+        removes every response.
+
+        :param node: The target node.
+        :type node: bytes
+        :param operation: The type of operation.
+        :type operation: bytes
+        :param op_type: The type on which the operation was carried out.
+        :type op_type: bytes
+        """
+        pattern = (self._encode(node), self._encode(operation), self._encode(op_type))
+        with self._lock:
+            for key in list(self._responses):
+                if all(p is None or p == k for p, k in zip(pattern, key)):
+                    del self._responses[key]
+
+    def execute(self, key, request, timeout=0):
+        """Get the response for a request from the cache, or wait on an identical
+        request that is in flight, or else run the request and cache its response.
+
+        :param key: The cache key of the request.
+        :type key: tuple
+        :param request: A function that sends the request and returns the response.
+        :type request: callable
+        :param timeout: Provide an optional timeout in milliseconds within which an identical
+         request that is in flight must complete.
+        :type timeout: float
+        :rtype: tuple[int, ~uamqp.message.Message, bytes]
+        """
+        with self._lock:
+            pending = self._in_flight.get(key)
+            if pending is None:
+                pending = self._in_flight[key] = threading.Event()
+                leader = True
+            else:
+                leader = False
+        if not leader:
+            if not pending.wait(timeout / 1000 if timeout else None):
+                raise compat.TimeoutException("Failed to receive mgmt response in {}ms".format(timeout))
+            response = self.get(key)
+            if response is not None:
+                return response
+            return request()
+        try:
+            response = self.get(key)
+            if response is None:
+                response = request()
+                self.put(key, response)
+            return response
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            pending.set()
+
+    async def execute_async(self, key, request, timeout=0):
+        """Get the response for a request from the cache, or wait on an identical
+        request that is in flight, or else run the request and cache its response.
+
+        :param key: The cache key of the request.
+        :type key: tuple
+        :param request: A coroutine function that sends the request and returns the response.
+        :type request: callable
+        :param timeout: Provide an optional timeout in milliseconds within which an identical
+         request that is in flight must complete.
+        :type timeout: float
+        :rtype: tuple[int, ~uamqp.message.Message, bytes]
+        """
+        import asyncio  # pylint: disable=import-error
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            try:
+                response = await asyncio.wait_for(asyncio.shield(pending), timeout / 1000 if timeout else None)
+            except asyncio.TimeoutError:
+                raise compat.TimeoutException("Failed to receive mgmt response in {}ms".format(timeout))
+            if response is not None:
+                return response
+            return await request()
+        response = self.get(key)
+        if response is not None:
+            return response
+        pending = self._in_flight[key] = utils.get_running_loop().create_future()
+        try:
+            response = await request()
+            self.put(key, response)
+            return response
+        finally:
+            del self._in_flight[key]
+            # Requests waiting on a failed request send their own.
+            pending.set_result(response)
@@ -4,12 +4,11 @@
 # license information.
 #--------------------------------------------------------------------------
 
-import functools
 import logging
 import uuid
 
 import uamqp
-from uamqp import c_uamqp, constants, errors, utils
+from uamqp import c_uamqp, constants, diagnostics, errors, metrics, utils
 
 _logger = logging.getLogger(__name__)
 
@@ -104,8 +103,10 @@ class MessageReceiver(object):
         self._session = session
         self._link = c_uamqp.create_link(session._session, self.name, role.value, self.source, self.target)
         self._link.subscribe_to_detach_event(self)
+        self.metrics = metrics.Metrics('receiver', container_id=session._connection.container_id, link=self.name)
         if prefetch is not None:
             self._link.set_prefetch_count(prefetch)
+            self.metrics.increment('credit_issued', prefetch)
         if properties:
             self._link.set_attach_properties(utils.data_factory(properties, encoding=encoding))
         if receive_settle_mode:
@@ -121,6 +122,8 @@ class MessageReceiver(object):
         self._receiver.set_trace(debug)
         self._state = constants.MessageReceiverState.Idle
         self._error = None
+        # Set by the client while receiving into a ~uamqp.c_uamqp.ColumnarBatch.
+        self._columnar_batch = None
 
     def __enter__(self):
         """Open the MessageReceiver in a context manager."""
@@ -200,20 +203,24 @@ class MessageReceiver(object):
             return
         if isinstance(response, errors.MessageAccepted):
             self._receiver.settle_accepted_message(message_number)
+            self.metrics.increment('dispositions.accepted')
         elif isinstance(response, errors.MessageReleased):
             self._receiver.settle_released_message(message_number)
+            self.metrics.increment('dispositions.released')
         elif isinstance(response, errors.MessageRejected):
             self._receiver.settle_rejected_message(
                 message_number,
                 response.error_condition,
                 response.error_description,
                 response.error_info)
+            self.metrics.increment('dispositions.rejected')
         elif isinstance(response, errors.MessageModified):
             self._receiver.settle_modified_message(
                 message_number,
                 response.failed,
                 response.undeliverable,
                 response.annotations)
+            self.metrics.increment('dispositions.modified')
         else:
             raise ValueError("Invalid message response type: {}".format(response))
 
@@ -227,17 +234,35 @@ class MessageReceiver(object):
         """
         # pylint: disable=protected-access
         message_number = self._receiver.last_received_message_number()
-        if self._settle_mode == constants.ReceiverSettleMode.ReceiveAndDelete:
-            settler = None
-        else:
-            settler = functools.partial(self._settle_message, message_number)
+        self.metrics.increment('transfers')
+        if self._columnar_batch is not None and self._columnar_batch.append(message):
+            # Messages read into a columnar batch are accepted on receipt.
+            if self._settle_mode != constants.ReceiverSettleMode.ReceiveAndDelete:
+                self._receiver.settle_accepted_message(message_number)
+                self.metrics.increment('dispositions.accepted')
+            return
+        # The message is settled through this receiver by its delivery number.
+        receiver = None if self._settle_mode == constants.ReceiverSettleMode.ReceiveAndDelete else self
+        profiler = diagnostics.profiler
         try:
-            wrapped_message = uamqp.Message(
-                message=message,
-                encoding=self.encoding,
-                settler=settler,
-                delivery_no=message_number)
-            self.on_message_received(wrapped_message)
+            if profiler is not None:
+                profiler.enter('message_construction')
+            try:
+                wrapped_message = uamqp.ReceivedMessage(
+                    message=message,
+                    encoding=self.encoding,
+                    delivery_no=message_number,
+                    receiver=receiver)
+            finally:
+                if profiler is not None:
+                    profiler.exit('message_construction')
+            if profiler is not None:
+                profiler.enter('on_message_received')
+            try:
+                self.on_message_received(wrapped_message)
+            finally:
+                if profiler is not None:
+                    profiler.exit('on_message_received')
         except RuntimeError:
             condition = b"amqp:unknown-error"
             self._error = errors._process_link_error(self.error_policy, condition, None, None)
@@ -248,10 +273,12 @@ class MessageReceiver(object):
         except KeyboardInterrupt:
             _logger.error("Received shutdown signal while processing message no %r\nRejecting message.", message_number)
             self._receiver.settle_modified_message(message_number, True, True, None)
+            self.metrics.increment('dispositions.modified')
             self._error = errors.AMQPClientShutdown()
         except Exception as e:  # pylint: disable=broad-except
             _logger.error("Error processing message no %r: %r\nRejecting message.", message_number, e)
             self._receiver.settle_modified_message(message_number, True, True, None)
+            self.metrics.increment('dispositions.modified')
 
     def get_state(self):
         """Get the state of the MessageReceiver and its underlying Link.
@@ -282,6 +309,7 @@ class MessageReceiver(object):
         """
         drain = kwargs.get("drain", False)
         self._link.reset_link_credit(link_credit, drain)
+        self.metrics.increment('credit_issued', link_credit)
 
     def destroy(self):
         """Close both the Receiver and the Link. Clean up any C objects."""
@@ -4,13 +4,17 @@
 # license information.
 #--------------------------------------------------------------------------
 
+import functools
 import logging
+import time
 import uuid
 
-from uamqp import c_uamqp, constants, errors, utils
+from uamqp import c_uamqp, constants, errors, metrics, utils
 
 _logger = logging.getLogger(__name__)
 
+_SEND_RESULT_COUNTERS = {r.value: 'dispositions.' + r.name.lower() for r in constants.MessageSendResult}
+
 
 class MessageSender(object):
     """A Message Sender that opens its own exclsuive Link on an
@@ -117,6 +121,7 @@ class MessageSender(object):
         self._sender.set_trace(debug)
         self._state = constants.MessageSenderState.Idle
         self._error = None
+        self.metrics = metrics.Metrics('sender', container_id=session._connection.container_id, link=self.name)
 
     def __enter__(self):
         """Open the MessageSender in a context manager."""
@@ -246,13 +251,36 @@ class MessageSender(object):
         except Exception as e:
             _logger.warning("%r", e)
             raise
-        c_message = message.get_message()
-        message._on_message_sent = callback
+        message._on_message_sent = functools.partial(self._message_sent, callback, time.perf_counter())
         try:
             self._session._connection.lock(timeout=-1)
-            return self._sender.send(c_message, timeout, message)
+            sent = self._send_message(message, timeout)
         finally:
             self._session._connection.release()
+        if sent:
+            self.metrics.increment('transfers')
+        return sent
+
+    def _send_message(self, message, timeout):
+        """Hand a message to the C sender. The cached bytes of an EncodedMessage
+        are transferred as they are, and if the link cannot take the transfer
+        now, the C message is queued by the sender instead.
+        """
+        # pylint: disable=protected-access
+        c_message = message.get_message()
+        encoded_message = getattr(message, '_encoded_message', None)
+        if encoded_message is not None and self._sender.send_encoded(
+                encoded_message.encode_message(), encoded_message.message_format, timeout, message):
+            return True
+        return self._sender.send(c_message, timeout, message)
+
+    def _message_sent(self, callback, start, message, result, delivery_state=None):
+        """Callback run when the outcome of a message send is known, before
+        the callback supplied with the message.
+        """
+        self.metrics.record('send_ack_latency_ms', (time.perf_counter() - start) * 1000)
+        self.metrics.increment(_SEND_RESULT_COUNTERS.get(result, 'dispositions.unknown'))
+        callback(message, result, delivery_state=delivery_state)
 
     def on_state_changed(self, previous_state, new_state):
         """Callback called whenever the underlying Sender undergoes a change
@@ -5,8 +5,9 @@
 #--------------------------------------------------------------------------
 
 import logging
+import time
 
-from uamqp import c_uamqp, constants, errors, mgmt_operation
+from uamqp import c_uamqp, constants, errors, metrics, mgmt_operation
 from uamqp.address import Source, Target
 
 _logger = logging.getLogger(__name__)
@@ -47,6 +48,7 @@ class Session(object):
         self._mgmt_links = {}
         self._link_error = None
         self._on_attach = on_attach
+        self.metrics = metrics.Metrics('session', container_id=connection.container_id)
 
         if incoming_window:
             self.incoming_window = incoming_window
@@ -105,27 +107,87 @@ class Session(object):
         :param encoding: The encoding to use for parameters supplied as strings.
          Default is 'UTF-8'
         :type encoding: str
+        :param cache: A cache from which to return the response to an idempotent request,
+         such as a READ operation, if an identical request was made recently.
+        :type cache: ~uamqp.mgmt_operation.MgmtResponseCache
         :rtype: ~uamqp.message.Message
         """
         timeout = kwargs.pop('timeout', None) or 0
         parse_response = kwargs.pop('callback', None)
-        try:
-            mgmt_link = self._mgmt_links[node]
-        except KeyError:
-            mgmt_link = mgmt_operation.MgmtOperation(self, target=node, **kwargs)
-            self._mgmt_links[node] = mgmt_link
+        cache = kwargs.pop('cache', None)
+        op_type = op_type or b'empty'
+
+        def request():
+            mgmt_link = self.open_mgmt_link(node, **kwargs)
             while not mgmt_link.open and not mgmt_link.mgmt_error:
                 self._connection.work()
-            if mgmt_link.mgmt_error:
-                raise mgmt_link.mgmt_error
-            if mgmt_link.open != constants.MgmtOpenStatus.Ok:
-                raise errors.AMQPConnectionError("Failed to open mgmt link: {}".format(mgmt_link.open))
-        op_type = op_type or b'empty'
-        status, response, description = mgmt_link.execute(operation, op_type, message, timeout=timeout)
+            self._check_mgmt_link(mgmt_link)
+            return mgmt_link.execute(operation, op_type, message, timeout=timeout)
+
+        start = time.perf_counter()
+        key = cache.get_key(node, operation, op_type, message) if cache is not None else None
+        if key is not None:
+            status, response, description = cache.execute(key, request, timeout=timeout)
+        else:
+            status, response, description = request()
+        self.metrics.increment('mgmt_requests')
+        self.metrics.record('mgmt_request_ms', (time.perf_counter() - start) * 1000)
         if parse_response:
             return parse_response(status, response, description)
         return response
 
+    def open_mgmt_link(self, node=None, **kwargs):
+        """Start opening the send/receive links for a request/response node, without
+        waiting for them to attach. The links are kept open and used for all the
+        requests made to that node with `mgmt_request`.
+
+        :param node: The target node. Default is `b"$management"`.
+        :type node: bytes or str
+        :param status_code_field: Provide an alternate name for the status code in the
+         response body which can vary between services due to the spec still being in draft.
+         The default is `b"statusCode"`.
+        :type status_code_field: bytes
+        :param description_fields: Provide an alternate name for the description in the
+         response body which can vary between services due to the spec still being in draft.
+         The default is `b"statusDescription"`.
+        :type description_fields: bytes
+        :param encoding: The encoding to use for parameters supplied as strings.
+         Default is 'UTF-8'
+        :type encoding: str
+        :rtype: ~uamqp.mgmt_operation.MgmtOperation
+        """
+        node = node or constants.MGMT_TARGET
+        if isinstance(node, str):
+            # Pool the link by the encoded node, which is also its target.
+            node = node.encode(kwargs.get('encoding', 'UTF-8'))
+        try:
+            return self._mgmt_links[node]
+        except KeyError:
+            mgmt_link = self._create_mgmt_link(node, **kwargs)
+            self._mgmt_links[node] = mgmt_link
+            return mgmt_link
+
+    def _create_mgmt_link(self, node, **kwargs):
+        return mgmt_operation.MgmtOperation(self, target=node, **kwargs)
+
+    def _check_mgmt_link(self, mgmt_link):
+        # A link that failed to open is dropped, so that the next request opens a new one.
+        if mgmt_link.mgmt_error or mgmt_link.open != constants.MgmtOpenStatus.Ok:
+            self._mgmt_links.pop(mgmt_link.target, None)
+            mgmt_link.destroy()
+        if mgmt_link.mgmt_error:
+            raise mgmt_link.mgmt_error
+        if mgmt_link.open != constants.MgmtOpenStatus.Ok:
+            raise errors.AMQPConnectionError("Failed to open mgmt link: {}".format(mgmt_link.open))
+
+    def get_mgmt_link_stats(self):
+        """Get the health and latency statistics of the open request/response links,
+        keyed by node.
+
+        :rtype: dict[bytes, dict]
+        """
+        return {node: link.get_stats() for node, link in self._mgmt_links.items()}
+
     def destroy(self):
         """Close any open management Links and close the Session.
         Cleans up and C objects for both mgmt Links and Session.
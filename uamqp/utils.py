@@ -5,11 +5,13 @@
 #--------------------------------------------------------------------------
 
 import base64
-import calendar
+import collections
+import hashlib
+import hmac
+import threading
 import time
-import uuid
 import logging
-from datetime import timedelta, datetime
+from datetime import timedelta
 
 from uamqp import c_uamqp
 
@@ -71,20 +73,113 @@ def create_sas_token(key_name, shared_access_key, scope, expiry=timedelta(hours=
     return c_uamqp.create_sas_token(shared_access_key, scope, key_name, abs_expiry)
 
 
-def _convert_py_number(value):
-    """Convert a Python integer value into equivalent C object.
-    Will attempt to use the smallest possible conversion, starting with int, then long
-    then double.
+class SASTokenFactory(object):
+    """Create SAS tokens for a single shared access key.
+
+    The HMAC state for the key is prepared once and copied for each token, and a
+    token for a scope is reused while it expires within `validity_margin` seconds
+    of a newly created one. A factory can be shared between threads; use
+    `SASTokenFactory.for_key` to share one factory between all users of a key.
+
+    :param key_name: The username/key name/policy name for the token.
+    :type key_name: bytes
+    :param shared_access_key: The shared access key to generate the token from.
+    :type shared_access_key: bytes
+    :param validity_margin: The number of seconds by which a reused token may
+     expire before a newly created token would. Default is 60 seconds.
+    :type validity_margin: float
+    :param max_tokens: The maximum number of scopes for which a token is kept.
+     Expired tokens are dropped first, then the least recently used. Default is 1024.
+    :type max_tokens: int
     """
-    try:
-        return c_uamqp.int_value(value)
-    except OverflowError:
-        pass
-    try:
-        return c_uamqp.long_value(value)
-    except OverflowError:
-        pass
-    return c_uamqp.double_value(value)
+
+    #: The maximum number of factories shared by `for_key`. The least recently used is dropped first.
+    max_factories = 128
+    _factories = collections.OrderedDict()
+    _factories_lock = threading.Lock()
+
+    def __init__(self, key_name, shared_access_key, validity_margin=60, max_tokens=1024):
+        self.key_name = key_name
+        self.validity_margin = validity_margin
+        self.max_tokens = max_tokens
+        self._hmac = hmac.new(shared_access_key, digestmod=hashlib.sha256)
+        self._tokens = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_key(cls, key_name, shared_access_key):
+        """Get the factory shared by all users of a key.
+
+        :param key_name: The username/key name/policy name for the token.
+        :type key_name: bytes
+        :param shared_access_key: The shared access key to generate the token from.
+        :type shared_access_key: bytes
+        :rtype: ~uamqp.utils.SASTokenFactory
+        """
+        # The registry is keyed by a digest, so that it does not hold the key itself.
+        key = (key_name, hashlib.sha256(shared_access_key).digest())
+        with cls._factories_lock:
+            factory = cls._factories.get(key)
+            if factory is None:
+                factory = cls(key_name, shared_access_key)
+                cls._factories[key] = factory
+                while len(cls._factories) > cls.max_factories:
+                    cls._factories.popitem(last=False)
+            else:
+                cls._factories.move_to_end(key)
+            return factory
+
+    def get_token(self, scope, expiry=timedelta(hours=1)):
+        """Get a SAS token for a scope, reusing a previously created
+        token if it is still inside the validity margin.
+
+        :param scope: The token permissions scope.
+        :type scope: bytes
+        :param expiry: The lifetime of the token. Default is 1 hour.
+        :type expiry: ~datetime.timedelta
+        :returns: The token and the time at which it expires, in seconds since epoch.
+        :rtype: tuple[bytes, int]
+        """
+        now = int(time.time())
+        abs_expiry = now + expiry.seconds
+        with self._lock:
+            cached = self._tokens.get(scope)
+            if cached is not None and cached[1] >= abs_expiry - self.validity_margin:
+                self._tokens.move_to_end(scope)
+                return cached
+            signer = self._hmac.copy()
+        token = self.create_token(scope, abs_expiry, signer)
+        with self._lock:
+            self._tokens[scope] = (token, abs_expiry)
+            self._tokens.move_to_end(scope)
+            if len(self._tokens) > self.max_tokens:
+                for expired in [s for s, (_, expires_at) in self._tokens.items() if expires_at <= now]:
+                    del self._tokens[expired]
+                while len(self._tokens) > self.max_tokens:
+                    self._tokens.popitem(last=False)
+        return token, abs_expiry
+
+    def create_token(self, scope, abs_expiry, signer=None):
+        """Create a new SAS token. The token is identical to one created
+        by `create_sas_token`.
+
+        :param scope: The token permissions scope.
+        :type scope: bytes
+        :param abs_expiry: The time at which the token expires, in seconds since epoch.
+        :type abs_expiry: int
+        :rtype: bytes
+        """
+        expiry = str(abs_expiry).encode('ascii')
+        if signer is None:
+            with self._lock:
+                signer = self._hmac.copy()
+        signer.update(scope + b"\n" + expiry)
+        signature = base64.b64encode(signer.digest())
+        signature = signature.replace(b"+", b"%2b").replace(b"/", b"%2f").replace(b"=", b"%3d")
+        token = b"SharedAccessSignature sr=" + scope + b"&sig=" + signature + b"&se=" + expiry
+        if self.key_name is not None:
+            token += b"&skn=" + self.key_name
+        return token
 
 
 def data_factory(value, encoding='UTF-8'):
@@ -94,49 +189,19 @@ def data_factory(value, encoding='UTF-8'):
     - bool => c_uamqp.BoolValue
     - int => c_uamqp.IntValue, LongValue, DoubleValue
     - str => c_uamqp.StringValue
-    - bytes => c_uamqp.BinaryValue
+    - bytes => c_uamqp.StringValue
+    - bytearray => c_uamqp.BinaryValue
     - list/set/tuple => c_uamqp.ListValue
     - dict => c_uamqp.DictValue (AMQP map)
     - float => c_uamqp.DoubleValue
     - uuid.UUID => c_uamqp.UUIDValue
+    - datetime => c_uamqp.TimestampValue
+
+    The C value tree is built in a single pass, without creating an intermediate
+    Python wrapper for every nested key and value.
 
     :param value: The value to wrap.
     :type value: ~uamqp.types.AMQPType
     :rtype: uamqp.c_uamqp.AMQPValue
     """
-    result = None
-    if value is None:
-        result = c_uamqp.null_value()
-    elif hasattr(value, 'c_data'):
-        result = value.c_data
-    elif isinstance(value, c_uamqp.AMQPValue):
-        result = value
-    elif isinstance(value, bool):
-        result = c_uamqp.bool_value(value)
-    elif isinstance(value, str):
-        result = c_uamqp.string_value(value.encode(encoding))
-    elif isinstance(value, bytes):
-        result = c_uamqp.string_value(value)
-    elif isinstance(value, uuid.UUID):
-        result = c_uamqp.uuid_value(value)
-    elif isinstance(value, bytearray):
-        result = c_uamqp.binary_value(value)
-    elif isinstance(value, int):
-        result = _convert_py_number(value)
-    elif isinstance(value, float):
-        result = c_uamqp.double_value(value)
-    elif isinstance(value, dict):
-        wrapped_dict = c_uamqp.dict_value()
-        for key, item in value.items():
-            wrapped_dict[data_factory(key, encoding=encoding)] = data_factory(item, encoding=encoding)
-        result = wrapped_dict
-    elif isinstance(value, (list, set, tuple)):
-        wrapped_list = c_uamqp.list_value()
-        wrapped_list.size = len(value)
-        for index, item in enumerate(value):
-            wrapped_list[index] = data_factory(item, encoding=encoding)
-        result = wrapped_list
-    elif isinstance(value, datetime):
-        timestamp = int((calendar.timegm(value.utctimetuple()) * 1000) + (value.microsecond/1000))
-        result = c_uamqp.timestamp_value(timestamp)
-    return result
+    return c_uamqp.create_value(value, encoding)